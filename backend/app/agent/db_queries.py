@@ -1,10 +1,15 @@
 # app/agent/db_queries.py
 """
 Database query helpers for common operations.
+
+Hot lookups by primary key / model_number are built with ``lambda_stmt`` so
+SQLAlchemy caches the compiled SELECT and only re-binds the parameter on
+each call.
 """
 
 from __future__ import annotations
 from typing import Optional
+from sqlalchemy import lambda_stmt, select
 from sqlalchemy.orm import Session
 
 from app.models import Part, PartModelMapping, Model, Order, Transaction
@@ -22,7 +27,8 @@ def find_part_by_id(db: Session, part_id: str) -> Optional[Part]:
     Returns:
         Part object or None if not found
     """
-    return db.query(Part).filter(Part.part_id == part_id).one_or_none()
+    stmt = lambda_stmt(lambda: select(Part).where(Part.part_id == part_id))
+    return db.execute(stmt).scalar_one_or_none()
 
 
 def find_part_by_mpn(db: Session, mpn: str) -> Optional[Part]:
@@ -55,13 +61,14 @@ def find_part_by_model(db: Session, model_number: str) -> Optional[Part]:
     Returns:
         Part object or None if not found
     """
-    return (
-        db.query(Part)
+    stmt = lambda_stmt(
+        lambda: select(Part)
         .join(PartModelMapping, Part.part_id == PartModelMapping.part_id)
         .join(Model, Model.model_number == PartModelMapping.model_number)
-        .filter(Model.model_number == model_number)
-        .first()
+        .where(Model.model_number == model_number)
+        .limit(1)
     )
+    return db.execute(stmt).scalars().first()
 
 
 def find_part_by_name(db: Session, name_query: str) -> Optional[Part]:
@@ -147,10 +154,7 @@ def get_order_with_details(db: Session, order_id: int) -> Optional[dict]:
     if not order:
         return None
     
-    part = None
-    if order.part_id:
-        part = find_part_by_id(db, order.part_id)
-    
+    part = order.part
     transaction = db.query(Transaction).filter(Transaction.order_id == order_id).first()
     
     return {
@@ -171,5 +175,6 @@ def get_model_info(db: Session, model_number: str) -> Optional[Model]:
     Returns:
         Model object or None if not found
     """
-    return db.query(Model).filter(Model.model_number == model_number).one_or_none()
+    stmt = lambda_stmt(lambda: select(Model).where(Model.model_number == model_number))
+    return db.execute(stmt).scalar_one_or_none()
 
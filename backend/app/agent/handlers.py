@@ -59,6 +59,9 @@ from app.agent.db_queries import (
 
 logger = logging.getLogger(__name__)
 
+# Order-history questions that can't be answered without an order ID
+_ORDER_HISTORY_PHRASES = ("last order", "my order", "what did i order")
+
 
 # =====================================================================
 #  ONE FAST, SIMPLE LLM CALL HELPER WITH RETRY LOGIC
@@ -181,7 +184,7 @@ def handle_blog_howto(decision: RouteDecision, db: Session) -> dict:
 #  PRODUCT INFO (SQL ONLY, ID-FIRST)
 # =====================================================================
 
-def handle_product_info(decision: RouteDecision, db: Session) -> str:
+def handle_product_info(decision: RouteDecision, db: Session) -> dict:
     part: Optional[Part] = None
 
     # 1) Strongest identifier: PartSelect ID.
@@ -202,7 +205,7 @@ def handle_product_info(decision: RouteDecision, db: Session) -> str:
         part = find_part_by_name(db, decision.normalized_query)
 
     if not part:
-        return ERROR_PART_NOT_FOUND
+        return {"reply": ERROR_PART_NOT_FOUND, "metadata": None}
 
     context = (
         f"PartSelect ID: {part.part_id}\n"
@@ -335,7 +338,7 @@ def handle_order_support(decision: RouteDecision, db: Session) -> dict:
     if order_id:
         order = db.query(Order).filter(Order.order_id == order_id).first()
         if order:
-            part = db.query(Part).filter(Part.part_id == order.part_id).first() if order.part_id else None
+            part = order.part
             transaction = db.query(Transaction).filter(Transaction.order_id == order_id).first()
             
             # Build context for LLM
@@ -378,7 +381,7 @@ def handle_order_support(decision: RouteDecision, db: Session) -> dict:
         return {"reply": f"Order #{order_id} not found.", "metadata": None}
     
     # "What did I order last?" - requires order ID
-    if any(p in query_lower for p in ["last order", "my order", "what did i order"]):
+    if any(p in query_lower for p in _ORDER_HISTORY_PHRASES):
         return {
             "reply": ERROR_ORDER_REQUIRED,
             "metadata": None
@@ -453,20 +456,21 @@ def handle_policy(decision: RouteDecision, db: Session) -> dict:
 #  OUT OF SCOPE
 # =====================================================================
 
-def handle_out_of_scope(decision: RouteDecision, db: Session) -> str:
-    return (
+def handle_out_of_scope(decision: RouteDecision, db: Session) -> dict:
+    reply = (
         "I can help with refrigerator and dishwasher parts, "
         "repair troubleshooting, and customer transactions "
         "(order tracking, returns, etc.). I can't assist with questions outside of that scope.\n\n"
         "For other inquiries, please visit PartSelect.com or contact our support team."
     )
+    return {"reply": reply, "metadata": None}
 
 
 # =====================================================================
 #  CLARIFICATION
 # =====================================================================
 
-def handle_clarification(decision: RouteDecision, db: Session) -> str:
+def handle_clarification(decision: RouteDecision, db: Session) -> dict:
     missing = decision.metadata.missing_fields or []
     prompts = []
 
@@ -478,6 +482,6 @@ def handle_clarification(decision: RouteDecision, db: Session) -> str:
         prompts.append("your order number so I can talk about status/returns")
 
     if not prompts:
-        return ERROR_CLARIFICATION_GENERIC
+        return {"reply": ERROR_CLARIFICATION_GENERIC, "metadata": None}
 
-    return "To help with that, please provide " + "; ".join(prompts) + "."
+    return {"reply": "To help with that, please provide " + "; ".join(prompts) + ".", "metadata": None}
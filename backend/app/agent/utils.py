@@ -4,6 +4,8 @@ Utility functions for handlers.
 """
 
 import re
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Optional
 
 
@@ -27,6 +29,9 @@ def escape_like(term: str) -> str:
 def link_metadata(links: list[dict]) -> dict:
     """
     Format links into metadata structure for frontend.
+
+    Repeated link sets (e.g. the repair or policy footers) reuse one cached,
+    read-only filtered copy; every call still returns fresh dicts.
     
     Args:
         links: List of link dictionaries with 'label' and 'url' or 'prompt'
@@ -34,14 +39,49 @@ def link_metadata(links: list[dict]) -> dict:
     Returns:
         Metadata dictionary with type 'links' or empty dict if no valid links
     """
-    clean = [
+    if not links:
+        return {}
+    try:
+        clean = _clean_links_cached(tuple(tuple(link.items()) for link in links))
+    except TypeError:  # unhashable link values
+        clean = _clean_links(links)
+    if not clean:
+        return {}
+    return {"type": "links", "links": [dict(link) for link in clean]}
+
+
+@lru_cache(maxsize=256)
+def _clean_links_cached(key: tuple) -> tuple:
+    return tuple(
+        MappingProxyType(link) for link in _clean_links([dict(items) for items in key])
+    )
+
+
+def _clean_links(links: list[dict]) -> list[dict]:
+    return [
         link
         for link in links
         if link.get("label") and (link.get("url") or link.get("prompt"))
     ]
-    if not clean:
-        return {}
-    return {"type": "links", "links": clean}
+
+
+# Markdown clean-up passes, compiled once and applied in this order; later
+# passes see the output of earlier ones (e.g. "***x***" loses bold, then
+# italic). A pass is skipped when its required substring isn't in the text.
+_MARKDOWN_SUBS = (
+    # Bold (**text** or __text__)
+    ("**", re.compile(r'\*\*([^*]+)\*\*'), r'\1'),
+    ("__", re.compile(r'__([^_]+)__'), r'\1'),
+    # Italic (*text* or _text_)
+    ("*", re.compile(r'\*([^*]+)\*'), r'\1'),
+    ("_", re.compile(r'_([^_]+)_'), r'\1'),
+    # Headers (# Header)
+    ("#", re.compile(r'^#+\s+', re.MULTILINE), ''),
+    # List markers (1. or - or *)
+    ("", re.compile(r'^\s*[\d\.\-\*]+\s+', re.MULTILINE), ''),
+    # Multiple consecutive newlines (max 2)
+    ("\n\n\n", re.compile(r'\n{3,}'), '\n\n'),
+)
 
 
 def clean_llm_response(text: str) -> str:
@@ -58,25 +98,11 @@ def clean_llm_response(text: str) -> str:
     if not text:
         return text
     
-    # Remove markdown bold (**text** or __text__)
-    text = re.sub(r'\*\*([^*]+)\*\*', r'\1', text)
-    text = re.sub(r'__([^_]+)__', r'\1', text)
-    
-    # Remove markdown italic (*text* or _text_)
-    text = re.sub(r'\*([^*]+)\*', r'\1', text)
-    text = re.sub(r'_([^_]+)_', r'\1', text)
-    
-    # Remove markdown headers (# Header)
-    text = re.sub(r'^#+\s+', '', text, flags=re.MULTILINE)
-    
-    # Remove markdown list markers (1. or - or *)
-    text = re.sub(r'^\s*[\d\.\-\*]+\s+', '', text, flags=re.MULTILINE)
-    
-    # Clean up multiple consecutive newlines (max 2)
-    text = re.sub(r'\n{3,}', '\n\n', text)
+    for needle, pattern, replacement in _MARKDOWN_SUBS:
+        if needle in text:
+            text = pattern.sub(replacement, text)
     
     # Trim whitespace
     text = text.strip()
     
     return text
-
@@ -25,6 +25,8 @@ class Settings(BaseSettings):
     data_dir: Path = Field(default_factory=_default_data_dir)
     chroma_dir: Path = Field(default_factory=_default_chroma_dir)
     chroma_collection: str = "documents"
+    chroma_host: str | None = Field(default=None, description="Chroma server host for the async HTTP client")
+    chroma_port: int = 8000
     deepseek_api_key: str | None = Field(default=None, description="API key for DeepSeek")
     openai_api_key: str | None = Field(default=None, description="API key for OpenAI (fallback)")
     llm_provider: str = Field(default="deepseek", description="Which LLM client to use: 'deepseek' or 'openai'")
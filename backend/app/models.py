@@ -1,21 +1,51 @@
 """
 ORM models backing the SQLite storage.
+
+Relationship loading strategies:
+- Eager (selectin): Part.model_mappings, Model.part_mappings, User.orders
+- Eager (joined): Order.part, Order.user
+- Lazy: PartModelMapping.part, PartModelMapping.model, Transaction.order
+
+Money is stored as integer cents (part_price_cents, amount_cents) and exposed
+as two-place Decimals through the part_price / amount hybrid properties.
+
+The test suite installs raiseload on the lazy ones, so code that walks them
+in a loop fails in CI instead of issuing N+1 selects. Add an explicit
+loader option (or change the strategy here) when a new path needs them.
 """
 
-from sqlalchemy import Column, ForeignKey, Integer, Numeric, String, Text, UniqueConstraint, Boolean, DateTime
+from sqlalchemy import Column, ForeignKey, Index, Integer, String, Text, UniqueConstraint, Boolean, DateTime
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
 from datetime import datetime
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Optional
 
 from .db import Base
 
 
+def _to_cents(value) -> Optional[int]:
+    """Convert a money value (Decimal, float, str) to integer cents."""
+    if value is None or value == "":
+        return None
+    amount = Decimal(str(value)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+    return int(amount * 100)
+
+
+def _from_cents(cents: Optional[int]) -> Optional[Decimal]:
+    """Convert integer cents back to a two-place Decimal."""
+    if cents is None:
+        return None
+    return Decimal(cents).scaleb(-2)
+
+
 class Part(Base):
     __tablename__ = "parts"
 
     part_id = Column(String(32), primary_key=True)
     manufacturer_part_number = Column(String(64), nullable=True)
     part_name = Column(String(255), nullable=False)
-    part_price = Column(Numeric(10, 2), nullable=True)
+    part_price_cents = Column(Integer, nullable=True)
     description = Column(Text, nullable=True)
     symptoms = Column(Text, nullable=True)
     install_difficulty = Column(String(64), nullable=True)
@@ -31,8 +61,22 @@ class Part(Base):
         back_populates="part",
         cascade="all, delete-orphan",
         passive_deletes=True,
+        lazy="selectin",
     )
 
+    @hybrid_property
+    def part_price(self) -> Optional[Decimal]:
+        return _from_cents(self.part_price_cents)
+
+    @part_price.inplace.setter
+    def _part_price_setter(self, value) -> None:
+        self.part_price_cents = _to_cents(value)
+
+    @part_price.inplace.expression
+    @classmethod
+    def _part_price_expression(cls):
+        return cls.part_price_cents / 100.0
+
     def __repr__(self) -> str:
         return f"<Part part_id={self.part_id} part_name={self.part_name!r}>"
 
@@ -52,6 +96,7 @@ class Model(Base):
         back_populates="model",
         cascade="all, delete-orphan",
         passive_deletes=True,
+        lazy="selectin",
         primaryjoin="Model.model_number==PartModelMapping.model_number",
         foreign_keys="PartModelMapping.model_number",
     )
@@ -94,6 +139,7 @@ class User(Base):
         back_populates="user",
         cascade="all, delete-orphan",
         passive_deletes=True,
+        lazy="selectin",
     )
 
     def __repr__(self) -> str:
@@ -102,6 +148,9 @@ class User(Base):
 
 class Order(Base):
     __tablename__ = "orders"
+    __table_args__ = (
+        Index("ix_orders_user_status", "user_id", "order_status"),
+    )
 
     order_id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey("users.user_id", ondelete="CASCADE"), nullable=False, index=True)
@@ -112,8 +161,8 @@ class Order(Base):
     return_eligible = Column(Boolean, nullable=False, default=True)
     price_match_eligible = Column(Boolean, nullable=False, default=True)
 
-    user = relationship("User", back_populates="orders")
-    part = relationship("Part")
+    user = relationship("User", back_populates="orders", lazy="joined")
+    part = relationship("Part", lazy="joined")
 
     def __repr__(self) -> str:
         return f"<Order order_id={self.order_id} user_id={self.user_id} status={self.order_status}>"
@@ -121,15 +170,31 @@ class Order(Base):
 
 class Transaction(Base):
     __tablename__ = "transactions"
+    __table_args__ = (
+        Index("ix_tx_order_status", "order_id", "status"),
+    )
 
     transaction_id = Column(String(64), primary_key=True)
     order_id = Column(Integer, ForeignKey("orders.order_id", ondelete="CASCADE"), nullable=False, index=True)
-    amount = Column(Numeric(10, 2), nullable=False)
+    amount_cents = Column(Integer, nullable=False)
     status = Column(String(64), nullable=False, default="completed")  # completed, refunded
     timestamp = Column(DateTime, nullable=False, default=datetime.utcnow)
     payment_method = Column(String(64), nullable=True)  # e.g., "credit_card", "paypal"
 
     order = relationship("Order", foreign_keys=[order_id])
 
+    @hybrid_property
+    def amount(self) -> Optional[Decimal]:
+        return _from_cents(self.amount_cents)
+
+    @amount.inplace.setter
+    def _amount_setter(self, value) -> None:
+        self.amount_cents = _to_cents(value)
+
+    @amount.inplace.expression
+    @classmethod
+    def _amount_expression(cls):
+        return cls.amount_cents / 100.0
+
     def __repr__(self) -> str:
         return f"<Transaction transaction_id={self.transaction_id} order_id={self.order_id} status={self.status}>"
@@ -0,0 +1,51 @@
+"""
+Shared Chroma client for the RAG modules.
+
+rag_store and rag_admin both go through get_client(), so the persistent
+store (and its SQLite file) is opened once per process.
+
+get_async_client() talks to a Chroma server instead (settings.chroma_host),
+for callers that want to fan out queries from an event loop.
+"""
+
+from functools import lru_cache
+from typing import Optional
+
+import chromadb
+from chromadb.api import AsyncClientAPI
+
+from ..config import settings
+
+
+@lru_cache(maxsize=1)
+def get_client() -> chromadb.ClientAPI:
+    settings.chroma_dir.mkdir(parents=True, exist_ok=True)
+    return chromadb.PersistentClient(path=str(settings.chroma_dir))
+
+
+def close_client() -> None:
+    """
+    Drop the cached client so the next get_client() reopens it.
+
+    Mainly for tests that point settings.chroma_dir somewhere else.
+    """
+    global _async_client
+    get_client.cache_clear()
+    _async_client = None
+
+
+_async_client: Optional[AsyncClientAPI] = None
+
+
+async def get_async_client() -> AsyncClientAPI:
+    global _async_client
+    if _async_client is None:
+        if not settings.chroma_host:
+            raise RuntimeError(
+                "Chroma server not configured. Set INSTALILY_CHROMA_HOST in .env"
+            )
+        _async_client = await chromadb.AsyncHttpClient(
+            host=settings.chroma_host,
+            port=settings.chroma_port,
+        )
+    return _async_client
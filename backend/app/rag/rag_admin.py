@@ -11,24 +11,10 @@ Used during development / case study iterations.
 from __future__ import annotations
 
 import argparse
-from functools import lru_cache
 from typing import List
 
-import chromadb
-
-from ..config import settings
-
-
-@lru_cache(maxsize=1)
-def _admin_client() -> chromadb.ClientAPI:
-    """
-    Separate admin-level client.
-
-    We don't need embeddings here; we only care about deleting / listing
-    collections in the same directory as rag_store.py.
-    """
-    settings.chroma_dir.mkdir(parents=True, exist_ok=True)
-    return chromadb.PersistentClient(path=str(settings.chroma_dir))
+from . import tag_index
+from ._chroma import get_client
 
 
 def reset_collection(name: str) -> None:
@@ -41,19 +27,20 @@ def reset_collection(name: str) -> None:
         reset_collection("blogs")
         reset_collection("repairs")
     """
-    client = _admin_client()
+    client = get_client()
     try:
         client.delete_collection(name)
     except Exception as e:
         # Safe-ish: collection may not exist yet; that's ok during dev
         print(f"[rag_admin] Could not delete collection '{name}': {e}")
+    tag_index.clear_collection(name)
 
 
 def list_collections() -> List[str]:
     """
     Returns a simple list of collection names for debugging.
     """
-    client = _admin_client()
+    client = get_client()
     cols = client.list_collections()
     return [c.name for c in cols]
 
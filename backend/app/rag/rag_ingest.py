@@ -13,11 +13,17 @@ You can also import the helpers directly for programmatic ingestion.
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
+import re
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
-from .rag_store import get_collection, upsert_document
+from . import tag_index
+from .rag_store import embed_texts, get_collection, upsert_document
+from .retrieval import token_digest
+
+_SEP_RE = re.compile(r"[;,|/]")
 
 
 def _log(message: str) -> None:
@@ -30,6 +36,48 @@ def _log_document(doc_id: str, text: str, metadata: Dict[str, Any]) -> None:
     _log(f"Indexing {doc_id} | preview=\"{preview}\" | metadata={metadata}")
 
 
+# ---- Chunk dedup ------------------------------------------------------------
+
+
+def _chunk_hash(chunk: str) -> str:
+    """Content hash of a chunk, insensitive to whitespace differences."""
+    normalized = " ".join(chunk.split())
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _upsert_chunk(
+    doc_id: str,
+    chunk: str,
+    metadata: Dict[str, Any],
+    collection,
+    seen: Dict[str, Sequence[float]],
+) -> bool:
+    """
+    Upsert one chunk, embedding its text only the first time it is seen in
+    this run. Repeats (boilerplate warnings etc.) still get their own doc_id
+    and metadata but reuse the stored vector.
+
+    The chunk's token digest is added as metadata["_tokens"] for the
+    retrieval keyword bonus.
+
+    Returns True when an existing embedding was reused.
+    """
+    metadata = metadata | {"_tokens": token_digest(chunk)}
+    key = _chunk_hash(chunk)
+    reused = key in seen
+    if not reused:
+        seen[key] = embed_texts([chunk])[0]
+
+    upsert_document(
+        doc_id=doc_id,
+        text=chunk,
+        metadata=metadata,
+        collection=collection,
+        embedding=seen[key],
+    )
+    return reused
+
+
 # ---- Chunking helpers ------------------------------------------------------
 
 
@@ -67,28 +115,11 @@ def _split_into_chunks(
     return chunks
 
 
-def _normalize_appliance_types(raw: Any) -> List[str]:
-    """
-    Normalizes appliance types to a list of lowercased strings.
-    Handles strings ('Refrigerator; Dishwasher') and lists.
-    """
-    if raw is None:
-        return []
-
-    if isinstance(raw, list):
-        return [str(x).strip().lower() for x in raw if str(x).strip()]
-
-    # assume string
-    seps = [";", ",", "|", "/"]
-    s = str(raw)
-    for sep in seps:
-        s = s.replace(sep, ";")
-    return [x.strip().lower() for x in s.split(";") if x.strip()]
-
-
-def _normalize_tags(raw: Any) -> List[str]:
+def _split_multi(raw: Any) -> List[str]:
     """
-    Normalizes symptom / tag fields to a list of strings.
+    Normalizes a multi-valued field (appliance types, symptom tags, ...)
+    to a list of lowercased strings.
+    Handles lists and strings like 'Refrigerator; Dishwasher' or 'a, b | c / d'.
     """
     if raw is None:
         return []
@@ -97,11 +128,7 @@ def _normalize_tags(raw: Any) -> List[str]:
         return [str(x).strip().lower() for x in raw if str(x).strip()]
 
     # assume string with separators
-    seps = [";", ",", "|", "/"]
-    s = str(raw)
-    for sep in seps:
-        s = s.replace(sep, ";")
-    return [x.strip().lower() for x in s.split(";") if x.strip()]
+    return [x.strip().lower() for x in _SEP_RE.split(str(raw)) if x.strip()]
 
 
 def _metadata_list_value(values: List[str]) -> Optional[str]:
@@ -122,6 +149,7 @@ def _metadata_list_value(values: List[str]) -> Optional[str]:
 def ingest_blogs(
     blogs: Iterable[Dict[str, Any]],
     collection_name: str = "blogs",
+    verbose: bool = False,
 ) -> None:
     """
     Ingest blog articles into the 'blogs' collection.
@@ -143,20 +171,29 @@ def ingest_blogs(
     collection = get_collection(name=collection_name)
     total_blogs = 0
     total_chunks = 0
+    reused_chunks = 0
+    seen: Dict[str, Sequence[float]] = {}
+    tags_by_blog: Dict[str, Dict[str, List[str]]] = {}
 
     for idx, blog in enumerate(blogs, start=1):
         blog_id = str(blog.get("id") or blog.get("slug") or blog.get("title"))
         title = blog.get("title", "").strip()
         url = blog.get("url")
-        appliance_types = _normalize_appliance_types(
-            blog.get("appliance_types")
-        )
-        tags = _normalize_tags(blog.get("tags"))
+        appliance_types = _split_multi(blog.get("appliance_types"))
+        tags = _split_multi(blog.get("tags"))
 
         sections: List[Dict[str, Any]] = blog.get("sections") or []
-
-        appliance_meta = _metadata_list_value(appliance_types)
-        tags_meta = _metadata_list_value(tags)
+        tags_by_blog[blog_id] = {"appliance_types": appliance_types, "tags": tags}
+
+        # Per-blog fields are built once; each chunk only merges in its indices.
+        base_meta: Dict[str, Any] = {
+            "source": "blog",
+            "blog_id": blog_id,
+            "title": title,
+            "url": url,
+            "appliance_types": _metadata_list_value(appliance_types),
+            "tags": _metadata_list_value(tags),
+        }
 
         for sec_idx, section in enumerate(sections):
             heading = (section.get("heading") or "").strip()
@@ -164,42 +201,38 @@ def ingest_blogs(
             if not text:
                 continue
 
+            section_meta = base_meta | {
+                "section_index": sec_idx,
+                "section_heading": heading,
+            }
+
             # chunk this section if needed
             chunks = _split_into_chunks(text)
             for chunk_idx, chunk in enumerate(chunks):
                 doc_id = f"blog:{blog_id}::sec:{sec_idx}::chunk:{chunk_idx}"
+                metadata = section_meta | {"chunk_index": chunk_idx}
 
-                metadata: Dict[str, Any] = {
-                    "source": "blog",
-                    "blog_id": blog_id,
-                    "title": title,
-                    "url": url,
-                    "section_index": sec_idx,
-                    "section_heading": heading,
-                    "chunk_index": chunk_idx,
-                    "appliance_types": appliance_meta,
-                    "tags": tags_meta,
-                }
-
-                # _log_document(doc_id, chunk, metadata)
-                upsert_document(
-                    doc_id=doc_id,
-                    text=chunk,
-                    metadata=metadata,
-                    collection=collection,
-                )
+                if verbose:
+                    _log_document(doc_id, chunk, metadata)
+                if _upsert_chunk(doc_id, chunk, metadata, collection, seen):
+                    reused_chunks += 1
                 total_chunks += 1
 
         total_blogs += 1
         if idx % 10 == 0:
             _log(f"Ingested {idx} blogs ({total_chunks} chunks so far).")
 
-    _log(f"Finished ingesting blogs → {total_blogs} blogs, {total_chunks} chunks.")
+    tag_index.write_tags(collection_name, tags_by_blog)
+    _log(
+        f"Finished ingesting blogs → {total_blogs} blogs, {total_chunks} chunks "
+        f"({reused_chunks} duplicates reused an embedding)."
+    )
 
 
 def ingest_blogs_from_file(
     path: str | Path,
     collection_name: str = "blogs",
+    verbose: bool = False,
 ) -> None:
     """
     Convenience wrapper:
@@ -217,7 +250,7 @@ def ingest_blogs_from_file(
     else:
         blogs = data
 
-    ingest_blogs(blogs=blogs, collection_name=collection_name)
+    ingest_blogs(blogs=blogs, collection_name=collection_name, verbose=verbose)
 
 
 # ---- REPAIR GUIDE ingestion -----------------------------------------------
@@ -226,6 +259,7 @@ def ingest_blogs_from_file(
 def ingest_repairs(
     repairs: Iterable[Dict[str, Any]],
     collection_name: str = "repairs",
+    verbose: bool = False,
 ) -> None:
     """
     Ingest repair / troubleshooting guides into the 'repairs' collection.
@@ -254,18 +288,26 @@ def ingest_repairs(
     collection = get_collection(name=collection_name)
     total_guides = 0
     total_chunks = 0
+    reused_chunks = 0
+    seen: Dict[str, Sequence[float]] = {}
+    tags_by_guide: Dict[str, Dict[str, List[str]]] = {}
 
     for idx, guide in enumerate(repairs, start=1):
         guide_id = str(guide.get("id") or guide.get("slug") or guide.get("title"))
         title = (guide.get("title") or "").strip()
         url = guide.get("url")
-        appliance_types = _normalize_appliance_types(
+        appliance_types = _split_multi(
             guide.get("appliance_type") or guide.get("appliance_types")
         )
-        symptom_tags = _normalize_tags(
+        symptom_tags = _split_multi(
             guide.get("symptom_tags") or guide.get("symptoms")
         )
 
+        tags_by_guide[guide_id] = {
+            "appliance_types": appliance_types,
+            "symptom_tags": symptom_tags,
+        }
+
         raw_steps: List[Dict[str, Any]] = guide.get("steps") or []
         raw_sections: List[Dict[str, Any]] = guide.get("sections") or []
         steps: List[Dict[str, Any]] = []
@@ -283,8 +325,16 @@ def ingest_repairs(
 
         # Optional free-form notes text
         notes_text = (guide.get("notes") or "").strip()
-        appliance_meta = _metadata_list_value(appliance_types)
-        symptom_meta = _metadata_list_value(symptom_tags)
+
+        # Per-guide fields are built once; each chunk only merges in its indices.
+        base_meta: Dict[str, Any] = {
+            "source": "repair_guide",
+            "guide_id": guide_id,
+            "title": title,
+            "url": url,
+            "appliance_types": _metadata_list_value(appliance_types),
+            "symptom_tags": _metadata_list_value(symptom_tags),
+        }
 
         # 1) Steps
         for step_idx, step in enumerate(steps):
@@ -293,66 +343,51 @@ def ingest_repairs(
             if not body:
                 continue
 
+            step_meta = base_meta | {
+                "step_index": step_idx,
+                "step_title": step_title,
+            }
+
             chunks = _split_into_chunks(body)
             for chunk_idx, chunk in enumerate(chunks):
                 doc_id = (
                     f"repair:{guide_id}::step:{step_idx}::chunk:{chunk_idx}"
                 )
+                metadata = step_meta | {"chunk_index": chunk_idx}
 
-                metadata: Dict[str, Any] = {
-                    "source": "repair_guide",
-                    "guide_id": guide_id,
-                    "title": title,
-                    "url": url,
-                    "step_index": step_idx,
-                    "step_title": step_title,
-                    "chunk_index": chunk_idx,
-                    "appliance_types": appliance_meta,
-                    "symptom_tags": symptom_meta,
-                }
-
-                _log_document(doc_id, chunk, metadata)
-                upsert_document(
-                    doc_id=doc_id,
-                    text=chunk,
-                    metadata=metadata,
-                    collection=collection,
-                )
+                if verbose:
+                    _log_document(doc_id, chunk, metadata)
+                if _upsert_chunk(doc_id, chunk, metadata, collection, seen):
+                    reused_chunks += 1
                 total_chunks += 1
 
         # 2) Optional notes as a separate chunk
         if notes_text:
+            notes_meta = base_meta | {"section": "notes"}
             chunks = _split_into_chunks(notes_text)
             for chunk_idx, chunk in enumerate(chunks):
                 doc_id = f"repair:{guide_id}::notes::chunk:{chunk_idx}"
-                metadata = {
-                    "source": "repair_guide",
-                    "guide_id": guide_id,
-                    "title": title,
-                    "url": url,
-                    "section": "notes",
-                    "chunk_index": chunk_idx,
-                    "appliance_types": appliance_meta,
-                    "symptom_tags": symptom_meta,
-                }
-                _log_document(doc_id, chunk, metadata)
-                upsert_document(
-                    doc_id=doc_id,
-                    text=chunk,
-                    metadata=metadata,
-                    collection=collection,
-                )
+                metadata = notes_meta | {"chunk_index": chunk_idx}
+                if verbose:
+                    _log_document(doc_id, chunk, metadata)
+                if _upsert_chunk(doc_id, chunk, metadata, collection, seen):
+                    reused_chunks += 1
                 total_chunks += 1
 
         total_guides += 1
         if idx % 10 == 0:
             _log(f"Ingested {idx} repair guides ({total_chunks} chunks so far).")
 
-    _log(f"Finished ingesting repairs → {total_guides} guides, {total_chunks} chunks.")
+    tag_index.write_tags(collection_name, tags_by_guide)
+    _log(
+        f"Finished ingesting repairs → {total_guides} guides, {total_chunks} chunks "
+        f"({reused_chunks} duplicates reused an embedding)."
+    )
 
 def ingest_repairs_from_file(
     path: str | Path,
     collection_name: str = "repairs",
+    verbose: bool = False,
 ) -> None:
     """
     Convenience wrapper:
@@ -369,7 +404,7 @@ def ingest_repairs_from_file(
     else:
         repairs = data
 
-    ingest_repairs(repairs=repairs, collection_name=collection_name)
+    ingest_repairs(repairs=repairs, collection_name=collection_name, verbose=verbose)
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="RAG ingestion utility.")
@@ -395,14 +430,19 @@ def main() -> None:
         action="store_true",
         help="Skip repair ingestion even if --repairs is provided.",
     )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Log every indexed chunk with a preview and its metadata.",
+    )
     args = parser.parse_args()
 
     ran_any = False
     if args.blogs and not args.skip_blogs:
-        ingest_blogs_from_file(args.blogs)
+        ingest_blogs_from_file(args.blogs, verbose=args.verbose)
         ran_any = True
     if args.repairs and not args.skip_repairs:
-        ingest_repairs_from_file(args.repairs)
+        ingest_repairs_from_file(args.repairs, verbose=args.verbose)
         ran_any = True
 
     if not ran_any:
@@ -12,7 +12,8 @@ from __future__ import annotations
 import argparse
 from typing import Any, Dict, List, Optional
 
-from .rag_store import get_collection
+from . import tag_index
+from .rag_store import async_get_collection, get_collection
 
 
 def query_collection(
@@ -30,6 +31,7 @@ def query_collection(
           {
             "id": "blog:...::chunk:0",
             "text": "chunk text",
+            "text_stripped": "chunk text",   # text.strip(), computed once
             "metadata": {...},
             "distance": 0.123
           },
@@ -44,6 +46,31 @@ def query_collection(
         where=where,
     )
 
+    return _normalize_results(results)
+
+
+async def aquery_collection(
+    query: str,
+    collection_name: str,
+    n_results: int = 6,
+    where: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Async counterpart of query_collection() against the Chroma HTTP server.
+    Returns the same structure.
+    """
+    col = await async_get_collection(name=collection_name)
+
+    results = await col.query(
+        query_texts=[query],
+        n_results=n_results,
+        where=where,
+    )
+
+    return _normalize_results(results)
+
+
+def _normalize_results(results: Dict[str, Any]) -> List[Dict[str, Any]]:
     ids = results.get("ids", [[]])[0]
     docs = results.get("documents", [[]])[0]
     metas = results.get("metadatas", [[]])[0]
@@ -57,6 +84,7 @@ def query_collection(
             {
                 "id": doc_id,
                 "text": docs[i],
+                "text_stripped": (docs[i] or "").strip(),
                 "metadata": metas[i],
                 "distance": distances[i],
             }
@@ -65,6 +93,28 @@ def query_collection(
     return normalized
 
 
+def _tag_where(
+    collection_name: str,
+    id_field: str,
+    filters: Dict[str, str],
+) -> Optional[Dict[str, Any]]:
+    """
+    Resolve tag filters through the side index into an ``$in`` filter on
+    the chunk's parent id (blog_id / guide_id).
+
+    Falls back to ``$contains`` on the joined metadata strings when the
+    collection was ingested before the tag index existed. Returns an
+    ``$in`` over an empty list when nothing matches; callers short-circuit.
+    """
+    if not filters:
+        return None
+
+    parent_ids = tag_index.parent_ids_matching(collection_name, filters)
+    if parent_ids is None:
+        return {field: {"$contains": term} for field, term in filters.items()}
+    return {id_field: {"$in": sorted(parent_ids)}}
+
+
 def query_blogs(
     query: str,
     appliance_filter: Optional[str] = None,
@@ -77,13 +127,13 @@ def query_blogs(
       - "dishwasher"
       - "refrigerator"
     """
-    where = None
+    filters: Dict[str, str] = {}
     if appliance_filter:
-        where = {
-            "appliance_types": {
-                "$contains": appliance_filter.lower()
-            }
-        }
+        filters["appliance_types"] = appliance_filter.lower()
+
+    where = _tag_where("blogs", "blog_id", filters)
+    if where and where.get("blog_id", {}).get("$in") == []:
+        return []
 
     return query_collection(
         query=query,
@@ -106,23 +156,21 @@ def query_repairs(
       - symptom_filter: "won't start", "not draining"
       - appliance_filter: "dishwasher", "refrigerator"
     """
-    where: Dict[str, Any] = {}
+    filters: Dict[str, str] = {}
     if symptom_filter:
-        where.setdefault("symptom_tags", {})["$contains"] = symptom_filter.lower()
+        filters["symptom_tags"] = symptom_filter.lower()
     if appliance_filter:
-        where.setdefault("appliance_types", {})["$contains"] = appliance_filter.lower()
+        filters["appliance_types"] = appliance_filter.lower()
 
-    if not where:
-        where_clause = None
-    else:
-        # simple AND of conditions
-        where_clause = where
+    where = _tag_where("repairs", "guide_id", filters)
+    if where and where.get("guide_id", {}).get("$in") == []:
+        return []
 
     return query_collection(
         query=query,
         collection_name="repairs",
         n_results=n_results,
-        where=where_clause,
+        where=where,
     )
 
 
@@ -135,7 +183,7 @@ def build_context_block(
 
     It keeps them compact but nicely labeled.
     """
-    lines: List[str] = []
+    blocks: List[str] = []
     current_len = 0
 
     for r in results:
@@ -147,14 +195,19 @@ def build_context_block(
         if url:
             prefix += f" ({url})"
 
-        block = f"{prefix}\n{r['text'].strip()}\n"
-        if current_len + len(block) > max_chars:
+        text = r.get("text_stripped")
+        if text is None:
+            text = r["text"].strip()
+
+        # prefix + "\n" + text + "\n"; check the budget before building it
+        block_len = len(prefix) + len(text) + 2
+        if current_len + block_len > max_chars:
             break
 
-        lines.append(block)
-        current_len += len(block)
+        blocks.append(f"{prefix}\n{text}\n")
+        current_len += block_len
 
-    return "\n---\n".join(lines)
+    return "\n---\n".join(blocks)
 
 
 def main() -> None:
@@ -2,14 +2,14 @@
 Utility helpers for interacting with the local Chroma vector store.
 """
 
-from functools import lru_cache
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
-import chromadb
+from chromadb.api.models.AsyncCollection import AsyncCollection
 from chromadb.api.models.Collection import Collection
 from chromadb.utils import embedding_functions
 
 from ..config import settings
+from ._chroma import get_async_client, get_client
 
 
 def _build_embedding_function():
@@ -29,32 +29,99 @@ def _build_embedding_function():
 _embedding_function = _build_embedding_function()
 
 
-@lru_cache(maxsize=1)
-def _client() -> chromadb.ClientAPI:
-    settings.chroma_dir.mkdir(parents=True, exist_ok=True)
-    return chromadb.PersistentClient(path=str(settings.chroma_dir))
+def get_collection(name: Optional[str] = None) -> Collection:
+    collection_name = name or settings.chroma_collection
+    return get_client().get_or_create_collection(
+        name=collection_name,
+        embedding_function=_embedding_function,
+    )
 
 
-def get_collection(name: Optional[str] = None) -> Collection:
+async def async_get_collection(name: Optional[str] = None) -> AsyncCollection:
+    """
+    Async counterpart of get_collection(), backed by the Chroma HTTP server.
+    """
+
     collection_name = name or settings.chroma_collection
-    return _client().get_or_create_collection(
+    client = await get_async_client()
+    return await client.get_or_create_collection(
         name=collection_name,
         embedding_function=_embedding_function,
     )
 
 
-def upsert_document(doc_id: str, text: str, metadata: Dict[str, Any], collection: Optional[Collection] = None) -> None:
+def embed_texts(texts: List[str]) -> List[Sequence[float]]:
+    """
+    Embed texts with the same function the collections use, so the vectors
+    can be passed straight back to upsert_document.
+    """
+
+    return list(_embedding_function(texts))
+
+
+def upsert_document(
+    doc_id: str,
+    text: str,
+    metadata: Dict[str, Any],
+    collection: Optional[Collection] = None,
+    embedding: Optional[Sequence[float]] = None,
+) -> None:
     """
     Persist (or overwrite) a document chunk in the configured Chroma collection.
+
+    When ``embedding`` is given, Chroma stores it as-is instead of embedding
+    ``text`` again.
     """
 
     if not text:
         return
 
     col = collection or get_collection()
-    col.upsert(
-        ids=[doc_id],
-        documents=[text],
-        metadatas=[metadata],
-    )
+    if embedding is None:
+        col.upsert(
+            ids=[doc_id],
+            documents=[text],
+            metadatas=[metadata],
+        )
+    else:
+        col.upsert(
+            ids=[doc_id],
+            documents=[text],
+            metadatas=[metadata],
+            embeddings=[embedding],
+        )
+
+
+
+def upsert_documents_batch(
+    ids: List[str],
+    texts: List[str],
+    metadatas: List[Dict[str, Any]],
+    collection: Optional[Collection] = None,
+) -> None:
+    """
+    Persist many chunks with a single Chroma upsert (one embedding batch).
+    """
+
+    if not ids:
+        return
+
+    col = collection or get_collection()
+    col.upsert(ids=ids, documents=texts, metadatas=metadatas)
+
+
+async def aupsert_documents_batch(
+    ids: List[str],
+    texts: List[str],
+    metadatas: List[Dict[str, Any]],
+    collection: Optional[AsyncCollection] = None,
+) -> None:
+    """
+    Async counterpart of upsert_documents_batch().
+    """
+
+    if not ids:
+        return
 
+    col = collection or await async_get_collection()
+    await col.upsert(ids=ids, documents=texts, metadatas=metadatas)
@@ -1,21 +1,48 @@
 from __future__ import annotations
 
+import asyncio
 import re
 from difflib import SequenceMatcher
 from typing import Any, Dict, List, Optional
 
-from .rag_query import query_collection
+import numpy as np
+
+from .rag_query import aquery_collection, query_collection
 
 DEFAULT_COLLECTIONS = ("repairs", "blogs")
 
 
-def _keyword_bonus(query: str, text: str) -> float:
-    tokens = [t for t in re.split(r"[^a-z0-9]+", query.lower()) if len(t) > 3]
-    if not tokens:
+_TOKEN_RE = re.compile(r"[^a-z0-9]+")
+
+
+def _tokenize(text: str) -> List[str]:
+    return [t for t in _TOKEN_RE.split(text.lower()) if len(t) > 3]
+
+
+def token_digest(text: str) -> str:
+    """
+    Space-joined, sorted set of the informative tokens in ``text``.
+
+    Stored on each chunk at ingest time as metadata["_tokens"] so the
+    keyword bonus doesn't have to re-tokenize chunk text on every query.
+    """
+    return " ".join(sorted(set(_tokenize(text))))
+
+
+def _keyword_bonus(query_tokens: List[str], doc: Dict[str, Any]) -> float:
+    if not query_tokens:
         return 0.0
-    text_lower = text.lower()
-    matches = sum(1 for token in tokens if token in text_lower)
-    return matches / len(tokens)
+    digest = (doc.get("metadata") or {}).get("_tokens")
+    if digest is not None:
+        # Substring test on the joined digest, like the text scan below:
+        # "leak" still matches "leaking". Query tokens are [a-z0-9] runs, so
+        # a match can never span the spaces between digest tokens.
+        haystack = digest
+    else:
+        # Chunks ingested before the digest existed: scan the text itself.
+        haystack = doc.get("text", "").lower()
+    matches = sum(1 for token in query_tokens if token in haystack)
+    return matches / len(query_tokens)
 
 
 def _similarity(a: str, b: str) -> float:
@@ -29,46 +56,89 @@ def retrieve_documents(
     preferred_source: Optional[str] = None,
     collections: tuple[str, ...] = DEFAULT_COLLECTIONS,
 ) -> List[Dict[str, Any]]:
+    results = [
+        query_collection(query=query, collection_name=collection, n_results=top_k)
+        for collection in collections
+    ]
+    return _rerank(query, collections, results, top_k, preferred_source)
+
+
+async def aretrieve_documents(
+    query: str,
+    *,
+    top_k: int = 6,
+    preferred_source: Optional[str] = None,
+    collections: tuple[str, ...] = DEFAULT_COLLECTIONS,
+) -> List[Dict[str, Any]]:
+    """
+    Async counterpart of retrieve_documents(): queries every collection
+    concurrently, then applies the same rerank.
+    """
+    results = await asyncio.gather(
+        *[
+            aquery_collection(query=query, collection_name=collection, n_results=top_k)
+            for collection in collections
+        ]
+    )
+    return _rerank(query, collections, results, top_k, preferred_source)
+
+
+def _rerank(
+    query: str,
+    collections: tuple[str, ...],
+    results: List[List[Dict[str, Any]]],
+    top_k: int,
+    preferred_source: Optional[str],
+) -> List[Dict[str, Any]]:
+    query_tokens = _tokenize(query)
     candidates: List[Dict[str, Any]] = []
-    for collection in collections:
-        docs = query_collection(query=query, collection_name=collection, n_results=top_k)
+    for collection, docs in zip(collections, results):
         for doc in docs:
             item = dict(doc)
             item["source_collection"] = collection
-            item["keyword_bonus"] = _keyword_bonus(query, doc.get("text", ""))
+            item["keyword_bonus"] = _keyword_bonus(query_tokens, doc)
             candidates.append(item)
 
     if not candidates:
         return []
 
-    selected: List[Dict[str, Any]] = []
     lambda_mult = 0.7
     source_bias = 0.1 if preferred_source else 0.0
 
-    remaining = candidates[:]
-    while remaining and len(selected) < top_k:
-        best = None
-        best_score = None
-        for item in remaining:
-            distance = item.get("distance")
-            base_score = -(distance if distance is not None else 1.0)
-            base_score += 0.2 * item.get("keyword_bonus", 0.0)
-            if preferred_source and item.get("source_collection") == preferred_source:
-                base_score += source_bias
-
-            redundancy = 0.0
-            if selected:
-                redundancy = max(_similarity(item.get("text", ""), s.get("text", "")) for s in selected)
-
-            mmr_score = lambda_mult * base_score - (1 - lambda_mult) * redundancy
-            if best_score is None or mmr_score > best_score:
-                best_score = mmr_score
-                best = item
-
-        if best is None:
+    distances = np.array(
+        [c["distance"] if c.get("distance") is not None else 1.0 for c in candidates],
+        dtype=np.float64,
+    )
+    bonuses = np.array([c["keyword_bonus"] for c in candidates], dtype=np.float64)
+    source_mask = np.array(
+        [c["source_collection"] == preferred_source for c in candidates],
+        dtype=np.float64,
+    )
+    base = lambda_mult * (-distances + 0.2 * bonuses + source_bias * source_mask)
+
+    texts = [c.get("text", "") for c in candidates]
+    n = len(candidates)
+    # Max similarity of each candidate to anything already selected; updated
+    # with one row of comparisons per pick instead of rescanning the selection.
+    max_red = np.zeros(n, dtype=np.float64)
+    taken = np.zeros(n, dtype=bool)
+
+    selected: List[Dict[str, Any]] = []
+    picks = min(top_k, n)
+    for _ in range(picks):
+        scores = base - (1 - lambda_mult) * max_red
+        scores[taken] = -np.inf
+        best = int(np.argmax(scores))
+        taken[best] = True
+        selected.append(candidates[best])
+        if len(selected) == picks:
+            # The last pick's similarities would never be read
             break
-        selected.append(best)
-        remaining.remove(best)
 
-    return selected
+        sims = np.array(
+            [0.0 if taken[j] else _similarity(texts[j], texts[best]) for j in range(n)],
+            dtype=np.float64,
+        )
+        np.maximum(max_red, sims, out=max_red)
 
+    return selected
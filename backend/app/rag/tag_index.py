@@ -0,0 +1,124 @@
+"""
+Side index of appliance / symptom tags for the RAG collections.
+
+Chroma metadata only holds scalars, so tags are stored on chunks as
+semicolon-joined strings and a ``$contains`` filter has to scan them. This
+index keeps one (collection, field, term, parent_id) row per tag, where
+parent_id is the blog_id / guide_id already present on every chunk, so a
+filter resolves to a set of ids and is passed to Chroma as
+``{"guide_id": {"$in": [...]}}``.
+
+A filter term matches any tag that contains it, as ``$contains`` does
+("draining" finds guides tagged "not draining"). The primary key narrows
+the scan to one collection and field; the substring test then runs only
+over those tags, not over every chunk's metadata.
+
+The SQLite file lives next to the Chroma store. It is opened, and its
+schema created, once per process; lookups only run their SELECTs.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set
+
+from ..config import settings
+
+_DB_NAME = "tag_index.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS doc_tags (
+    collection TEXT NOT NULL,
+    field TEXT NOT NULL,
+    term TEXT NOT NULL,
+    parent_id TEXT NOT NULL,
+    PRIMARY KEY (collection, field, term, parent_id)
+) WITHOUT ROWID
+"""
+
+
+# One connection is shared by every thread (FastAPI runs sync endpoints in a
+# pool), so each use holds this lock
+_lock = threading.Lock()
+
+
+@lru_cache(maxsize=4)
+def _open(path: Path) -> sqlite3.Connection:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute(_SCHEMA)
+    return conn
+
+
+@contextmanager
+def _connect() -> Iterator[sqlite3.Connection]:
+    """
+    The connection for the current settings.chroma_dir, held under the lock.
+
+    Keyed on the path so tests that point chroma_dir elsewhere get their own.
+    """
+    with _lock:
+        yield _open(settings.chroma_dir / _DB_NAME)
+
+
+def write_tags(collection: str, tags_by_parent: Dict[str, Dict[str, List[str]]]) -> None:
+    """
+    Replace the tags of each parent document in one transaction.
+
+    tags_by_parent: {parent_id: {field: [term, ...]}}
+    """
+    if not tags_by_parent:
+        return
+
+    rows = [
+        (collection, field, term, parent_id)
+        for parent_id, fields in tags_by_parent.items()
+        for field, terms in fields.items()
+        for term in set(terms)
+    ]
+    with _connect() as conn, conn:
+        conn.executemany(
+            "DELETE FROM doc_tags WHERE collection = ? AND parent_id = ?",
+            [(collection, parent_id) for parent_id in tags_by_parent],
+        )
+        conn.executemany("INSERT INTO doc_tags VALUES (?, ?, ?, ?)", rows)
+
+
+def clear_collection(collection: str) -> None:
+    """Drop every tag row for a collection (used when it is reset)."""
+    with _connect() as conn, conn:
+        conn.execute("DELETE FROM doc_tags WHERE collection = ?", (collection,))
+
+
+def parent_ids_matching(collection: str, filters: Dict[str, str]) -> Optional[Set[str]]:
+    """
+    Parent ids with a tag containing each {field: term} in ``filters``.
+
+    Returns None when the collection has never been indexed, so callers can
+    fall back to filtering on the chunk metadata instead.
+    """
+    with _connect() as conn:
+        indexed = conn.execute(
+            "SELECT 1 FROM doc_tags WHERE collection = ? LIMIT 1", (collection,)
+        ).fetchone()
+        if indexed is None:
+            return None
+
+        matched: Optional[Set[str]] = None
+        for field, term in filters.items():
+            ids = {
+                row[0]
+                for row in conn.execute(
+                    "SELECT parent_id FROM doc_tags"
+                    " WHERE collection = ? AND field = ? AND instr(term, ?) > 0",
+                    (collection, field, term),
+                )
+            }
+            matched = ids if matched is None else matched & ids
+            if not matched:
+                return set()
+        return matched if matched is not None else set()
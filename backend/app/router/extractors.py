@@ -5,19 +5,110 @@ Metadata extraction functions for routing.
 
 from __future__ import annotations
 import re
-from typing import Optional
+from typing import Any, Optional
 
-# Regex patterns
-PART_ID_REGEX = r"(PS\d{5,})"
-MODEL_REGEX = r"\b([A-Za-z0-9]{4,}[A-Za-z0-9-]*)\b"
-MPN_REGEX = r"\b([A-Z][A-Z0-9]{4,})\b"
-ORDER_ID_REGEX = r"order\s*#?\s*(\d+)"
+try:  # RE2 guarantees linear-time matching; used when google-re2 is installed
+    import re2
+except ImportError:
+    re2 = None
+
+try:  # one-pass fixed-string matching for the appliance words
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+def _compile(pattern: str, ignore_case: bool = False) -> Any:
+    """
+    Compile a pattern for ASCII text: with RE2 when available, else with ``re``
+    in ASCII mode so both agree.
+
+    RE2's word boundaries, digits and whitespace are ASCII-only, and it has no
+    lookarounds to spell out Unicode ones, so non-ASCII text goes to the
+    ``_UNICODE_*`` patterns below, which always use ``re``.
+    """
+    if re2 is not None:
+        return re2.compile(("(?i)" if ignore_case else "") + pattern)
+    return re.compile(pattern, re.ASCII | (re.IGNORECASE if ignore_case else 0))
+
+
+# Regex patterns (compiled once). Every pattern is ASCII-only and matched
+# case-insensitively on the original text, so no lower()/upper() copy of the
+# message is made; only a captured token is upper-cased.
+PART_ID_RE = _compile(r"PS\d{5,}", ignore_case=True)
+MODEL_RE = _compile(r"\b[A-Za-z0-9]{4}[A-Za-z0-9-]*\b")
+MPN_RE = _compile(r"\b[A-Z][A-Z0-9]{4,}\b", ignore_case=True)
+
+# The patterns above are only used on ASCII text. Under re.ASCII every
+# non-ASCII letter counts as a word boundary, which would pull IDs out of the
+# middle of words ("Ölfilter123" -> "LFILTER123"). Non-ASCII text is therefore
+# matched as it always was: upper-cased, with Unicode \b and \d.
+_UNICODE_PART_ID_RE = re.compile(r"PS\d{5,}")
+_UNICODE_MODEL_RE = re.compile(r"\b[A-Za-z0-9]{4}[A-Za-z0-9-]*\b")
+_UNICODE_MPN_RE = re.compile(r"\b[A-Z][A-Z0-9]{4,}\b")
+
+# On ASCII text every ID pattern needs a digit; used as a cheap pre-check
+DIGIT_RE = _compile(r"[0-9]")
+
+# Order ID: "order number (is) #X", "order id #X" / "orderid #X", "order #X" / "order X".
+# Alternatives are tried in that order at each "order"; only one group captures.
+_ORDER_PATTERN = (
+    r"order(?:\s+number\s+(?:is\s+)?(?:#\s*)?(\d{1,6})"
+    r"|\s*id\s*(?:#\s*)?(\d{1,6})"
+    r"|\s*(?:#\s*)?(\d+))"
+)
+ORDER_RE = _compile(_ORDER_PATTERN, ignore_case=True)
+# Non-ASCII text: lower-cased copy, Unicode \s and \d (e.g. "order\u00a0#5")
+_UNICODE_ORDER_RE = re.compile(_ORDER_PATTERN)
+
+# Appliance words; the group name is the returned appliance type
+APPLIANCE_RE = _compile(
+    r"(?P<dishwasher>dishwasher)|(?P<refrigerator>fridge|refrigerator)", ignore_case=True
+)
+DISHWASHER_RE = _compile(r"dishwasher", ignore_case=True)
+
+# Appliance word -> appliance type
+APPLIANCE_WORDS = {
+    "dishwasher": "dishwasher",
+    "fridge": "refrigerator",
+    "refrigerator": "refrigerator",
+}
+
+
+def _appliance_automaton() -> Any:
+    automaton = ahocorasick.Automaton()
+    for word, appliance in APPLIANCE_WORDS.items():
+        automaton.add_word(word, appliance)
+    automaton.make_automaton()
+    return automaton
+
+
+_APPLIANCE_AC = _appliance_automaton() if ahocorasick is not None else None
+
+# Every pattern this module compiles, built once at import and kept for the
+# process lifetime
+PATTERNS = {
+    "part_id": PART_ID_RE,
+    "model": MODEL_RE,
+    "mpn": MPN_RE,
+    "unicode_part_id": _UNICODE_PART_ID_RE,
+    "unicode_model": _UNICODE_MODEL_RE,
+    "unicode_mpn": _UNICODE_MPN_RE,
+    "digit": DIGIT_RE,
+    "order_id": ORDER_RE,
+    "unicode_order_id": _UNICODE_ORDER_RE,
+    "appliance": APPLIANCE_RE,
+    "dishwasher": DISHWASHER_RE,
+}
 
 
 def extract_part_id(text: str) -> Optional[str]:
     """Extract PartSelect part ID (e.g., PS734936) from text."""
-    m = re.search(PART_ID_REGEX, text.upper())
-    return m.group(1) if m else None
+    if not text.isascii():
+        m = _UNICODE_PART_ID_RE.search(text.upper())
+        return m.group() if m else None
+    m = PART_ID_RE.search(text)
+    return m.group().upper() if m else None
 
 
 def extract_model_number(text: str) -> Optional[str]:
@@ -27,13 +118,17 @@ def extract_model_number(text: str) -> Optional[str]:
     - mix of letters+digits
     - but NOT PS part IDs
     """
-    text_up = text.upper()
-    candidates = re.findall(MODEL_REGEX, text_up)
-    for c in candidates:
-        if c.startswith("PS"):
+    if text.isascii():
+        matches = MODEL_RE.finditer(text)
+    else:
+        matches = _UNICODE_MODEL_RE.finditer(text.upper())
+    for m in matches:
+        c = m.group()
+        if c[:2].upper() == "PS":
             continue
-        if len(c) >= 6 and any(ch.isdigit() for ch in c):
-            return c
+        # Candidates are [A-Za-z0-9-] only, so "not all letters" means "has a digit"
+        if len(c) >= 6 and not c.replace("-", "").isalpha():
+            return c.upper()
     return None
 
 
@@ -42,13 +137,16 @@ def extract_mpn(text: str) -> Optional[str]:
     Extract manufacturer part number from text.
     Examples: W10321304, 242126602, etc.
     """
-    text_up = text.upper()
-    candidates = re.findall(MPN_REGEX, text_up)
-    for token in candidates:
-        if token.startswith("PS"):
+    if text.isascii():
+        matches = MPN_RE.finditer(text)
+    else:
+        matches = _UNICODE_MPN_RE.finditer(text.upper())
+    for m in matches:
+        token = m.group()
+        if token[:2].upper() == "PS":
             continue
-        if any(ch.isdigit() for ch in token):
-            return token
+        if not token.isalpha():
+            return token.upper()
     return None
 
 
@@ -62,37 +160,45 @@ def extract_order_id(text: str) -> Optional[str]:
     - "order number is #4"
     - "orderid #3"
     """
-    text_lower = text.lower()
-    
-    # Try "order number is #X" or "order number #X"
-    m = re.search(r"order\s+number\s+(?:is\s+)?#?\s*(\d{1,6})", text_lower)
-    if m:
-        return m.group(1)
-    
-    # Try "orderid #X" or "order id #X"
-    m = re.search(r"order\s*id\s*#?\s*(\d{1,6})", text_lower)
-    if m:
-        return m.group(1)
-    
-    # Try the standard pattern "order #X"
-    m = re.search(ORDER_ID_REGEX, text_lower)
-    if m:
-        return m.group(1)
-    
-    # Try "order X" (standalone number after "order")
-    m = re.search(r"order\s+(\d{1,6})", text_lower)
-    if m:
-        return m.group(1)
-    
+    if text.isascii():
+        m = ORDER_RE.search(text)
+    else:
+        m = _UNICODE_ORDER_RE.search(text.lower())
+    if m and m.lastindex:
+        return m.group(m.lastindex)
     return None
 
 
 def extract_appliance_type(text: str) -> Optional[str]:
     """Extract appliance type (dishwasher or refrigerator) from text."""
-    txt = text.lower()
-    if "dishwasher" in txt:
-        return "dishwasher"
-    if "fridge" in txt or "refrigerator" in txt:
-        return "refrigerator"
-    return None
+    if _APPLIANCE_AC is None:
+        return _appliance_type_by_regex(text)
+    return extract_appliance_type_from_lower(text.lower())
+
 
+def extract_appliance_type_from_lower(text_lower: str) -> Optional[str]:
+    """
+    extract_appliance_type for text the caller has already lower-cased.
+
+    The automaton only holds lower-case words, so mixed-case text must go
+    through extract_appliance_type instead.
+    """
+    if _APPLIANCE_AC is None:
+        return _appliance_type_by_regex(text_lower)
+    # "dishwasher" wins when both appliances are mentioned
+    found = None
+    for _, appliance in _APPLIANCE_AC.iter(text_lower):
+        if appliance == "dishwasher":
+            return appliance
+        found = appliance
+    return found
+
+
+def _appliance_type_by_regex(text: str) -> Optional[str]:
+    m = APPLIANCE_RE.search(text)
+    if not m:
+        return None
+    # "dishwasher" wins when both appliances are mentioned
+    if m.lastgroup == "refrigerator" and DISHWASHER_RE.search(text, m.end()):
+        return "dishwasher"
+    return m.lastgroup
@@ -1,9 +1,9 @@
 # app/router/intents.py
 
 from __future__ import annotations
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from enum import Enum
-from typing import List, Optional
+from typing import Optional, Tuple
 
 
 class Intent(str, Enum):
@@ -17,7 +17,8 @@ class Intent(str, Enum):
     CLARIFICATION = "clarification"          # we need more info first
 
 
-@dataclass
+# Decisions are frozen so route_intent can hand out cached instances safely.
+@dataclass(frozen=True, slots=True)
 class RoutingMetadata:
     language: str = "en"
     appliance_type: Optional[str] = None          # "refrigerator", "dishwasher"
@@ -27,10 +28,10 @@ class RoutingMetadata:
     brand: Optional[str] = None
     model: Optional[str] = None
     order_id: Optional[str] = None
-    missing_fields: List[str] = field(default_factory=list)
+    missing_fields: Tuple[str, ...] = ()
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class RouteDecision:
     intent: Intent
     normalized_query: str
@@ -1,10 +1,23 @@
 # app/router/keywords.py
 """
-Static keyword lists for intent routing.
+Static keyword sets for intent routing.
+
+All sets are also compiled once into a single scanner that reports, in one
+pass over a message, which buckets have a keyword in it (as a bitmask of the
+``*_BIT`` flags below). The scanner is an Aho-Corasick automaton
+(``pyahocorasick``), or a regex alternation if it isn't installed.
 """
 
+import re
+from typing import Callable, Dict
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 # Policy-related keywords
-POLICY_KEYWORDS = [
+POLICY_KEYWORDS = frozenset({
     "return policy",
     "return window",
     "policy",
@@ -13,10 +26,10 @@ POLICY_KEYWORDS = [
     "guarantee",
     "shipping policy",
     "price match",
-]
+})
 
 # Order support keywords
-ORDER_KEYWORDS = [
+ORDER_KEYWORDS = frozenset({
     "order",
     "ordr",
     "oder",
@@ -34,17 +47,17 @@ ORDER_KEYWORDS = [
     "is my return",
     "return my order",
     "need to return",
-]
+})
 
 # Compatibility check keywords
-COMPAT_KEYWORDS = [
+COMPAT_KEYWORDS = frozenset({
     "compatible",
     "fit",
     "work with",
-]
+})
 
 # General repair words (for appliance type + repair detection)
-GENERAL_REPAIR_WORDS = [
+GENERAL_REPAIR_WORDS = frozenset({
     "repair",
     "fix",
     "broken",
@@ -59,10 +72,10 @@ GENERAL_REPAIR_WORDS = [
     "what should",
     "what to do",
     "help with",
-]
+})
 
 # Specific repair symptom keywords
-REPAIR_KEYWORDS = [
+REPAIR_KEYWORDS = frozenset({
     "leak",
     "leaking",
     "noisy",
@@ -94,10 +107,10 @@ REPAIR_KEYWORDS = [
     "jammed",
     "overflow",
     "flooding",
-]
+})
 
 # How-to / usage keywords
-HOWTO_KEYWORDS = [
+HOWTO_KEYWORDS = frozenset({
     "how to",
     "how do i",
     "what is",
@@ -111,5 +124,102 @@ HOWTO_KEYWORDS = [
     "settings",
     "reset",
     "clean cycle",
-]
+})
+
+
+
+# ------------------------------------------------------------
+# Compiled scanner
+# ------------------------------------------------------------
+
+# Bucket flags returned by scan_keywords
+POLICY_BIT = 1 << 0
+ORDER_BIT = 1 << 1
+COMPAT_BIT = 1 << 2
+GENERAL_REPAIR_BIT = 1 << 3
+REPAIR_BIT = 1 << 4
+HOWTO_BIT = 1 << 5
+ALL_BUCKET_BITS = (1 << 6) - 1
+
+_BUCKETS = (
+    (POLICY_KEYWORDS, POLICY_BIT),
+    (ORDER_KEYWORDS, ORDER_BIT),
+    (COMPAT_KEYWORDS, COMPAT_BIT),
+    (GENERAL_REPAIR_WORDS, GENERAL_REPAIR_BIT),
+    (REPAIR_KEYWORDS, REPAIR_BIT),
+    (HOWTO_KEYWORDS, HOWTO_BIT),
+)
+
+# No message shorter than this can contain a keyword
+MIN_KEYWORD_LEN = min(len(k) for keywords, _ in _BUCKETS for k in keywords)
+
+
+def _keyword_bits() -> Dict[str, int]:
+    """Map each keyword to the buckets it belongs to (some are in several)."""
+    bits: Dict[str, int] = {}
+    for keywords, bit in _BUCKETS:
+        for k in keywords:
+            bits[k] = bits.get(k, 0) | bit
+    return bits
+
+
+def _or_bits(values) -> int:
+    out = 0
+    for v in values:
+        out |= v
+    return out
+
+
+def _regex_scanner(bits: Dict[str, int]) -> Callable[[str], int]:
+    """
+    Scan with one zero-width alternation, tried at every position.
+
+    At each position only the longest keyword starting there is reported, so
+    each keyword's flags also include those of every keyword that is a prefix
+    of it ("shipping policy" carries the "shipping" flags too).
+    """
+    ordered = sorted(bits, key=len, reverse=True)
+    pattern = re.compile("(?=(" + "|".join(re.escape(k) for k in ordered) + "))")
+    closed = {
+        k: _or_bits(v for p, v in bits.items() if k.startswith(p))
+        for k in bits
+    }
+
+    def scan(msg: str) -> int:
+        found = 0
+        for m in pattern.finditer(msg):
+            found |= closed[m.group(1)]
+            if found == ALL_BUCKET_BITS:
+                break
+        return found
+
+    return scan
+
+
+def _ahocorasick_scanner(bits: Dict[str, int]) -> Callable[[str], int]:
+    """Scan with an Aho-Corasick automaton; it reports overlapping matches itself."""
+    automaton = ahocorasick.Automaton()
+    for k, v in bits.items():
+        automaton.add_word(k, v)
+    automaton.make_automaton()
+
+    def scan(msg: str) -> int:
+        found = 0
+        for _, v in automaton.iter(msg):
+            found |= v
+            if found == ALL_BUCKET_BITS:
+                break
+        return found
+
+    return scan
+
+
+if ahocorasick is not None:
+    _scan = _ahocorasick_scanner(_keyword_bits())
+else:
+    _scan = _regex_scanner(_keyword_bits())
+
 
+def scan_keywords(msg: str) -> int:
+    """Return the ``*_BIT`` flags of every bucket with a keyword in ``msg``."""
+    return _scan(msg)
@@ -2,151 +2,196 @@
 
 from __future__ import annotations
 
+from functools import lru_cache
+from typing import Tuple
+
 from .intents import Intent, RouteDecision, RoutingMetadata
 from .extractors import (
+    DIGIT_RE,
     extract_part_id,
     extract_model_number,
     extract_mpn,
     extract_order_id,
-    extract_appliance_type,
+    extract_appliance_type_from_lower,
 )
 from .keywords import (
-    POLICY_KEYWORDS,
-    ORDER_KEYWORDS,
-    COMPAT_KEYWORDS,
-    GENERAL_REPAIR_WORDS,
-    REPAIR_KEYWORDS,
-    HOWTO_KEYWORDS,
+    POLICY_BIT,
+    ORDER_BIT,
+    COMPAT_BIT,
+    GENERAL_REPAIR_BIT,
+    REPAIR_BIT,
+    HOWTO_BIT,
+    MIN_KEYWORD_LEN,
+    scan_keywords,
 )
 
 
 # ------------------------------------------------------------
-# Main routing
+# Dispatch table
 # ------------------------------------------------------------
+# route_intent reduces a message to a bitmask of signals and looks the
+# outcome up in _DISPATCH, which is built once from the rules in _decide.
+
+# Keyword buckets use the low bits exactly as scan_keywords reports them
+_POLICY_KW = POLICY_BIT
+_ORDER = ORDER_BIT          # order keyword, or an extracted order id
+_COMPAT_KW = COMPAT_BIT
+_GENERAL_REPAIR_KW = GENERAL_REPAIR_BIT
+_REPAIR_KW = REPAIR_BIT
+_HOWTO_KW = HOWTO_BIT
+_PART_ID = 1 << 6
+_MODEL = 1 << 7
+_MPN = 1 << 8
+_APPLIANCE = 1 << 9
+_SIGNAL_COUNT = 10
+
+
+def _decide(mask: int) -> Tuple[Intent, str]:
+    """Routing rules, in priority order, for one combination of signals."""
+    # 1. POLICY (check before order support to catch "return policy" etc.)
+    if mask & _POLICY_KW:
+        return Intent.POLICY, "policy"
 
-def route_intent(user_message: str) -> RouteDecision:
-    msg = user_message.lower().strip()
+    # 2. ORDER SUPPORT (when order_id present or order-related keywords)
+    if mask & _ORDER:
+        return Intent.ORDER_SUPPORT, "order_support"
 
-    # -----------------------------
-    # Metadata extraction
-    # -----------------------------
-    part_id = extract_part_id(user_message)
-    model_number = extract_model_number(user_message)
-    manufacturer_part_number = extract_mpn(user_message)
-    order_id = extract_order_id(user_message)
-    appliance_type = extract_appliance_type(user_message)
-
-    metadata = RoutingMetadata(
-        appliance_type=appliance_type,
-        part_id=part_id,
-        model_number=model_number,
-        manufacturer_part_number=manufacturer_part_number,
-        brand=None,
-        order_id=order_id,
-        missing_fields=[],
-    )
+    # 3. COMPATIBILITY CHECK (needs both a part ID and a model number)
+    if mask & _COMPAT_KW:
+        if mask & _PART_ID and mask & _MODEL:
+            return Intent.COMPAT_CHECK, "compat_full"
+        return Intent.CLARIFICATION, "compat_missing_fields"
 
-    # -----------------------------
-    # 1. POLICY (check before order support to catch "return policy" etc.)
-    # -----------------------------
-    if any(k in msg for k in POLICY_KEYWORDS):
-        return RouteDecision(
-            intent=Intent.POLICY,
-            normalized_query=user_message,
-            metadata=metadata,
-            debug_reason="policy",
-        )
+    # 4. PRODUCT INFO (any ID)
+    if mask & (_PART_ID | _MPN):
+        return Intent.PRODUCT_INFO, "product_info_by_id_or_model"
 
-    # -----------------------------
-    # 2. ORDER SUPPORT (when order_id present or order-related keywords)
-    # -----------------------------
-    if order_id or any(k in msg for k in ORDER_KEYWORDS):
-        return RouteDecision(
-            intent=Intent.ORDER_SUPPORT,
-            normalized_query=user_message,
-            metadata=metadata,
-            debug_reason="order_support",
-        )
+    # 5. REPAIR HELP: appliance type + general repair words (no IDs, see 4.)
+    if mask & _APPLIANCE and mask & _GENERAL_REPAIR_KW:
+        return Intent.REPAIR_HELP, "repair_appliance_type_general"
 
-    # -----------------------------
-    # 3. COMPATIBILITY CHECK
-    # -----------------------------
-    if any(k in msg for k in COMPAT_KEYWORDS):
-        missing = []
-        if not (part_id):
-            missing.append("part_id")
-        if not model_number:
-            missing.append("model_number")
-
-        if missing:
-            metadata.missing_fields = missing
-            return RouteDecision(
-                intent=Intent.CLARIFICATION,
-                normalized_query=user_message,
-                metadata=metadata,
-                debug_reason="compat_missing_fields",
-            )
-
-        return RouteDecision(
-            intent=Intent.COMPAT_CHECK,
-            normalized_query=user_message,
-            metadata=metadata,
-            debug_reason="compat_full",
-        )
+    # 6. REPAIR HELP: specific symptom keywords
+    if mask & _REPAIR_KW:
+        return Intent.REPAIR_HELP, "repair_symptom_keywords"
 
-    # -----------------------------
-    # 5. PRODUCT INFO (any ID)
-    # -----------------------------
-    if part_id or manufacturer_part_number:
-        return RouteDecision(
-            intent=Intent.PRODUCT_INFO,
-            normalized_query=user_message,
-            metadata=metadata,
-            debug_reason="product_info_by_id_or_model",
-        )
+    # 7. BLOG HOW-TO / USAGE
+    if mask & _HOWTO_KW:
+        return Intent.BLOG_HOWTO, "usage_keywords"
+
+    # 8. OUT OF SCOPE
+    return Intent.OUT_OF_SCOPE, "fallback_out_of_scope"
+
+
+_DISPATCH: Tuple[Tuple[Intent, str], ...] = tuple(
+    _decide(mask) for mask in range(1 << _SIGNAL_COUNT)
+)
+
+# Shared by every decision that extracted nothing (small talk, policy, how-to)
+_EMPTY_METADATA = RoutingMetadata()
+
+# Every ID and appliance word is longer than the shortest keyword, so a
+# message below MIN_KEYWORD_LEN carries no signal at all
+_NO_SIGNAL_INTENT, _NO_SIGNAL_REASON = _DISPATCH[0]
+
+_set = object.__setattr__
+
+
+def _decision(intent: Intent, query: str, metadata: RoutingMetadata, reason: str) -> RouteDecision:
+    """Build a RouteDecision directly; the frozen dataclass __init__ is ~2x slower."""
+    decision = RouteDecision.__new__(RouteDecision)
+    _set(decision, "intent", intent)
+    _set(decision, "normalized_query", query)
+    _set(decision, "metadata", metadata)
+    _set(decision, "debug_reason", reason)
+    return decision
+
+
+# ------------------------------------------------------------
+# Main routing
+# ------------------------------------------------------------
+
+def route_intent(user_message: str) -> RouteDecision:
+    # Routing only depends on the case-folded, stripped text, so messages that
+    # differ in case or surrounding whitespace share one cache entry. The
+    # decision still carries the caller's original text.
+    stripped = user_message.strip()
+    msg = stripped.lower()
+    if len(msg) < MIN_KEYWORD_LEN:
+        # "", "k", "ok": nothing to extract or scan, and not worth a cache slot
+        return _decision(_NO_SIGNAL_INTENT, user_message, _EMPTY_METADATA, _NO_SIGNAL_REASON)
+    if not stripped.isascii():
+        # Folding non-ASCII text can change the IDs in it ("İ" lowers to "i"
+        # plus a combining dot, which reads as a word boundary), so IDs are
+        # extracted from the unfolded text and it is the cache key
+        msg = stripped
+    intent, metadata, debug_reason = _route_normalized(msg)
+    return _decision(intent, user_message, metadata, debug_reason)
+
+
+def route_cache_info():
+    """Hit/miss statistics of the routing cache."""
+    return _route_normalized.cache_info()
+
+
+@lru_cache(maxsize=4096)
+def _route_normalized(msg: str) -> Tuple[Intent, RoutingMetadata, str]:
+    # msg is already lower-cased when it is ASCII; see route_intent
+    non_ascii = not msg.isascii()
+    folded = msg.lower() if non_ascii else msg
 
     # -----------------------------
-    # 4. REPAIR HELP (symptoms)
+    # Metadata extraction
     # -----------------------------
-    
-    # General repair detection: appliance type + repair words + no part ID
-    if (appliance_type and 
-        not part_id and 
-        not manufacturer_part_number and
-        any(k in msg for k in GENERAL_REPAIR_WORDS)):
-        return RouteDecision(
-            intent=Intent.REPAIR_HELP,
-            normalized_query=user_message,
-            metadata=metadata,
-            debug_reason="repair_appliance_type_general",
-        )
-    
-    # Specific symptom keywords
-    if any(k in msg for k in REPAIR_KEYWORDS):
-        return RouteDecision(
-            intent=Intent.REPAIR_HELP,
-            normalized_query=user_message,
-            metadata=metadata,
-            debug_reason="repair_symptom_keywords",
+    # Every ID needs a digit, so skip the ID regexes for digit-free messages
+    # and guard the part/order patterns on their literal prefixes. Both
+    # sentinels are ASCII, so they don't apply to non-ASCII text: IDs there
+    # may use Unicode digits, and "ſ" upper-cases to "S".
+    part_id = model_number = manufacturer_part_number = order_id = None
+    if non_ascii or DIGIT_RE.search(msg):
+        if non_ascii or "ps" in folded:
+            part_id = extract_part_id(msg)
+        model_number = extract_model_number(msg)
+        manufacturer_part_number = extract_mpn(msg)
+        if "order" in folded:
+            order_id = extract_order_id(msg)
+    appliance_type = extract_appliance_type_from_lower(folded)
+
+    # -----------------------------
+    # Signal mask + dispatch
+    # -----------------------------
+    mask = scan_keywords(folded)
+    if order_id:
+        mask |= _ORDER
+    if part_id:
+        mask |= _PART_ID
+    if model_number:
+        mask |= _MODEL
+    if manufacturer_part_number:
+        mask |= _MPN
+    if appliance_type:
+        mask |= _APPLIANCE
+
+    intent, debug_reason = _DISPATCH[mask]
+
+    missing: Tuple[str, ...] = ()
+    if intent is Intent.CLARIFICATION:
+        missing = tuple(
+            name
+            for name, value in (("part_id", part_id), ("model_number", model_number))
+            if not value
         )
 
-    # -----------------------------
-    # 5. BLOG HOW-TO / USAGE
-    # -----------------------------
-    if any(k in msg for k in HOWTO_KEYWORDS):
-        return RouteDecision(
-            intent=Intent.BLOG_HOWTO,
-            normalized_query=user_message,
-            metadata=metadata,
-            debug_reason="usage_keywords",
+    if part_id or model_number or manufacturer_part_number or order_id or appliance_type or missing:
+        metadata = RoutingMetadata(
+            appliance_type=appliance_type,
+            part_id=part_id,
+            model_number=model_number,
+            manufacturer_part_number=manufacturer_part_number,
+            brand=None,
+            order_id=order_id,
+            missing_fields=missing,
         )
+    else:
+        metadata = _EMPTY_METADATA
 
-    # -----------------------------
-    # 6. OUT OF SCOPE
-    # -----------------------------
-    return RouteDecision(
-        intent=Intent.OUT_OF_SCOPE,
-        normalized_query=user_message,
-        metadata=metadata,
-        debug_reason="fallback_out_of_scope",
-    )
+    return intent, metadata, debug_reason
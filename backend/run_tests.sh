@@ -12,16 +12,30 @@ RED='\033[0;31m'
 YELLOW='\033[1;33m'
 NC='\033[0m' # No Color
 
+# Spread tests over all cores when pytest-xdist is installed; loadscope keeps
+# each test class on one worker
+PARALLEL=""
+if python -c "import xdist" 2>/dev/null; then
+    PARALLEL="-n auto --dist=loadscope"
+fi
+
 # Run unit tests
 echo -e "${YELLOW}Running unit tests...${NC}"
-pytest tests/unit/ -v --tb=short
+pytest tests/unit/ -v --tb=short $PARALLEL
 UNIT_EXIT=$?
 
 echo ""
 echo -e "${YELLOW}Running integration tests...${NC}"
-pytest tests/integration/ -v --tb=short
+pytest tests/integration/ -v --tb=short -m "not serial" $PARALLEL
 INTEGRATION_EXIT=$?
 
+# Tests that share on-disk state (e.g. the Chroma store) run in one process
+pytest tests/integration/ -v --tb=short -m serial
+SERIAL_EXIT=$?
+if [ $SERIAL_EXIT -ne 0 ]; then
+    INTEGRATION_EXIT=$SERIAL_EXIT
+fi
+
 echo ""
 echo "=========================================="
 if [ $UNIT_EXIT -eq 0 ] && [ $INTEGRATION_EXIT -eq 0 ]; then
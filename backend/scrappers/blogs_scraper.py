@@ -1,15 +1,65 @@
+import asyncio
+import importlib.util
 import json
 import time
 import random
+from concurrent.futures import ThreadPoolExecutor
+import httpx
+from selectolax.lexbor import LexborHTMLParser
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
-from bs4 import BeautifulSoup
 import tempfile
 
+from browser_pool import BrowserPool
+
+
+USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36"
+)
+# Fixed Chrome flags; only the per-driver profile dir is added in setup_driver
+CHROME_ARGS = (
+    "--disable-gpu",
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-extensions",
+    "--disable-notifications",
+    "--disable-popup-blocking",
+    "--disable-infobars",
+    "--disable-blink-features=AutomationControlled",
+    "--window-size=1920,1080",
+    f"--user-agent={USER_AGENT}",
+    "--accept-language=en-US,en;q=0.9",
+    "--accept=text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+    # Only article text is scraped; don't wait for images either (see safe_navigate)
+    "--blink-settings=imagesEnabled=false",
+)
+
+# Hides navigator.webdriver from the page's own scripts
+HIDE_WEBDRIVER_JS = """
+Object.defineProperty(navigator, 'webdriver', {
+    get: () => undefined
+});
+"""
+
+REQUEST_HEADERS = {
+    "User-Agent": USER_AGENT,
+    "Accept-Language": "en-US,en;q=0.9",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+}
+# Parallel requests to partselect.com at once
+MAX_CONNECTIONS = 4
+# Chrome instances for the browser fallback
+POOL_SIZE = 2
+# Present once an article's body text has rendered
+ARTICLE_TEXT_SELECTOR = "div.blog__article-page__content p"
+# HTTP/2 needs the optional "h2" package (pip install httpx[http2])
+HTTP2 = importlib.util.find_spec("h2") is not None
+
 
 # ----------------------------------------------------------
 # SETUP DRIVER
@@ -20,44 +70,22 @@ def setup_driver():
     print("Setting up Chrome WebDriver...")
     
     chrome_options = Options()
-    user_agent = (
-        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36"
-    )
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--disable-extensions")
-    chrome_options.add_argument("--disable-notifications")
-    chrome_options.add_argument("--disable-popup-blocking")
-    chrome_options.add_argument("--disable-infobars")
-    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-    chrome_options.add_argument("--window-size=1920,1080")
-    chrome_options.add_argument(f"--user-agent={user_agent}")
-    chrome_options.add_argument("--accept-language=en-US,en;q=0.9")
-    chrome_options.add_argument(
-        "--accept=text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8"
-    )
+    for arg in CHROME_ARGS:
+        chrome_options.add_argument(arg)
     chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
     chrome_options.add_experimental_option("useAutomationExtension", False)
     temp_dir = tempfile.mkdtemp(prefix="blog_chrome_")
     chrome_options.add_argument(f"--user-data-dir={temp_dir}")
+    chrome_options.page_load_strategy = "none"
     print(f"Using temporary directory: {temp_dir}")
     
     try:
         driver = webdriver.Chrome(options=chrome_options)
         driver.execute_cdp_cmd(
-            "Network.setUserAgentOverride", {"userAgent": user_agent}
+            "Network.setUserAgentOverride", {"userAgent": USER_AGENT}
         )
         driver.execute_cdp_cmd(
-            "Page.addScriptToEvaluateOnNewDocument",
-            {
-                "source": """
-                    Object.defineProperty(navigator, 'webdriver', {
-                        get: () => undefined
-                    });
-                """
-            },
+            "Page.addScriptToEvaluateOnNewDocument", {"source": HIDE_WEBDRIVER_JS}
         )
         driver.set_page_load_timeout(60)
         driver.implicitly_wait(20)
@@ -79,18 +107,18 @@ def safe_navigate(driver, url, max_retries=3):
             print(f"Navigating to {url} (attempt {attempt+1}/{max_retries})")
             driver.get(url)
 
+            # driver.get() returns immediately with page_load_strategy "none":
+            # wait for the parsed DOM, then stop loading images/ads/trackers.
             WebDriverWait(driver, 30).until(
-                lambda d: d.execute_script("return document.readyState") == "complete"
+                lambda d: d.execute_script("return document.readyState") != "loading"
             )
+            driver.execute_script("window.stop();")
 
             if "Access Denied" in driver.title or "Forbidden" in driver.title:
                 print("Access denied, retrying...")
                 time.sleep(random.uniform(5, 10))
                 continue
 
-            time.sleep(3)
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(2)
             return True
 
         except Exception as e:
@@ -100,97 +128,171 @@ def safe_navigate(driver, url, max_retries=3):
     return False
 
 
+# ----------------------------------------------------------
+# HTTP FETCH
+# ----------------------------------------------------------
+# Blog articles are static HTML, so they are fetched without a browser.
+# Chrome is only started for pages the plain request can't get (e.g. 403).
+
+async def fetch_blog_html(client, url):
+    """Fetch a blog page over HTTP. Returns None if blocked or failed."""
+    try:
+        resp = await client.get(url)
+    except httpx.HTTPError as e:
+        print(f"HTTP error for {url}: {e}")
+        return None
+
+    if resp.status_code != 200:
+        print(f"HTTP {resp.status_code} for {url}, will retry in browser")
+        return None
+    return resp.text
+
+
+async def fetch_all(urls):
+    """Fetch every URL concurrently; results line up with ``urls``."""
+    async with httpx.AsyncClient(
+        headers=REQUEST_HEADERS,
+        http2=HTTP2,
+        follow_redirects=True,
+        timeout=30,
+        limits=httpx.Limits(max_connections=MAX_CONNECTIONS),
+    ) as client:
+        return await asyncio.gather(*(fetch_blog_html(client, url) for url in urls))
+
+
 # ----------------------------------------------------------
 # SCRAPE SELECTED BLOGS
 # ----------------------------------------------------------
 
-def extract_sections(soup):
-    container = soup.select_one("div.blog__article-page__content")
+def extract_sections(tree):
+    container = tree.css_first("div.blog__article-page__content")
     if not container:
         return []
 
     sections = []
-    current = None
+    heading = None
+    text_parts = []
     heading_tags = {"h2", "h3", "h4"}
 
-    for child in container.children:
-        tag = getattr(child, "name", None)
-        if tag in heading_tags:
-            if current and current["text"].strip():
-                sections.append(current)
-            current = {"heading": child.get_text(strip=True), "text": ""}
-        elif current and hasattr(child, "get_text"):
-            text = child.get_text(" ", strip=True)
+    # include_text keeps bare text between elements, like BeautifulSoup's .children
+    for child in container.iter(include_text=True):
+        if child.tag in heading_tags:
+            if text_parts:
+                sections.append({"heading": heading, "text": " ".join(text_parts)})
+            heading = child.text(strip=True)
+            text_parts = []
+        elif heading is not None:
+            text = child.text(separator=" ", strip=True)
             if text:
-                if current["text"]:
-                    current["text"] += " "
-                current["text"] += text
+                text_parts.append(text)
 
-    if current and current["text"].strip():
-        sections.append(current)
+    if text_parts:
+        sections.append({"heading": heading, "text": " ".join(text_parts)})
 
     if not sections:
         sections.append(
             {
                 "heading": "Summary",
-                "text": container.get_text(" ", strip=True),
+                "text": container.text(separator=" ", strip=True),
             }
         )
 
     return sections
 
 
+def parse_blog(html, url):
+    """Build the blog record from a page's HTML."""
+    tree = LexborHTMLParser(html)
+
+    title = url
+    header = tree.css_first("h1")
+    if header:
+        title = header.text(strip=True)
+
+    sections = extract_sections(tree)
+    slug = url.rstrip("/").split("/")[-1] or "blog"
+    blog_id = f"blog_{slug}"
+
+    return {"id": blog_id, "title": title, "url": url, "sections": sections}
+
+
+def has_selector(driver, selector):
+    """True if ``selector`` matches now (no implicit wait, unlike find_element)."""
+    return driver.execute_script("return document.querySelector(arguments[0]) !== null;", selector)
+
+
 def scrape_single_blog(driver, url):
-    """Navigate to a provided blog URL and extract structured sections."""
+    """Navigate to a provided blog URL in the browser and extract structured sections."""
     if not safe_navigate(driver, url):
         print(f"Skipping {url} due to navigation failure.")
         return None
 
-    driver.execute_script("window.scrollTo(0, document.body.scrollHeight/3);")
-    time.sleep(1)
-    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-    time.sleep(1)
+    # Most articles render without scrolling; only nudge lazy content if missing
+    if not has_selector(driver, ARTICLE_TEXT_SELECTOR):
+        time.sleep(3)
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight/3);")
+        time.sleep(1)
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        time.sleep(1)
 
-    soup = None
     try:
-        soup = BeautifulSoup(driver.page_source, "html.parser")
+        return parse_blog(driver.page_source, url)
     except Exception as e:
         print(f"Failed to parse HTML for {url}: {e}")
+        return None
 
-    title = url
-    if soup:
-        header = soup.find("h1")
-        if header:
-            title = header.get_text(strip=True)
 
-    sections = extract_sections(soup) if soup else []
-    slug = url.rstrip("/").split("/")[-1] or "blog"
-    blog_id = f"blog_{slug}"
-
-    return {"id": blog_id, "title": title, "url": url, "sections": sections}
+def scrape_blog_pooled(pool, url):
+    """Scrape one blog on the next free driver of ``pool``."""
+    with pool.acquire() as driver:
+        print(f"\nScraping blog in browser: {url}")
+        data = scrape_single_blog(driver, url)
+        # Politeness delay before the driver takes the next URL
+        time.sleep(random.uniform(2, 4))
+    return data
 
 
-def scrape_selected_blogs(blog_urls):
-    results = []
-    driver = setup_driver()
+def scrape_with_browser(blog_urls, pool=None):
+    """Scrape URLs in Chrome, in parallel over ``pool`` (a one-off pool if omitted)."""
+    results = {}
+    own_pool = pool is None
+    if own_pool:
+        pool = BrowserPool(setup_driver, size=min(POOL_SIZE, len(blog_urls)))
 
-    if not driver:
+    if not pool.size:
         print("WebDriver setup failed.")
         return results
 
     try:
-        for idx, url in enumerate(blog_urls, 1):
-            print(f"\nScraping blog {idx}/{len(blog_urls)}: {url}")
-            data = scrape_single_blog(driver, url)
-            if data:
-                results.append(data)
-            time.sleep(random.uniform(2, 4))
+        with ThreadPoolExecutor(max_workers=pool.size) as executor:
+            pages = executor.map(lambda url: scrape_blog_pooled(pool, url), blog_urls)
+            for url, data in zip(blog_urls, pages):
+                if data:
+                    results[url] = data
     finally:
-        driver.quit()
+        if own_pool:
+            pool.close()
 
     return results
 
 
+def scrape_selected_blogs(blog_urls, pool=None):
+    """Scrape the given URLs over HTTP, falling back to Chrome for blocked pages."""
+    pages = asyncio.run(fetch_all(blog_urls))
+
+    scraped = {}
+    for url, html in zip(blog_urls, pages):
+        if html is not None:
+            print(f"Fetched {url}")
+            scraped[url] = parse_blog(html, url)
+
+    blocked = [url for url in blog_urls if url not in scraped]
+    if blocked:
+        scraped.update(scrape_with_browser(blocked, pool))
+
+    return [scraped[url] for url in blog_urls if url in scraped]
+
+
 # ----------------------------------------------------------
 # SAVE RESULTS
 # ----------------------------------------------------------
@@ -238,6 +340,7 @@ if __name__ == "__main__":
 
     print("\nStarting PartSelect blog scraper (selected URLs)...\n")
 
+    # Chrome is only started (per category) if a page can't be fetched over HTTP
     for category, urls in BLOG_URLS.items():
         print(f"\nProcessing {category} blogs...")
         blogs = scrape_selected_blogs(urls)
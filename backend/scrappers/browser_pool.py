@@ -0,0 +1,49 @@
+"""
+Small pool of warm Chrome drivers shared by the scrapers.
+
+Starting Chrome costs a few seconds and a fresh profile, so drivers are
+created once per run and handed out one at a time. When every driver is busy,
+callers wait in the queue instead of spawning another browser.
+"""
+
+import queue
+from contextlib import contextmanager
+
+
+class BrowserPool:
+    """Keep up to ``size`` drivers from ``factory`` alive for reuse."""
+
+    def __init__(self, factory, size=1):
+        self._idle = queue.Queue()
+        self._drivers = []
+        for _ in range(size):
+            driver = factory()
+            if driver is None:
+                continue
+            self._drivers.append(driver)
+            self._idle.put(driver)
+        self.size = len(self._drivers)
+
+    @contextmanager
+    def acquire(self):
+        """Borrow a driver; blocks until one is free."""
+        driver = self._idle.get()
+        try:
+            yield driver
+        finally:
+            self._idle.put(driver)
+
+    def close(self):
+        for driver in self._drivers:
+            try:
+                driver.quit()
+            except Exception as e:
+                print(f"Error closing Chrome WebDriver: {e}")
+        self._drivers = []
+        self.size = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -1,60 +1,137 @@
 import time
 import csv
 import json
+import random
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+from browser_pool import BrowserPool
+
 PAGE_LOAD_RETRIES = 3
 RETRY_COOLDOWN = 8
 ACCESS_DENIED_MARKER = "Access Denied"
+# Chrome instances scraping in parallel (each is one open page on the site)
+POOL_SIZE = 3
+
+USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36"
+)
+# Fixed Chrome flags; only the per-driver profile dir is added in setup_driver
+CHROME_ARGS = (
+    "--disable-gpu",
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-extensions",
+    "--disable-notifications",
+    "--disable-popup-blocking",
+    "--disable-infobars",
+    "--disable-blink-features=AutomationControlled",
+    "--window-size=1920,1080",
+    f"--user-agent={USER_AGENT}",
+    "--accept-language=en-US,en;q=0.9",
+    "--accept=text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+    # Part photos aren't scraped; don't wait for them either (see wait_for_dom)
+    "--blink-settings=imagesEnabled=false",
+)
+
+# Hides navigator.webdriver from the page's own scripts
+HIDE_WEBDRIVER_JS = """
+Object.defineProperty(navigator, 'webdriver', {
+    get: () => undefined
+});
+"""
+
+CROSSREF_ROW_SELECTOR = "div.pd__crossref__list div.row"
+
+# CSV columns, in scrape_part's field order
+PART_CSV_FIELDS = (
+    "name", "price", "partselect_number", "model_number", "official_oem",
+    "manufacturer_part_number", "description",
+    "install_difficulty", "install_time", "availability",
+    "symptoms", "product_types", "replaceable_models", "model_cross_reference",
+    "product_url",
+)
+CROSSREF_CSV_FIELDS = ("partselect_number", "model_number", "brand", "description", "model_url")
+
+# Requests the scraper never reads: media, fonts, analytics and ad networks
+BLOCKED_URL_PATTERNS = [
+    "*.jpg", "*.jpeg", "*.png", "*.webp", "*.gif", "*.svg",
+    "*.woff", "*.woff2", "*.ttf", "*.mp4",
+    "*googletagmanager*", "*google-analytics*", "*doubleclick*",
+    "*facebook.net*",
+]
+
+# Reads every product field in one WebDriver round-trip (see scrape_part).
+# Missing single elements come back as null; lists come back as [].
+PART_FIELDS_JS = """
+const text = (sel, root = document) => {
+    const node = root.querySelector(sel);
+    return node ? node.innerText.trim() : null;
+};
+const texts = (sel, root = document) =>
+    Array.from(root.querySelectorAll(sel), (node) => node.innerText.trim());
+const rating = document.querySelector("div.pd__repair-rating__container");
+
+return {
+    name: text("h1[itemprop='name']"),
+    price: text("span.js-partPrice"),
+    partselect_number: text("span[itemprop='productID']"),
+    mpn: text("span[itemprop='mpn']"),
+    official_oem: text("span[itemprop='brand'] span[itemprop='name']"),
+    description: text("div[itemprop='description'], div.pd__description"),
+    rating: rating ? texts("p.bold", rating) : [],
+    availability: text("span[itemprop='availability']"),
+    symptoms: texts("#Troubleshooting + div ul.list-disc li"),
+    product_types: texts("#Troubleshooting + div .col-md-6:nth-of-type(2) ul.list-disc li"),
+    replaceable_models: text("#Troubleshooting + div div[data-collapse-container]"),
+};
+"""
 
 
 def setup_driver():
     options = Options()
-    user_agent = (
-        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36"
-    )
-    options.add_argument("--disable-gpu")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    options.add_argument("--disable-extensions")
-    options.add_argument("--disable-notifications")
-    options.add_argument("--disable-popup-blocking")
-    options.add_argument("--disable-infobars")
-    options.add_argument("--disable-blink-features=AutomationControlled")
-    options.add_argument("--window-size=1920,1080")
-    options.add_argument(f"--user-agent={user_agent}")
-    options.add_argument("--accept-language=en-US,en;q=0.9")
-    options.add_argument(
-        "--accept=text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8"
-    )
+    for arg in CHROME_ARGS:
+        options.add_argument(arg)
     options.add_experimental_option("excludeSwitches", ["enable-automation"])
     options.add_experimental_option("useAutomationExtension", False)
     temp_dir = tempfile.mkdtemp(prefix="parts_chrome_")
     options.add_argument(f"--user-data-dir={temp_dir}")
+    options.page_load_strategy = "none"
 
     driver = webdriver.Chrome(options=options)
-    driver.execute_cdp_cmd("Network.setUserAgentOverride", {"userAgent": user_agent})
+    driver.execute_cdp_cmd("Network.setUserAgentOverride", {"userAgent": USER_AGENT})
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
     driver.execute_cdp_cmd(
-        "Page.addScriptToEvaluateOnNewDocument",
-        {
-            "source": """
-                Object.defineProperty(navigator, 'webdriver', {
-                    get: () => undefined
-                });
-            """
-        },
+        "Page.addScriptToEvaluateOnNewDocument", {"source": HIDE_WEBDRIVER_JS}
     )
     driver.set_page_load_timeout(60)
     driver.implicitly_wait(20)
     return driver
 
 
+def wait_for_dom(driver, timeout=30):
+    """
+    Wait until the HTML is parsed, then stop loading images/ads/trackers.
+
+    With page_load_strategy "none" driver.get() returns immediately, so this
+    replaces the blocking wait for every sub-resource.
+    """
+    try:
+        WebDriverWait(driver, timeout).until(
+            lambda d: d.execute_script("return document.readyState") != "loading"
+        )
+    except Exception:
+        pass
+    driver.execute_script("window.stop();")
+
+
 def scroll(driver):
     driver.execute_script("window.scrollTo(0, document.body.scrollHeight/3);")
     time.sleep(1)
@@ -64,6 +141,11 @@ def scroll(driver):
     time.sleep(1)
 
 
+def has_selector(driver, selector):
+    """True if ``selector`` matches now (no implicit wait, unlike el())."""
+    return driver.execute_script("return document.querySelector(arguments[0]) !== null;", selector)
+
+
 def el(driver, selector):
     try:
         return driver.find_element(By.CSS_SELECTOR, selector)
@@ -71,13 +153,6 @@ def el(driver, selector):
         return None
 
 
-def els(driver, selector):
-    try:
-        return driver.find_elements(By.CSS_SELECTOR, selector)
-    except:
-        return []
-
-
 def load_cross_reference(driver):
     container = el(driver, "div.pd__crossref__list")
     if not container:
@@ -153,7 +228,7 @@ def load_product_page(driver, url):
     """Navigate to the product page with retries if Access Denied is returned."""
     for attempt in range(1, PAGE_LOAD_RETRIES + 1):
         driver.get(url)
-        time.sleep(3)
+        wait_for_dom(driver)
 
         if ACCESS_DENIED_MARKER not in driver.page_source:
             try:
@@ -179,7 +254,7 @@ def scrape_part(driver, url):
             "price": "N/A",
             "partselect_number": "N/A",
             "model_number": "N/A",
-            "brand": "N/A",
+            "official_oem": "N/A",
             "manufacturer_part_number": "N/A",
             "description": "N/A",
 
@@ -192,9 +267,11 @@ def scrape_part(driver, url):
             "replaceable_models": "",
             "model_cross_reference": "[]",
             "product_url": url
-        }
+        }, []
 
-    scroll(driver)
+    # The cross-reference list is lazy-loaded; scroll only if it isn't there yet
+    if not has_selector(driver, CROSSREF_ROW_SELECTOR):
+        scroll(driver)
 
     data = {
         "name": "N/A",
@@ -219,72 +296,39 @@ def scrape_part(driver, url):
         "product_url": url
     }
 
+    fields = driver.execute_script(PART_FIELDS_JS)
+
     # --------------------
     # BASIC FIELDS
     # --------------------
 
-    title = el(driver, "h1[itemprop='name']")
-    if title:
-        data["name"] = title.text.strip()
-
-    p = el(driver, "span.js-partPrice")
-    if p:
-        data["price"] = p.text.strip()
-
-    ps = el(driver, "span[itemprop='productID']")
-    if ps:
-        data["partselect_number"] = ps.text.strip()
-
-    mpn = el(driver, "span[itemprop='mpn']")
-    if mpn:
-        val = mpn.text.strip()
-        data["manufacturer_part_number"] = val
-        data["model_number"] = val
+    for key in ("name", "price", "partselect_number", "official_oem", "description", "availability"):
+        if fields[key] is not None:
+            data[key] = fields[key]
 
-    oem = el(driver, "span[itemprop='brand'] span[itemprop='name']")
-    if oem:
-        data["official_oem"] = oem.text.strip()
-
-    desc = el(driver, "div[itemprop='description'], div.pd__description")
-    if desc:
-        data["description"] = desc.text.strip()
+    if fields["mpn"] is not None:
+        data["manufacturer_part_number"] = fields["mpn"]
+        data["model_number"] = fields["mpn"]
 
     # --------------------
     # INSTALL DIFFICULTY / TIME
     # --------------------
 
-    rating_container = el(driver, "div.pd__repair-rating__container")
-    if rating_container:
-        bolds = rating_container.find_elements(By.CSS_SELECTOR, "p.bold")
-        if len(bolds) >= 1:
-            data["install_difficulty"] = bolds[0].text.strip()     # "Very Easy"
-        if len(bolds) >= 2:
-            data["install_time"] = bolds[1].text.strip()           # "15 - 30 mins"
-
-
-    # --------------------
-    # AVAILABILITY
-    # --------------------
-
-    avail = el(driver, "span[itemprop='availability']")
-    if avail:
-        data["availability"] = avail.text.strip()
+    bolds = fields["rating"]
+    if len(bolds) >= 1:
+        data["install_difficulty"] = bolds[0]     # "Very Easy"
+    if len(bolds) >= 2:
+        data["install_time"] = bolds[1]           # "15 - 30 mins"
 
     # --------------------
     # TROUBLESHOOTING
     # --------------------
 
-    symptoms = els(driver, "#Troubleshooting + div ul.list-disc li")
-    data["symptoms"] = "; ".join([x.text.strip() for x in symptoms])
+    data["symptoms"] = "; ".join(fields["symptoms"])
+    data["product_types"] = "; ".join(fields["product_types"])
 
-    prod_types = els(driver,
-        "#Troubleshooting + div .col-md-6:nth-of-type(2) ul.list-disc li")
-    data["product_types"] = "; ".join([x.text.strip() for x in prod_types])
-
-    replace = el(driver,
-        "#Troubleshooting + div div[data-collapse-container]")
-    if replace:
-        raw = replace.text.strip()
+    if fields["replaceable_models"] is not None:
+        raw = fields["replaceable_models"]
         data["replaceable_models"] = "; ".join([x.strip() for x in raw.split(",")])
 
     cross_refs = load_cross_reference(driver)
@@ -294,16 +338,22 @@ def scrape_part(driver, url):
     return data, cross_refs
 
 
-def save_parts_csv(rows, filename):
-    if not rows:
-        print(f"No data to save for {filename}")
-        return
-    fieldnames = rows[0].keys()
-    with open(filename, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(rows)
-    print(f"Saved {len(rows)} parts → {filename}")
+def scrape_part_pooled(pool, url):
+    """Scrape one part on the next free driver of ``pool``."""
+    with pool.acquire() as driver:
+        print("Scraping:", url)
+        result = scrape_part(driver, url)
+        # Politeness delay before the driver takes the next URL
+        time.sleep(random.uniform(1, 2))
+    return result
+
+
+def open_csv_writer(filename, fieldnames):
+    """Open ``filename`` for row-by-row writing; returns (file, writer) after the header."""
+    f = open(filename, "w", newline="", encoding="utf-8")
+    writer = csv.DictWriter(f, fieldnames=fieldnames)
+    writer.writeheader()
+    return f, writer
 
 
 if __name__ == "__main__":
@@ -334,32 +384,37 @@ if __name__ == "__main__":
         ],
     }
 
-    for category, urls in PART_URLS.items():
-        if not urls:
-            print(f"No URLs provided for {category}, skipping.")
-            continue
+    # Warm browsers shared by every category; the pool caps concurrent pages
+    with BrowserPool(setup_driver, size=POOL_SIZE) as pool, \
+            ThreadPoolExecutor(max_workers=pool.size) as executor:
+        for category, urls in PART_URLS.items():
+            if not urls:
+                print(f"No URLs provided for {category}, skipping.")
+                continue
 
-        print(f"\nScraping {category} parts...")
-        driver = setup_driver()
-        output = []
-        cross_refs_all = []
-        try:
-            for u in urls:
-                print("Scraping:", u)
-                part_data, cross_refs = scrape_part(driver, u)
-                output.append(part_data)
-                for entry in cross_refs:
-                    cross_refs_all.append({
-                        "partselect_number": part_data["partselect_number"],
-                        "model_number": entry["model_number"],
-                        "brand": entry["brand"],
-                        "description": entry["description"],
-                        "model_url": entry["model_url"],
-                    })
-                time.sleep(2)
-        finally:
-            driver.quit()
-
-        save_parts_csv(output, f"{category}_parts.csv")
-        if cross_refs_all:
-            save_parts_csv(cross_refs_all, f"{category}_parts_crossref.csv")
+            print(f"\nScraping {category} parts...")
+            parts_file = f"{category}_parts.csv"
+            crossref_file = f"{category}_parts_crossref.csv"
+            parts_f, parts_writer = open_csv_writer(parts_file, PART_CSV_FIELDS)
+            crossref_f, crossref_writer = open_csv_writer(crossref_file, CROSSREF_CSV_FIELDS)
+            # Rows are written as each part finishes, so a crash keeps what was scraped
+            with parts_f, crossref_f:
+                parts_count = 0
+                # map() keeps results in URL order
+                for part_data, cross_refs in executor.map(lambda u: scrape_part_pooled(pool, u), urls):
+                    parts_writer.writerow(part_data)
+                    crossref_writer.writerows(
+                        {
+                            "partselect_number": part_data["partselect_number"],
+                            "model_number": entry["model_number"],
+                            "brand": entry["brand"],
+                            "description": entry["description"],
+                            "model_url": entry["model_url"],
+                        }
+                        for entry in cross_refs
+                    )
+                    parts_f.flush()
+                    crossref_f.flush()
+                    parts_count += 1
+
+            print(f"Saved {parts_count} parts → {parts_file}")
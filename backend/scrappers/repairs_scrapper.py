@@ -1,31 +1,106 @@
+import asyncio
+import hashlib
+import importlib.util
 import json
 import time
-from bs4 import BeautifulSoup
+import tempfile
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+import httpx
+from cssselect import HTMLTranslator
+from lxml import etree
+from lxml import html as lxml_html
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+from browser_pool import BrowserPool
+
 ACCESS_DENIED_MARKER = "Access Denied"
+USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36"
+)
+REQUEST_HEADERS = {
+    "User-Agent": USER_AGENT,
+    "Accept-Language": "en-US,en;q=0.9",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+}
+# Parallel plain HTTP requests to partselect.com at once
+MAX_CONNECTIONS = 8
+# HTTP/2 needs the optional "h2" package (pip install httpx[http2])
+HTTP2 = importlib.util.find_spec("h2") is not None
+# Chrome instances scraping in parallel (each is one open page on the site)
+POOL_SIZE = 4
+
+# Fetched pages are kept on disk so re-runs don't hit the site again.
+# Blocked (Access Denied) pages are cached too, but expire sooner.
+CACHE_DIR = Path(".scrape_cache")
+CACHE_TTL = 24 * 60 * 60
+DENIED_CACHE_TTL = 60 * 60
 POPUP_KEYWORDS = ("decline", "close", "continue")
 
+# Only the HTML is parsed, so skip the heavy sub-resources (2 = block)
+BLOCKED_CONTENT_PREFS = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.managed_default_content_settings.stylesheets": 2,
+    "profile.managed_default_content_settings.fonts": 2,
+    "profile.managed_default_content_settings.plugins": 2,
+}
+
+
+def _css(selector):
+    """Compile a CSS selector to XPath once; matches descendants only, like soup.select."""
+    return etree.XPath(HTMLTranslator().css_to_xpath(selector, prefix="descendant::"))
+
+
+# Selectors used on every page, compiled at import
+H1 = _css("h1")
+DIFFICULTY_ITEM = _css("ul.list-disc li")
+INTRO_PARAGRAPH = _css("div.repair__intro p")
+SECTION_TITLES = _css("h2.section-title")
+# Next sibling <div class="symptom-list__desc">, like find_next_sibling("div", class_=...)
+SECTION_DESC = etree.XPath(
+    "following-sibling::div"
+    "[contains(concat(' ', normalize-space(@class), ' '), ' symptom-list__desc ')][1]"
+)
+CAUSE_BLOCKS = _css("div.repair__cause")
+LEFT_COLUMN = _css("div.col-lg-6")
+PARAGRAPHS = _css("p")
+ORDERED_LISTS = _css("ol")
+LIST_ITEMS = _css("li")
+H3 = _css("h3")
+
+
+def _text(element, separator=""):
+    """Element text like BeautifulSoup: ``.text`` by default, ``get_text(sep, strip=True)`` with a separator."""
+    if not separator:
+        return element.text_content()
+    return separator.join(s.strip() for s in element.itertext() if s.strip())
+
+
+def _first(selector, element):
+    matches = selector(element)
+    return matches[0] if matches else None
+
 
 def extract_section_text(section_div):
     """Extract <p> and list text from the left column."""
-    left_col = section_div.select_one("div.col-lg-6")
-    if not left_col:
+    left_col = _first(LEFT_COLUMN, section_div)
+    if left_col is None:
         left_col = section_div
 
     text_parts = []
-    for p in left_col.find_all("p"):
-        content = p.get_text(" ", strip=True)
+    for p in PARAGRAPHS(left_col):
+        content = _text(p, " ")
         if content:
             text_parts.append(content)
 
-    for ol in left_col.find_all("ol"):
-        for li in ol.find_all("li"):
-            content = li.get_text(" ", strip=True)
+    for ol in ORDERED_LISTS(left_col):
+        for li in LIST_ITEMS(ol):
+            content = _text(li, " ")
             if content:
                 text_parts.append(f"• {content}")
 
@@ -35,11 +110,7 @@ def extract_section_text(section_div):
 def setup_driver():
     """Configure Chrome for scraping with anti-detection options."""
     options = Options()
-    user_agent = (
-        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36"
-    )
-    options.add_argument(f"user-agent={user_agent}")
+    options.add_argument(f"user-agent={USER_AGENT}")
     options.add_argument("--disable-gpu")
     options.add_argument("--no-sandbox")
     options.add_argument("--disable-dev-shm-usage")
@@ -53,17 +124,17 @@ def setup_driver():
     options.add_argument("--disable-blink-features=AutomationControlled")
     options.add_experimental_option("excludeSwitches", ["enable-automation"])
     options.add_experimental_option("useAutomationExtension", False)
+    options.add_experimental_option("prefs", BLOCKED_CONTENT_PREFS)
 
-    import tempfile
-    import os
-
-    temp_dir = os.path.join(tempfile.gettempdir(), f"chrome_temp_{os.getpid()}")
+    # One profile dir per driver: pooled Chrome instances can't share a profile
+    temp_dir = tempfile.mkdtemp(prefix="repairs_chrome_")
     options.add_argument(f"--user-data-dir={temp_dir}")
-    options.page_load_strategy = "normal"
+    # driver.get() returns at DOMContentLoaded; load_page still waits for <h1>
+    options.page_load_strategy = "eager"
 
     driver = webdriver.Chrome(options=options)
     driver.execute_cdp_cmd(
-        "Network.setUserAgentOverride", {"userAgent": user_agent}
+        "Network.setUserAgentOverride", {"userAgent": USER_AGENT}
     )
     driver.execute_cdp_cmd(
         "Page.addScriptToEvaluateOnNewDocument",
@@ -77,7 +148,7 @@ def setup_driver():
     )
     driver.set_page_load_timeout(60)
     driver.set_script_timeout(30)
-    driver.implicitly_wait(20)
+    # No implicit wait: it would stack on top of the explicit waits in load_page
     return driver
 
 
@@ -99,33 +170,73 @@ def dismiss_popup(driver):
         pass
 
 
+def _cache_path(url):
+    return CACHE_DIR / f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}.html"
+
+
+def read_cached_html(url):
+    """Cached HTML for ``url`` if it is still fresh, else None."""
+    path = _cache_path(url)
+    try:
+        age = time.time() - path.stat().st_mtime
+    except FileNotFoundError:
+        return None
+    html = path.read_text(encoding="utf-8")
+    ttl = DENIED_CACHE_TTL if ACCESS_DENIED_MARKER in html else CACHE_TTL
+    return html if age < ttl else None
+
+
+def write_cached_html(url, html):
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    _cache_path(url).write_text(html, encoding="utf-8")
+
+
 def load_page(driver, url, max_retries=3, cooldown=8):
-    """Navigate to a repair page with retries when Akamai blocks us."""
+    """
+    Return the HTML of a repair page, or None if Akamai keeps blocking us.
+
+    Served from the disk cache when fresh; otherwise navigates with retries.
+    """
+    cached = read_cached_html(url)
+    if cached is not None:
+        print(f"Using cached page for {url}")
+        return None if ACCESS_DENIED_MARKER in cached else cached
+
+    page_source = ""
     for attempt in range(1, max_retries + 1):
         driver.get(url)
-        time.sleep(3)
+        # Both the article and Akamai's block page have an <h1>, so this
+        # returns as soon as either is ready
+        try:
+            WebDriverWait(driver, 15, poll_frequency=0.2).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, "h1"))
+            )
+        except Exception:
+            pass
         page_source = driver.page_source
         if ACCESS_DENIED_MARKER not in page_source:
-            try:
-                WebDriverWait(driver, 15).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "h1"))
-                )
-            except Exception:
-                pass
             dismiss_popup(driver)
-            return True
+            write_cached_html(url, page_source)
+            return page_source
 
         print(f"Access denied detected (attempt {attempt}/{max_retries}). Retrying after cooldown...")
         time.sleep(cooldown)
-    return False
+
+    write_cached_html(url, page_source)
+    return None
 
 
 def scrape_repair_page(driver, url, appliance_type, symptom_name):
     """Scrape a single repair article."""
-    if not load_page(driver, url):
+    html = load_page(driver, url)
+    if html is None:
         raise RuntimeError("Failed to load repair page due to access denial.")
+    return parse_repair_page(html, url, appliance_type, symptom_name)
 
-    soup = BeautifulSoup(driver.page_source, "html.parser")
+
+def parse_repair_page(html, url, appliance_type, symptom_name):
+    """Build the repair record from a page's HTML."""
+    tree = lxml_html.fromstring(html)
 
     result = {
         "appliance": appliance_type,
@@ -137,50 +248,123 @@ def scrape_repair_page(driver, url, appliance_type, symptom_name):
         "sections": [],
     }
 
-    h1 = soup.select_one("h1")
-    result["title"] = h1.text.strip() if h1 else symptom_name
+    h1 = _first(H1, tree)
+    result["title"] = _text(h1).strip() if h1 is not None else symptom_name
 
-    diff_li = soup.select_one("ul.list-disc li")
-    if diff_li:
-        result["difficulty"] = diff_li.text.replace("Rated as", "").strip()
+    diff_li = _first(DIFFICULTY_ITEM, tree)
+    if diff_li is not None:
+        result["difficulty"] = _text(diff_li).replace("Rated as", "").strip()
 
-    intro = soup.select_one("div.repair__intro p")
-    result["description"] = intro.text.strip() if intro else ""
+    intro = _first(INTRO_PARAGRAPH, tree)
+    result["description"] = _text(intro).strip() if intro is not None else ""
 
     # Primary layout: h2.section-title + content
-    section_titles = soup.select("h2.section-title")
+    section_titles = SECTION_TITLES(tree)
     if section_titles:
         for heading in section_titles:
-            sec_title = heading.text.strip()
-            desc_block = heading.find_next_sibling("div", class_="symptom-list__desc")
-            if not desc_block:
+            sec_title = _text(heading).strip()
+            desc_block = _first(SECTION_DESC, heading)
+            if desc_block is None:
                 continue
             text = extract_section_text(desc_block)
             result["sections"].append({"title": sec_title, "text": text})
     else:
         # Fallback layout: repair__cause blocks
-        causes = soup.select("div.repair__cause")
+        causes = CAUSE_BLOCKS(tree)
         for section in causes:
-            sec_title_el = section.select_one("h3")
-            sec_title = sec_title_el.text.strip() if sec_title_el else "Unknown Section"
-            paragraphs = section.select("p")
-            full_text = "\n".join([p.text.strip() for p in paragraphs if p.text.strip()])
+            sec_title_el = _first(H3, section)
+            sec_title = _text(sec_title_el).strip() if sec_title_el is not None else "Unknown Section"
+            paragraphs = [_text(p).strip() for p in PARAGRAPHS(section)]
+            full_text = "\n".join([p for p in paragraphs if p])
             result["sections"].append({"title": sec_title, "text": full_text})
 
     return result
 
 
-def scrape_multiple_repairs(driver, repair_urls, appliance_type):
-    results = []
-    for url, symptom in repair_urls:
+# Repair articles are rendered server-side, so they are fetched without a
+# browser first. Chrome is only started for pages Akamai blocks.
+
+async def fetch_repair_html(client, url):
+    """Fetch a repair page over HTTP (or the disk cache). Returns None if blocked or failed."""
+    cached = read_cached_html(url)
+    if cached is not None:
+        print(f"Using cached page for {url}")
+        return None if ACCESS_DENIED_MARKER in cached else cached
+
+    try:
+        resp = await client.get(url)
+    except httpx.HTTPError as e:
+        print(f"HTTP error for {url}: {e}")
+        return None
+
+    if resp.status_code != 200 or ACCESS_DENIED_MARKER in resp.text:
+        print(f"HTTP {resp.status_code} for {url}, will retry in browser")
+        return None
+    write_cached_html(url, resp.text)
+    return resp.text
+
+
+async def fetch_all(urls):
+    """Fetch every URL concurrently; results line up with ``urls``."""
+    async with httpx.AsyncClient(
+        headers=REQUEST_HEADERS,
+        http2=HTTP2,
+        follow_redirects=True,
+        timeout=30,
+        limits=httpx.Limits(max_connections=MAX_CONNECTIONS),
+    ) as client:
+        return await asyncio.gather(*(fetch_repair_html(client, url) for url in urls))
+
+
+def scrape_repair_pooled(pool, url, appliance_type, symptom):
+    """Scrape one repair page on the next free driver of ``pool``; None on failure."""
+    with pool.acquire() as driver:
         print(f"Scraping: {symptom} → {url}")
         try:
-            data = scrape_repair_page(driver, url, appliance_type, symptom)
-            results.append(data)
-            time.sleep(1)
+            return scrape_repair_page(driver, url, appliance_type, symptom)
         except Exception as exc:
             print("Error:", exc)
-    return results
+            return None
+
+
+def scrape_with_browser(pool, repair_urls, appliance_type):
+    """Scrape ``(url, symptom)`` pairs in parallel over ``pool``, keeping input order."""
+    with ThreadPoolExecutor(max_workers=pool.size) as executor:
+        return list(
+            executor.map(
+                lambda item: scrape_repair_pooled(pool, item[0], appliance_type, item[1]),
+                repair_urls,
+            )
+        )
+
+
+def scrape_multiple_repairs(repair_urls, appliance_type, pool=None):
+    """
+    Scrape ``(url, symptom)`` pairs over HTTP, falling back to Chrome for
+    blocked pages. A browser pool is only started if ``pool`` isn't given
+    and some page needs it.
+    """
+    pages = asyncio.run(fetch_all([url for url, _ in repair_urls]))
+
+    results = {}
+    blocked = []
+    for (url, symptom), html in zip(repair_urls, pages):
+        if html is None:
+            blocked.append((url, symptom))
+        else:
+            print(f"Fetched: {symptom} → {url}")
+            results[url] = parse_repair_page(html, url, appliance_type, symptom)
+
+    if blocked:
+        if pool is None:
+            with BrowserPool(setup_driver, size=min(POOL_SIZE, len(blocked))) as own_pool:
+                scraped = scrape_with_browser(own_pool, blocked, appliance_type)
+        else:
+            scraped = scrape_with_browser(pool, blocked, appliance_type)
+        for (url, _), data in zip(blocked, scraped):
+            results[url] = data
+
+    return [results[url] for url, _ in repair_urls if results.get(url)]
 
 
 if __name__ == "__main__":
@@ -215,12 +399,7 @@ if __name__ == "__main__":
 ]
     appliance_type = "Refrigerator"
 
-    driver = setup_driver()
-    try:
-        data = scrape_multiple_repairs(driver, REPAIR_URLS, appliance_type)
-        time.sleep(3)
-    finally:
-        driver.quit()
+    data = scrape_multiple_repairs(REPAIR_URLS, appliance_type)
 
     with open("Refrigerator_repair_data.json", "w", encoding="utf-8") as f:
         json.dump(data, f, indent=2)
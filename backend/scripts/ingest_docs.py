@@ -6,32 +6,67 @@ from __future__ import annotations
 
 import json
 import re
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Iterable
+from typing import Dict, Iterable, Tuple
+
+try:  # optional: orjson parses the data files several times faster
+    import orjson
+except ImportError:
+    orjson = None
 
 from app.config import settings
-from app.rag.rag_store import get_collection, upsert_document
+from app.rag.rag_store import get_collection, upsert_documents_batch
 
 
 REPAIR_JSON = settings.data_dir / "repair_guides.json"
 BLOGS_JSON = settings.data_dir / "blogs.json"
 
+# Sections per Chroma upsert (and per embedding batch)
+UPSERT_BATCH_SIZE = 256
+
+_SLUG_RE = re.compile(r"[^a-zA-Z0-9]+")
+
 
+# Appliance/symptom/heading names repeat across sections, so most calls are hits
+@lru_cache(maxsize=4096)
 def _slugify(value: str) -> str:
-    slug = re.sub(r"[^a-zA-Z0-9]+", "-", value.strip().lower()).strip("-")
+    slug = _SLUG_RE.sub("-", value.strip().lower()).strip("-")
     return slug or "section"
 
 
 def _load_json(path: Path) -> Iterable[Dict]:
     if not path.exists():
         raise FileNotFoundError(f"JSON data not found at {path}")
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
     with open(path, "r", encoding="utf-8") as f:
         data = json.load(f)
     return data
 
 
+def _upsert_batches(collection, docs: Dict[str, Tuple[str, Dict]]) -> None:
+    """
+    Upsert ``{doc_id: (text, metadata)}`` in UPSERT_BATCH_SIZE chunks.
+
+    Keyed by doc_id because Chroma rejects repeated ids within one upsert; a
+    later section with the same id replaces the earlier one, as it did when
+    sections were upserted one at a time.
+    """
+    items = list(docs.items())
+    for start in range(0, len(items), UPSERT_BATCH_SIZE):
+        batch = items[start:start + UPSERT_BATCH_SIZE]
+        upsert_documents_batch(
+            [doc_id for doc_id, _ in batch],
+            [text for _, (text, _) in batch],
+            [metadata for _, (_, metadata) in batch],
+            collection=collection,
+        )
+
+
 def _index_repair_guides(collection) -> int:
     guides = _load_json(REPAIR_JSON)
+    docs: Dict[str, Tuple[str, Dict]] = {}
     count = 0
     for guide in guides:
         sections = guide.get("sections", [])
@@ -49,13 +84,17 @@ def _index_repair_guides(collection) -> int:
                 "section_title": section.get("title"),
                 "source_url": guide.get("url"),
             }
-            upsert_document(doc_id, section.get("text", ""), metadata, collection=collection)
+            text = section.get("text", "")
+            if text:
+                docs[doc_id] = (text, metadata)
             count += 1
+    _upsert_batches(collection, docs)
     return count
 
 
 def _index_blogs(collection) -> int:
     blogs = _load_json(BLOGS_JSON)
+    docs: Dict[str, Tuple[str, Dict]] = {}
     count = 0
     for blog in blogs:
         sections = blog.get("sections", [])
@@ -73,8 +112,11 @@ def _index_blogs(collection) -> int:
                 "section_title": section.get("heading"),
                 "source_url": blog.get("url"),
             }
-            upsert_document(doc_id, section.get("text", ""), metadata, collection=collection)
+            text = section.get("text", "")
+            if text:
+                docs[doc_id] = (text, metadata)
             count += 1
+    _upsert_batches(collection, docs)
     return count
 
 
@@ -22,8 +22,8 @@ def ingest_parts_from_api(client: PartSelectAPIClient) -> None:
             _upsert_part(session, record)
 
         for record in client.fetch_crossref_records():
-            model, _ = _upsert_model(session, record, record.get("appliance_type", ""))
-            _link_part_to_model(session, record.get("partselect_number"), model)
+            model_number = _upsert_model(session, record, record.get("appliance_type", ""))
+            _link_part_to_model(session, record.get("partselect_number"), model_number)
 
         session.commit()
 
@@ -4,16 +4,19 @@ CLI utility to ingest part metadata and cross-reference data into SQLite.
 
 from __future__ import annotations
 
+import argparse
+import hashlib
 from pathlib import Path
 from typing import Dict, List, Tuple
 
 import pandas as pd
-from sqlalchemy import select
+from sqlalchemy import Column, MetaData, String, Table, bindparam, exists, func, insert, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.engine import make_url
 
 from app.config import settings
 from app.db import create_tables, session_scope
-from app.models import Model, Part, PartModelMapping
+from app.models import Model, Part, PartModelMapping, _to_cents
 
 
 PART_SOURCES: List[Tuple[str, Path]] = [
@@ -26,6 +29,23 @@ CROSSREF_SOURCES: List[Tuple[str, Path]] = [
     ("Refrigerator", settings.data_dir / "refrigerator_parts_crossref.csv"),
 ]
 
+# CSV columns the ingest reads; anything else in the files is never loaded
+PART_CSV_COLUMNS = (
+    "partselect_number", "manufacturer_part_number", "part_name", "part_price",
+    "description", "symptoms", "install_difficulty", "install_time",
+    "replaceable_models", "replace_parts", "availability", "brand", "product_url",
+)
+CROSSREF_CSV_COLUMNS = ("partselect_number", "model_number", "brand", "description", "model_url")
+
+# Content hash of each CSV as of its last ingest, so unchanged files are skipped.
+# Ingest bookkeeping only, so it lives outside the app's models.
+_INGEST_META = Table(
+    "_ingest_meta",
+    MetaData(),
+    Column("source", String(255), primary_key=True),
+    Column("content_hash", String(128), nullable=False),
+)
+
 
 def _normalize_price(value) -> float | None:
     if value in ("", None):
@@ -44,10 +64,17 @@ def _normalize_price(value) -> float | None:
         return None
 
 
-def _load_csv(path: Path) -> pd.DataFrame:
+def _load_csv(path: Path, columns: Tuple[str, ...]) -> pd.DataFrame:
+    """
+    Read only ``columns`` (those present in the file) as strings.
+
+    na_filter=False leaves empty cells as "" directly, so no NaN detection or
+    fillna("") pass; dtype=str keeps IDs such as model numbers verbatim.
+    """
     if not path.exists():
         raise FileNotFoundError(f"Expected data file at {path}")
-    return pd.read_csv(path).fillna("")
+    wanted = set(columns)
+    return pd.read_csv(path, usecols=lambda name: name in wanted, dtype=str, na_filter=False)
 
 
 def _reset_sqlite_file():
@@ -61,114 +88,281 @@ def _reset_sqlite_file():
         db_path.unlink()
 
 
-def _upsert_part(session, record: Dict) -> Tuple[bool, bool]:
+# Upserts are single statements, so re-running an ingest never needs to read
+# a row back into the session first.
+_PART_UPSERT = sqlite_insert(Part.__table__)
+_PART_UPSERT = _PART_UPSERT.on_conflict_do_update(
+    index_elements=[Part.__table__.c.part_id],
+    set_={
+        column.name: _PART_UPSERT.excluded[column.name]
+        for column in Part.__table__.c
+        if column.name != "part_id"
+    },
+)
+
+_MODEL_UPSERT = sqlite_insert(Model.__table__)
+# Blank values keep whatever the model already had
+_MODEL_UPSERT = _MODEL_UPSERT.on_conflict_do_update(
+    index_elements=[Model.__table__.c.model_number],
+    set_={
+        name: func.coalesce(_MODEL_UPSERT.excluded[name], Model.__table__.c[name])
+        for name in ("brand", "model_description", "appliance_type", "model_url")
+    },
+)
+
+# INSERT OR IGNORE of a link, skipped when the part is unknown
+_LINK_INSERT = (
+    sqlite_insert(PartModelMapping.__table__)
+    .from_select(
+        ["part_id", "model_number"],
+        select(
+            bindparam("part_id", type_=String), bindparam("model_number", type_=String)
+        ).where(exists().where(Part.part_id == bindparam("part_id"))),
+    )
+    .on_conflict_do_nothing()
+)
+
+
+def _upsert_part(session, record: Dict) -> bool:
+    """Insert or overwrite one part; returns False when the record has no id."""
     part_id = record.get("partselect_number")
     if not part_id:
-        return False, False
-
-    instance = session.get(Part, part_id)
-    created = False
-    if instance is None:
-        instance = Part(part_id=part_id)
-        session.add(instance)
-        created = True
-
-    instance.manufacturer_part_number = record.get("manufacturer_part_number") or None
-    instance.part_name = record.get("part_name") or ""
-    instance.part_price = _normalize_price(record.get("part_price"))
-    instance.description = record.get("description") or None
-    instance.symptoms = record.get("symptoms") or None
-    instance.install_difficulty = record.get("install_difficulty") or None
-    instance.install_time = record.get("install_time") or None
-    instance.replace_parts = record.get("replaceable_models") or record.get("replace_parts") or None
-    instance.availability = record.get("availability") or None
-    instance.brand = record.get("brand") or None
-    instance.appliance_type = record.get("appliance_type") or None
-    instance.product_url = record.get("product_url") or None
-
-    return created, not created
-
-
-def _upsert_model(session, record: Dict, appliance_type: str) -> Tuple[Model, bool]:
+        return False
+
+    session.execute(
+        _PART_UPSERT,
+        {
+            "part_id": part_id,
+            "manufacturer_part_number": record.get("manufacturer_part_number") or None,
+            "part_name": record.get("part_name") or "",
+            "part_price_cents": _to_cents(_normalize_price(record.get("part_price"))),
+            "description": record.get("description") or None,
+            "symptoms": record.get("symptoms") or None,
+            "install_difficulty": record.get("install_difficulty") or None,
+            "install_time": record.get("install_time") or None,
+            "replace_parts": record.get("replaceable_models") or record.get("replace_parts") or None,
+            "availability": record.get("availability") or None,
+            "brand": record.get("brand") or None,
+            "appliance_type": record.get("appliance_type") or None,
+            "product_url": record.get("product_url") or None,
+        },
+    )
+    return True
+
+
+def _upsert_model(session, record: Dict, appliance_type: str) -> str:
+    """Insert or update one model; returns its model_number."""
     model_number = record.get("model_number")
     if not model_number:
         raise ValueError("Missing model_number in cross-reference row.")
 
-    stmt = select(Model).where(Model.model_number == model_number)
-    instance = session.execute(stmt).scalar_one_or_none()
-    created = False
-    if instance is None:
-        instance = Model(model_number=model_number)
-        session.add(instance)
-        created = True
-
-    if record.get("brand"):
-        instance.brand = record.get("brand")
-    if record.get("description"):
-        instance.model_description = record.get("description")
-    if appliance_type:
-        instance.appliance_type = appliance_type
-    if record.get("model_url"):
-        instance.model_url = record.get("model_url")
-
-    session.flush()
-    return instance, created
+    session.execute(
+        _MODEL_UPSERT,
+        {
+            "model_number": model_number,
+            "brand": record.get("brand") or None,
+            "model_description": record.get("description") or None,
+            "appliance_type": appliance_type or None,
+            "model_url": record.get("model_url") or None,
+        },
+    )
+    return model_number
 
 
-def _link_part_to_model(session, part_id: str, model: Model) -> bool:
+def _link_part_to_model(session, part_id: str, model_number: str) -> bool:
+    """Link a known part to a model; returns True if a new link was added."""
     if not part_id:
         return False
-    part = session.get(Part, part_id)
-    if part is None:
-        return False
+    result = session.execute(_LINK_INSERT, {"part_id": part_id, "model_number": model_number})
+    return result.rowcount == 1
+
+
+# ------------------------------------------------------------
+# Bulk CSV ingest
+# ------------------------------------------------------------
+# The per-record helpers above serve the API ingest, which sees one record at
+# a time. CSVs are loaded a whole file at a time: columns are cleaned with
+# pandas and written with one executemany INSERT ... ON CONFLICT per table.
+
+
+def _text_values(df: pd.DataFrame, column: str, default=None) -> List:
+    """Column values with blanks replaced by ``default`` (same as ``value or default``)."""
+    if column not in df:
+        return [default] * len(df)
+    return [value or default for value in df[column].tolist()]
+
+
+def _price_cents(df: pd.DataFrame) -> List[int | None]:
+    """Vectorised _normalize_price + cents conversion for the part_price column."""
+    if "part_price" not in df:
+        return [None] * len(df)
+    cleaned = df["part_price"].astype(str).str.replace(r"[$,]", "", regex=True).str.strip()
+    cents = (pd.to_numeric(cleaned, errors="coerce") * 100).round()
+    return [int(value) if value == value else None for value in cents.tolist()]
+
+
+def _part_rows(df: pd.DataFrame, appliance_type: str) -> List[Dict]:
+    """parts-table rows for every CSV record that has a partselect_number."""
+    if "partselect_number" not in df:
+        return []
+    df = df[df["partselect_number"] != ""]
+    columns = {
+        "part_id": df["partselect_number"].tolist(),
+        "manufacturer_part_number": _text_values(df, "manufacturer_part_number"),
+        "part_name": _text_values(df, "part_name", ""),
+        "part_price_cents": _price_cents(df),
+        "description": _text_values(df, "description"),
+        "symptoms": _text_values(df, "symptoms"),
+        "install_difficulty": _text_values(df, "install_difficulty"),
+        "install_time": _text_values(df, "install_time"),
+        "replace_parts": [
+            models or parts
+            for models, parts in zip(
+                _text_values(df, "replaceable_models"), _text_values(df, "replace_parts")
+            )
+        ],
+        "availability": _text_values(df, "availability"),
+        "brand": _text_values(df, "brand"),
+        "appliance_type": [appliance_type or None] * len(df),
+        "product_url": _text_values(df, "product_url"),
+    }
+    return [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+
+def _bulk_upsert_parts(session, rows: List[Dict]) -> Tuple[int, int]:
+    """Insert or overwrite parts; returns (created, updated)."""
+    if not rows:
+        return 0, 0
+    existing = set(session.scalars(select(Part.part_id)))
+
+    session.execute(_PART_UPSERT, rows)
+
+    # Repeated IDs in one file count as updates, as with row-by-row upserts
+    created = len({row["part_id"] for row in rows} - existing)
+    return created, len(rows) - created
+
+
+def _bulk_upsert_crossrefs(session, df: pd.DataFrame, appliance_type: str) -> Tuple[int, int]:
+    """Upsert models and add missing part/model links; returns (models_created, mappings_created)."""
+    if df.empty:
+        return 0, 0
+    model_numbers = df["model_number"].tolist()
+    if not all(model_numbers):
+        raise ValueError("Missing model_number in cross-reference row.")
 
-    stmt = select(PartModelMapping).where(
-        PartModelMapping.part_id == part_id,
-        PartModelMapping.model_number == model.model_number,
+    existing_models = set(session.scalars(select(Model.model_number)))
+    rows = [
+        {
+            "model_number": model_number,
+            "brand": brand,
+            "model_description": description,
+            "appliance_type": appliance_type or None,
+            "model_url": model_url,
+        }
+        for model_number, brand, description, model_url in zip(
+            model_numbers,
+            _text_values(df, "brand"),
+            _text_values(df, "description"),
+            _text_values(df, "model_url"),
+        )
+    ]
+    session.execute(_MODEL_UPSERT, rows)
+    models_created = len(set(model_numbers) - existing_models)
+
+    known_parts = set(session.scalars(select(Part.part_id)))
+    linked = set(
+        map(tuple, session.execute(select(PartModelMapping.part_id, PartModelMapping.model_number)))
     )
-    existing = session.execute(stmt).scalar_one_or_none()
-    if existing:
-        return False
+    new_links = []
+    for part_id, model_number in zip(_text_values(df, "partselect_number"), model_numbers):
+        if part_id in known_parts and (part_id, model_number) not in linked:
+            linked.add((part_id, model_number))
+            new_links.append({"part_id": part_id, "model_number": model_number})
+    if new_links:
+        session.execute(insert(PartModelMapping.__table__), new_links)
 
-    session.add(PartModelMapping(part_id=part_id, model_number=model.model_number))
-    return True
+    return models_created, len(new_links)
+
+
+def _file_hash(path: Path) -> str:
+    if not path.exists():
+        raise FileNotFoundError(f"Expected data file at {path}")
+    return hashlib.blake2b(path.read_bytes()).hexdigest()
+
+
+def _changed_sources(
+    session, sources: List[Tuple[str, Path]], force: bool = False
+) -> List[Tuple[str, Path, str]]:
+    """``(appliance_type, path, hash)`` for sources that changed since their last ingest (all if ``force``)."""
+    known = dict(session.execute(select(_INGEST_META.c.source, _INGEST_META.c.content_hash)).all())
+    changed = []
+    for appliance_type, path in sources:
+        digest = _file_hash(path)
+        if not force and known.get(str(path)) == digest:
+            print(f"Unchanged since last ingest, skipping {path.name}")
+            continue
+        changed.append((appliance_type, path, digest))
+    return changed
+
+
+def _record_sources(session, sources: List[Tuple[str, Path, str]]) -> None:
+    if not sources:
+        return
+    stmt = sqlite_insert(_INGEST_META)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[_INGEST_META.c.source],
+        set_={"content_hash": stmt.excluded.content_hash},
+    )
+    session.execute(
+        stmt, [{"source": str(path), "content_hash": digest} for _, path, digest in sources]
+    )
 
 
-def _ingest_parts(session) -> Tuple[int, int]:
+def _ingest_parts(session, sources: List[Tuple[str, Path, str]]) -> Tuple[int, int]:
     created = updated = 0
-    for appliance_type, path in PART_SOURCES:
-        df = _load_csv(path)
-        df["appliance_type"] = appliance_type
-        for record in df.to_dict(orient="records"):
-            was_created, was_updated = _upsert_part(session, record)
-            if was_created:
-                created += 1
-            elif was_updated:
-                updated += 1
-    session.flush()
+    for appliance_type, path, _ in sources:
+        file_created, file_updated = _bulk_upsert_parts(
+            session, _part_rows(_load_csv(path, PART_CSV_COLUMNS), appliance_type)
+        )
+        created += file_created
+        updated += file_updated
+    _record_sources(session, sources)
     return created, updated
 
 
-def _ingest_crossrefs(session) -> Tuple[int, int]:
+def _ingest_crossrefs(session, sources: List[Tuple[str, Path, str]]) -> Tuple[int, int]:
     models_created = mappings_created = 0
-    for appliance_type, path in CROSSREF_SOURCES:
-        df = _load_csv(path)
-        for record in df.to_dict(orient="records"):
-            model, created = _upsert_model(session, record, appliance_type)
-            if created:
-                models_created += 1
-            if _link_part_to_model(session, record.get("partselect_number"), model):
-                mappings_created += 1
+    for appliance_type, path, _ in sources:
+        df = _load_csv(path, CROSSREF_CSV_COLUMNS)
+        file_models, file_mappings = _bulk_upsert_crossrefs(session, df, appliance_type)
+        models_created += file_models
+        mappings_created += file_mappings
+    _record_sources(session, sources)
     return models_created, mappings_created
 
 
-def main() -> None:
-    _reset_sqlite_file()
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Ingest part and cross-reference CSVs into SQLite.")
+    parser.add_argument(
+        "--reset",
+        action="store_true",
+        help="Delete the SQLite file and rebuild it (also drops parts no longer in the CSVs).",
+    )
+    args = parser.parse_args(argv)
+
+    if args.reset:
+        _reset_sqlite_file()
     create_tables()
 
     with session_scope() as session:
-        parts_created, parts_updated = _ingest_parts(session)
-        models_created, mappings_created = _ingest_crossrefs(session)
+        _INGEST_META.create(session.connection(), checkfirst=True)
+        part_sources = _changed_sources(session, PART_SOURCES)
+        # Links are only added for known parts, so new parts mean every
+        # cross-reference file has to be read again
+        crossref_sources = _changed_sources(session, CROSSREF_SOURCES, force=bool(part_sources))
+
+        parts_created, parts_updated = _ingest_parts(session, part_sources)
+        models_created, mappings_created = _ingest_crossrefs(session, crossref_sources)
 
     print(f"Parts ingested → created: {parts_created}, updated: {parts_updated}")
     print(f"Models created: {models_created}")
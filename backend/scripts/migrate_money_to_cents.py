@@ -0,0 +1,59 @@
+"""
+One-off migration for existing SQLite databases:
+- Convert parts.part_price / transactions.amount (Numeric) to integer cents
+- Create the composite order/transaction indexes
+
+Safe to re-run; already-migrated columns are skipped.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import inspect, text
+
+from app.db import engine
+from app.models import Order, Transaction
+
+
+# (table, old column, new column, column DDL)
+MONEY_COLUMNS = [
+    ("parts", "part_price", "part_price_cents", "INTEGER"),
+    ("transactions", "amount", "amount_cents", "INTEGER NOT NULL DEFAULT 0"),
+]
+
+
+def _migrate_column(conn, table: str, old: str, new: str, ddl: str) -> bool:
+    columns = {c["name"] for c in inspect(conn).get_columns(table)}
+    if new in columns or old not in columns:
+        return False
+
+    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {new} {ddl}"))
+    conn.execute(
+        text(
+            f"UPDATE {table} SET {new} = CAST(ROUND({old} * 100) AS INTEGER) "
+            f"WHERE {old} IS NOT NULL"
+        )
+    )
+    conn.execute(text(f"ALTER TABLE {table} DROP COLUMN {old}"))
+    return True
+
+
+def migrate() -> None:
+    with engine.begin() as conn:
+        tables = set(inspect(conn).get_table_names())
+        for table, old, new, ddl in MONEY_COLUMNS:
+            if table not in tables:
+                continue
+            if _migrate_column(conn, table, old, new, ddl):
+                print(f"Migrated {table}.{old} → {table}.{new}")
+            else:
+                print(f"{table}.{new} already present, skipping")
+
+        for model in (Order, Transaction):
+            if model.__tablename__ not in tables:
+                continue
+            for index in model.__table__.indexes:
+                index.create(bind=conn, checkfirst=True)
+
+
+if __name__ == "__main__":
+    migrate()
@@ -7,27 +7,26 @@ from __future__ import annotations
 from datetime import datetime, timedelta
 from decimal import Decimal
 
+from sqlalchemy import select
+
 from app.config import settings
 from app.db import create_tables, session_scope
 from app.models import User, Order, Transaction, Part
 
 
-def _ensure_part_exists(session, part_id: str) -> bool:
-    """Check if a part exists, create a dummy one if not."""
-    part = session.query(Part).filter(Part.part_id == part_id).first()
-    if part:
-        return True
-    
-    # Create a dummy part if it doesn't exist
-    dummy_part = Part(
-        part_id=part_id,
-        part_name=f"Dummy Part {part_id}",
-        part_price=Decimal("29.99"),
-        appliance_type="refrigerator",
+def _ensure_parts_exist(session, part_ids: list[str]) -> None:
+    """Create a dummy part for every id not already in the catalog (one SELECT)."""
+    existing = set(session.scalars(select(Part.part_id).where(Part.part_id.in_(part_ids))))
+    session.add_all(
+        Part(
+            part_id=part_id,
+            part_name=f"Dummy Part {part_id}",
+            part_price=Decimal("29.99"),
+            appliance_type="refrigerator",
+        )
+        for part_id in part_ids
+        if part_id not in existing
     )
-    session.add(dummy_part)
-    session.flush()
-    return True
 
 
 def seed_demo_data() -> None:
@@ -40,161 +39,110 @@ def seed_demo_data() -> None:
         session.query(Transaction).delete()
         session.query(Order).delete()
         session.query(User).delete()
-        session.flush()
-        
+
+        _ensure_parts_exist(
+            session, ["PS11752778", "PS12345678", "PS87654321", "PS11111111", "PS22222222"]
+        )
+        now = datetime.utcnow()
+
         # Demo User 1: John Doe - Active customer with multiple orders
         user1 = User(
             name="John Doe",
             email="john.doe@example.com"
         )
-        session.add(user1)
-        session.flush()
-        
-        # Ensure parts exist
-        _ensure_part_exists(session, "PS11752778")
-        _ensure_part_exists(session, "PS12345678")
-        
+
         # Order 1 for John: Recent order, shipped
         order1 = Order(
-            user_id=user1.user_id,
+            user=user1,
             part_id="PS11752778",
-            order_date=datetime.utcnow() - timedelta(days=3),
+            order_date=now - timedelta(days=3),
             shipping_type="standard",
             order_status="shipped",
             return_eligible=True,
             price_match_eligible=True,
         )
-        session.add(order1)
-        session.flush()
-        
-        transaction1 = Transaction(
-            transaction_id=f"TXN-{order1.order_id:04d}",
-            order_id=order1.order_id,
-            amount=Decimal("45.99"),
-            status="completed",
-            timestamp=order1.order_date,
-            payment_method="credit_card",
-        )
-        session.add(transaction1)
-        
+
         # Order 2 for John: Delivered order, return eligible
         order2 = Order(
-            user_id=user1.user_id,
+            user=user1,
             part_id="PS12345678",
-            order_date=datetime.utcnow() - timedelta(days=15),
+            order_date=now - timedelta(days=15),
             shipping_type="express",
             order_status="delivered",
             return_eligible=True,
             price_match_eligible=False,
         )
-        session.add(order2)
-        session.flush()
-        
-        transaction2 = Transaction(
-            transaction_id=f"TXN-{order2.order_id:04d}",
-            order_id=order2.order_id,
-            amount=Decimal("67.50"),
-            status="completed",
-            timestamp=order2.order_date,
-            payment_method="paypal",
-        )
-        session.add(transaction2)
-        
+
         # Demo User 2: Jane Smith - Single order, pending return
         user2 = User(
             name="Jane Smith",
             email="jane.smith@example.com"
         )
-        session.add(user2)
-        session.flush()
-        
-        _ensure_part_exists(session, "PS87654321")
-        
+
         order3 = Order(
-            user_id=user2.user_id,
+            user=user2,
             part_id="PS87654321",
-            order_date=datetime.utcnow() - timedelta(days=8),
+            order_date=now - timedelta(days=8),
             shipping_type="standard",
             order_status="returned",
             return_eligible=False,  # Already returned
             price_match_eligible=True,
         )
-        session.add(order3)
-        session.flush()
-        
-        transaction3 = Transaction(
-            transaction_id=f"TXN-{order3.order_id:04d}",
-            order_id=order3.order_id,
-            amount=Decimal("89.99"),
-            status="refunded",
-            timestamp=order3.order_date,
-            payment_method="credit_card",
-        )
-        session.add(transaction3)
-        
+
         # Demo User 3: Bob Johnson - Recent order, processing
         user3 = User(
             name="Bob Johnson",
             email="bob.johnson@example.com"
         )
-        session.add(user3)
-        session.flush()
-        
-        _ensure_part_exists(session, "PS11111111")
-        
+
         order4 = Order(
-            user_id=user3.user_id,
+            user=user3,
             part_id="PS11111111",
-            order_date=datetime.utcnow() - timedelta(days=1),
+            order_date=now - timedelta(days=1),
             shipping_type="overnight",
             order_status="processing",
             return_eligible=True,
             price_match_eligible=True,
         )
-        session.add(order4)
-        session.flush()
-        
-        transaction4 = Transaction(
-            transaction_id=f"TXN-{order4.order_id:04d}",
-            order_id=order4.order_id,
-            amount=Decimal("125.00"),
-            status="completed",
-            timestamp=order4.order_date,
-            payment_method="debit_card",
-        )
-        session.add(transaction4)
-        
+
         # Demo User 4: Alice Williams - Old order, delivered
         user4 = User(
             name="Alice Williams",
             email="alice.williams@example.com"
         )
-        session.add(user4)
-        session.flush()
-        
-        _ensure_part_exists(session, "PS22222222")
-        
+
         order5 = Order(
-            user_id=user4.user_id,
+            user=user4,
             part_id="PS22222222",
-            order_date=datetime.utcnow() - timedelta(days=30),
+            order_date=now - timedelta(days=30),
             shipping_type="standard",
             order_status="delivered",
             return_eligible=False,  # Outside return window
             price_match_eligible=False,
         )
-        session.add(order5)
+
+        # Users, parts and orders go out in one flush; the transaction ids
+        # below need the generated order ids
+        session.add_all([order1, order2, order3, order4, order5])
         session.flush()
-        
-        transaction5 = Transaction(
-            transaction_id=f"TXN-{order5.order_id:04d}",
-            order_id=order5.order_id,
-            amount=Decimal("34.99"),
-            status="completed",
-            timestamp=order5.order_date,
-            payment_method="credit_card",
+
+        session.add_all(
+            Transaction(
+                transaction_id=f"TXN-{order.order_id:04d}",
+                order_id=order.order_id,
+                amount=Decimal(amount),
+                status=status,
+                timestamp=order.order_date,
+                payment_method=payment_method,
+            )
+            for order, amount, status, payment_method in (
+                (order1, "45.99", "completed", "credit_card"),
+                (order2, "67.50", "completed", "paypal"),
+                (order3, "89.99", "refunded", "credit_card"),
+                (order4, "125.00", "completed", "debit_card"),
+                (order5, "34.99", "completed", "credit_card"),
+            )
         )
-        session.add(transaction5)
         
         session.commit()
         
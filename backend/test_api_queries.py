@@ -9,11 +9,22 @@ Usage:
     
     # Then run this script:
     python test_api_queries.py
+
+Successful replies are cached in .api_test_cache, so re-runs only send new
+queries. Use --refresh to re-send everything, or --tag to start a separate
+cache after changing the backend.
 """
 
-import requests
+import argparse
+import asyncio
+import hashlib
+import shelve
+import httpx
 import json
+import os
 import sys
+from collections import defaultdict
+from pathlib import Path
 from typing import Dict, Any
 
 # Color codes for terminal output
@@ -26,20 +37,104 @@ RESET = '\033[0m'
 BOLD = '\033[1m'
 
 BASE_URL = "http://localhost:8000"
+# Queries in flight at once (and connections kept open to the server);
+# bounded so the backend's LLM calls aren't flooded
+CONCURRENCY = int(os.environ.get("CONCURRENCY", "8"))
+# Characters of an error response body shown in the report
+ERROR_BODY_LIMIT = 500
+# Reconnect attempts when a connection is refused or reset
+CONNECT_RETRIES = 2
+# shelve file holding successful results from earlier runs
+CACHE_PATH = ".api_test_cache"
+# Optional list of {"category": ..., "query": ...} entries replacing DEFAULT_QUERIES
+QUERIES_FILE = Path(__file__).with_name("test_queries.json")
+
+
+# Built-in (category, query) pairs, used when QUERIES_FILE is absent
+DEFAULT_QUERIES = [
+    # Product Information
+    ("Product Info by Part ID", "Tell me about PS123456"),
+    ("Product Info by MPN", "What is WPW10321304?"),
+    ("Replacement Query", "I need a replacement for PS123456- not working"),
+    ("Product Details", "What does part PS123456 do?"),
+    
+    # Compatibility Checks
+    ("Compatibility Check", "Is PS123456 compatible with WDT780SAEM1?"),
+    ("Compatibility with Model", "Does WPW10321304 fit my WDT780SAEM1 model?"),
+    
+    # Order Support
+    ("Order Status - Format 1", "My order number is #4"),
+    ("Order Status - Format 2", "Where is my order with orderid #3"),
+    ("Order Status - Format 3", "Track order 1"),
+    ("Order Return", "My order number is #4, I need to return my order"),
+    
+    # Repair Help
+    ("Repair - Dishwasher Leak", "My dishwasher is leaking"),
+    ("Repair - Refrigerator Not Cooling", "My refrigerator is not cooling"),
+    ("Repair - Draining Issue", "My dishwasher isn't draining — what should I check?"),
+    ("Repair - Ice Maker", "The ice maker on my Whirlpool fridge is not working. How can I fix it?"),
+    ("Repair - General", "My dishwasher is not working"),
+    
+    # Blog/How-To
+    ("How-To - Eco Mode", "What is eco mode on a dishwasher?"),
+    ("How-To - Reset", "How do I reset my Bosch dishwasher?"),
+    ("Usage Question", "What does sanitize cycle do?"),
+    
+    # Policy
+    ("Return Policy", "What is your return policy?"),
+    ("Warranty", "What is your warranty?"),
+    ("Shipping Policy", "What is your shipping policy?"),
+    ("Price Match", "Do you offer price matching?"),
+    
+    # Edge Cases
+    ("Clarification Needed", "Is this compatible?"),
+    ("Out of Scope", "Tell me about microwaves"),
+    ("Empty/Invalid", "Hello"),
+]
+
+
+def load_queries():
+    """(category, query) pairs from QUERIES_FILE if it exists, else DEFAULT_QUERIES."""
+    if not QUERIES_FILE.exists():
+        return DEFAULT_QUERIES
+    with open(QUERIES_FILE, "r", encoding="utf-8") as f:
+        entries = json.load(f)
+    return [(entry["category"], entry["query"]) for entry in entries]
 
 
 def print_header(text):
     """Print a formatted header."""
-    print(f"\n{BOLD}{BLUE}{'='*80}{RESET}")
-    print(f"{BOLD}{BLUE}{text:^80}{RESET}")
-    print(f"{BOLD}{BLUE}{'='*80}{RESET}\n")
+    rule = f"{BOLD}{BLUE}{'='*80}{RESET}"
+    sys.stdout.write(f"\n{rule}\n{BOLD}{BLUE}{text:^80}{RESET}\n{rule}\n\n")
 
 
 def print_section(text):
     """Print a section header."""
-    print(f"\n{BOLD}{CYAN}{'─'*80}{RESET}")
-    print(f"{BOLD}{CYAN}{text}{RESET}")
-    print(f"{BOLD}{CYAN}{'─'*80}{RESET}\n")
+    rule = f"{BOLD}{CYAN}{'─'*80}{RESET}"
+    sys.stdout.write(f"\n{rule}\n{BOLD}{CYAN}{text}{RESET}\n{rule}\n\n")
+
+
+def _format_product(metadata: Dict[str, Any]) -> str:
+    product = metadata.get("product", {})
+    return f"Product Card: {product.get('name', 'N/A')} (ID: {product.get('id', 'N/A')})"
+
+
+def _format_order(metadata: Dict[str, Any]) -> str:
+    order = metadata.get("order", {})
+    return f"Order Card: Order #{order.get('id', 'N/A')} - {order.get('status', 'N/A')}"
+
+
+def _format_links(metadata: Dict[str, Any]) -> str:
+    link_labels = [link.get("label", "N/A") for link in metadata.get("links", [])]
+    return f"Links: {', '.join(link_labels)}"
+
+
+# Metadata "type" → formatter; other types print as "Type: <type>"
+_FORMATTERS = {
+    "product_info": _format_product,
+    "order_info": _format_order,
+    "links": _format_links,
+}
 
 
 def format_metadata(metadata: Dict[str, Any]) -> str:
@@ -48,41 +143,29 @@ def format_metadata(metadata: Dict[str, Any]) -> str:
         return "None"
     
     metadata_type = metadata.get("type", "unknown")
-    
-    if metadata_type == "product_info":
-        product = metadata.get("product", {})
-        return f"Product Card: {product.get('name', 'N/A')} (ID: {product.get('id', 'N/A')})"
-    
-    elif metadata_type == "order_info":
-        order = metadata.get("order", {})
-        return f"Order Card: Order #{order.get('id', 'N/A')} - {order.get('status', 'N/A')}"
-    
-    elif metadata_type == "links":
-        links = metadata.get("links", [])
-        link_labels = [link.get("label", "N/A") for link in links]
-        return f"Links: {', '.join(link_labels)}"
-    
-    else:
+    formatter = _FORMATTERS.get(metadata_type)
+    if formatter is None:
         return f"Type: {metadata_type}"
+    return formatter(metadata)
 
 
-def test_query(query: str, category: str = "General") -> Dict[str, Any]:
+async def test_query(client: httpx.AsyncClient, query: str) -> Dict[str, Any]:
     """Test a single query and return results."""
     try:
-        response = requests.post(
+        response = await client.post(
             f"{BASE_URL}/chat",
             json={"message": query},
             timeout=10
         )
         
-        if response.status_code == 200:
+        if response.is_success:
             data = response.json()
             return {
                 "success": True,
                 "query": query,
                 "reply": data.get("reply", ""),
                 "metadata": data.get("metadata"),
-                "status_code": 200,
+                "status_code": response.status_code,
                 "error": None
             }
         else:
@@ -92,10 +175,10 @@ def test_query(query: str, category: str = "General") -> Dict[str, Any]:
                 "reply": None,
                 "metadata": None,
                 "status_code": response.status_code,
-                "error": f"HTTP {response.status_code}: {response.text}"
+                "error": f"HTTP {response.status_code}: {response.text[:ERROR_BODY_LIMIT]}"
             }
     
-    except requests.exceptions.ConnectionError:
+    except httpx.ConnectError:
         return {
             "success": False,
             "query": query,
@@ -111,39 +194,79 @@ def test_query(query: str, category: str = "General") -> Dict[str, Any]:
             "reply": None,
             "metadata": None,
             "status_code": None,
-            "error": str(e)
+            # Some httpx errors (e.g. ReadError) have an empty message
+            "error": str(e) or type(e).__name__
         }
 
 
+def cache_key(query: str, tag: str = "") -> str:
+    return hashlib.sha1(f"{tag}\0{query}".encode("utf-8")).hexdigest()
+
+
+async def run_queries(queries, cache, refresh=False, tag=""):
+    """
+    Send every query not already in ``cache``, CONCURRENCY at a time; results line up
+    with ``queries``. Only successful results are cached.
+    """
+    keys = [cache_key(query, tag) for query in queries]
+    results = [None if refresh else cache.get(key) for key in keys]
+    pending = [i for i, result in enumerate(results) if result is None]
+
+    async with httpx.AsyncClient(
+        transport=httpx.AsyncHTTPTransport(retries=CONNECT_RETRIES),
+        limits=httpx.Limits(max_connections=CONCURRENCY),
+    ) as client:
+        # Waiting here rather than in the connection pool keeps each query's
+        # timeout from starting before it is actually sent
+        semaphore = asyncio.Semaphore(CONCURRENCY)
+
+        async def send(query):
+            async with semaphore:
+                return await test_query(client, query)
+
+        fetched = await asyncio.gather(*(send(queries[i]) for i in pending))
+
+    for i, result in zip(pending, fetched):
+        results[i] = result
+        if result["success"]:
+            cache[keys[i]] = result
+    return results
+
+
 def display_result(result: Dict[str, Any], index: int, total: int):
-    """Display a test result in a formatted way."""
-    print(f"{YELLOW}[{index}/{total}]{RESET} {BOLD}Query:{RESET} {result['query']}")
+    """Display a test result in a formatted way (one write per result)."""
+    lines = [f"{YELLOW}[{index}/{total}]{RESET} {BOLD}Query:{RESET} {result['query']}"]
     
     if result["success"]:
-        print(f"  {GREEN}✓ Status:{RESET} Success (HTTP {result['status_code']})")
-        print(f"  {BOLD}Reply:{RESET} {result['reply'][:200]}{'...' if len(result['reply']) > 200 else ''}")
-        print(f"  {BOLD}Metadata:{RESET} {format_metadata(result['metadata'])}")
+        lines.append(f"  {GREEN}✓ Status:{RESET} Success (HTTP {result['status_code']})")
+        lines.append(f"  {BOLD}Reply:{RESET} {result['reply'][:200]}{'...' if len(result['reply']) > 200 else ''}")
+        lines.append(f"  {BOLD}Metadata:{RESET} {format_metadata(result['metadata'])}")
     else:
-        print(f"  {RED}✗ Status:{RESET} Failed")
+        lines.append(f"  {RED}✗ Status:{RESET} Failed")
         if result["error"]:
-            print(f"  {RED}Error:{RESET} {result['error']}")
+            lines.append(f"  {RED}Error:{RESET} {result['error']}")
     
-    print()
+    sys.stdout.write("\n".join(lines) + "\n\n")
 
 
-def main():
+def main(argv=None):
     """Run all test queries."""
+    parser = argparse.ArgumentParser(description="Run the PartSelect agent API test queries.")
+    parser.add_argument("--refresh", action="store_true", help="Ignore cached replies (new ones are still cached).")
+    parser.add_argument("--tag", default="", help="Cache namespace, e.g. a backend version; change it to invalidate.")
+    args = parser.parse_args(argv)
+    
     print_header("PartSelect Agent API Test Suite")
     
     # Check if server is running
     print(f"{YELLOW}Checking if server is running at {BASE_URL}...{RESET}")
     try:
-        health_response = requests.get(f"{BASE_URL}/health", timeout=5)
+        health_response = httpx.get(f"{BASE_URL}/health", timeout=5)
         if health_response.status_code == 200:
             print(f"{GREEN}✓ Server is running!{RESET}\n")
         else:
             print(f"{RED}✗ Server returned status {health_response.status_code}{RESET}\n")
-    except requests.exceptions.ConnectionError:
+    except httpx.ConnectError:
         print(f"{RED}✗ Cannot connect to server at {BASE_URL}{RESET}")
         print(f"{YELLOW}Make sure your server is running:{RESET}")
         print(f"  {CYAN}uvicorn app.main:app --reload{RESET}\n")
@@ -152,69 +275,31 @@ def main():
         print(f"{RED}✗ Error checking server: {e}{RESET}\n")
         return 1
     
-    # Define test queries organized by category
-    test_queries = [
-        # Product Information
-        ("Product Info by Part ID", "Tell me about PS123456"),
-        ("Product Info by MPN", "What is WPW10321304?"),
-        ("Replacement Query", "I need a replacement for PS123456- not working"),
-        ("Product Details", "What does part PS123456 do?"),
-        
-        # Compatibility Checks
-        ("Compatibility Check", "Is PS123456 compatible with WDT780SAEM1?"),
-        ("Compatibility with Model", "Does WPW10321304 fit my WDT780SAEM1 model?"),
-        
-        # Order Support
-        ("Order Status - Format 1", "My order number is #4"),
-        ("Order Status - Format 2", "Where is my order with orderid #3"),
-        ("Order Status - Format 3", "Track order 1"),
-        ("Order Return", "My order number is #4, I need to return my order"),
-        
-        # Repair Help
-        ("Repair - Dishwasher Leak", "My dishwasher is leaking"),
-        ("Repair - Refrigerator Not Cooling", "My refrigerator is not cooling"),
-        ("Repair - Draining Issue", "My dishwasher isn't draining — what should I check?"),
-        ("Repair - Ice Maker", "The ice maker on my Whirlpool fridge is not working. How can I fix it?"),
-        ("Repair - General", "My dishwasher is not working"),
-        
-        # Blog/How-To
-        ("How-To - Eco Mode", "What is eco mode on a dishwasher?"),
-        ("How-To - Reset", "How do I reset my Bosch dishwasher?"),
-        ("Usage Question", "What does sanitize cycle do?"),
-        
-        # Policy
-        ("Return Policy", "What is your return policy?"),
-        ("Warranty", "What is your warranty?"),
-        ("Shipping Policy", "What is your shipping policy?"),
-        ("Price Match", "Do you offer price matching?"),
-        
-        # Edge Cases
-        ("Clarification Needed", "Is this compatible?"),
-        ("Out of Scope", "Tell me about microwaves"),
-        ("Empty/Invalid", "Hello"),
-    ]
+    test_queries = load_queries()
     
     results = []
     passed = 0
     failed = 0
     
     # Run tests by category
-    categories = {}
+    categories = defaultdict(list)
     for category, query in test_queries:
-        if category not in categories:
-            categories[category] = []
-        categories[category].append((category, query))
+        categories[category].append(query)
     
-    # Test each query
+    # Send all queries at once, then display them grouped by category
     total = len(test_queries)
     current = 0
+    with shelve.open(CACHE_PATH) as cache:
+        responses = iter(asyncio.run(run_queries(
+            [q for qs in categories.values() for q in qs], cache, args.refresh, args.tag
+        )))
     
     for category, queries in categories.items():
         print_section(f"Testing: {category}")
         
-        for cat, query in queries:
+        for query in queries:
             current += 1
-            result = test_query(query, category)
+            result = next(responses)
             results.append(result)
             display_result(result, current, total)
             
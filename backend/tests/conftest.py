@@ -2,39 +2,174 @@
 Pytest configuration and fixtures for all tests.
 """
 
+from types import SimpleNamespace
+
 import pytest
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import joinedload, raiseload, selectinload, sessionmaker
 from sqlalchemy.pool import StaticPool
+from sqlalchemy.sql.lambdas import StatementLambdaElement
 
 from app.db import Base
 from app.models import Part, Model, PartModelMapping, Order, Transaction, User
 
 
-@pytest.fixture(scope="function")
-def db_session():
+_EAGER_LOADERS = {"selectin": selectinload, "joined": joinedload}
+
+_TRANSACTION_CONTROL = ("BEGIN", "SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+
+
+def _raise_on_lazy_options(mapper, parent=None, seen=()):
+    """
+    Build loader options that keep each eager relationship's strategy and
+    turn every lazy="select" relationship below it into raiseload.
+
+    A bare raiseload("*") would also override the mapper-level selectin /
+    joined strategies, so the tree is spelled out explicitly instead.
+    """
+    options = []
+    seen = seen + (mapper,)
+    for rel in mapper.relationships:
+        attr = rel.class_attribute
+        if rel.lazy == "select":
+            if parent is None:
+                options.append(raiseload(attr, sql_only=True))
+            else:
+                options.append(parent.raiseload(attr, sql_only=True))
+        elif rel.lazy in _EAGER_LOADERS and rel.mapper not in seen:
+            if parent is None:
+                loader = _EAGER_LOADERS[rel.lazy](attr)
+            else:
+                loader = getattr(parent, _EAGER_LOADERS[rel.lazy].__name__)(attr)
+            options.append(loader)
+            options.extend(_raise_on_lazy_options(rel.mapper, loader, seen))
+    return options
+
+
+def _install_raiseload(session_factory):
+    """
+    Fail tests that trigger an implicit lazy load (the N+1 pattern).
+
+    Test-only: production sessions keep the default strategies declared in
+    app.models.
+    """
+
+    @event.listens_for(session_factory, "do_orm_execute")
+    def _apply_raiseload(orm_execute_state):
+        if not orm_execute_state.is_select or orm_execute_state.is_relationship_load:
+            return
+        statement = orm_execute_state.statement
+        # Column-only selects (e.g. select(Part.part_id)) load no relationships
+        descriptions = getattr(statement, "column_descriptions", None)
+        if descriptions is not None and not any(
+            d.get("entity") is not None and d.get("expr") is d.get("entity")
+            for d in descriptions
+        ):
+            return
+        # lambda_stmt() statements don't report all_mappers; use the bind mapper
+        mappers = orm_execute_state.all_mappers or [orm_execute_state.bind_mapper]
+        options = []
+        for mapper in mappers:
+            if mapper is not None:
+                options.extend(_raise_on_lazy_options(mapper))
+        if not options:
+            return
+        options = tuple(options)
+        if isinstance(statement, StatementLambdaElement):
+            orm_execute_state.statement = statement.add_criteria(
+                lambda s: s.options(*options), track_on=[options]
+            )
+        else:
+            orm_execute_state.statement = statement.options(*options)
+
+    return session_factory
+
+
+@pytest.fixture(scope="session")
+def _engine():
     """
-    Create a fresh in-memory database for each test.
+    One in-memory database with the schema created once for the whole run.
     """
     engine = create_engine(
         "sqlite:///:memory:",
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
     )
+
+    # pysqlite's implicit transaction handling breaks SAVEPOINT; let
+    # SQLAlchemy emit BEGIN itself instead
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_begin(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    # Nothing outlives the run, so skip durability bookkeeping
+    @event.listens_for(engine, "connect")
+    def _set_test_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in (
+            "journal_mode=MEMORY",
+            "synchronous=OFF",
+            "temp_store=MEMORY",
+            "locking_mode=EXCLUSIVE",
+        ):
+            cursor.execute(f"PRAGMA {pragma}")
+        cursor.close()
+
+    @event.listens_for(engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
     Base.metadata.create_all(engine)
-    Session = sessionmaker(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(scope="function")
+def db_session(_engine):
+    """
+    Session inside a transaction that is rolled back after each test.
+
+    Commits made by the test (and by fixtures) only release a SAVEPOINT, so
+    every test still starts from empty tables.
+    """
+    connection = _engine.connect()
+    transaction = connection.begin()
+    Session = _install_raiseload(
+        sessionmaker(bind=connection, join_transaction_mode="create_savepoint")
+    )
     session = Session()
     
     yield session
     
     session.close()
-    Base.metadata.drop_all(engine)
+    transaction.rollback()
+    connection.close()
 
 
 @pytest.fixture
-def sample_part(db_session):
-    """Create a sample part for testing."""
-    part = Part(
+def query_counter(db_session):
+    """
+    Count SQL statements executed on the test engine.
+
+    Usage: reset ``query_counter["count"] = 0`` before the code under test,
+    then assert on the number of round-trips it issued.
+    """
+    counter = {"count": 0}
+    engine = db_session.get_bind()
+
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        # The per-test SAVEPOINTs from db_session aren't issued by the code under test
+        if statement.startswith(_TRANSACTION_CONTROL):
+            return
+        counter["count"] += 1
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    yield counter
+    event.remove(engine, "before_cursor_execute", _before_cursor_execute)
+
+
+def _make_part():
+    return Part(
         part_id="PS123456",
         manufacturer_part_number="WPW10321304",
         part_name="Water Inlet Valve",
@@ -49,24 +184,56 @@ def sample_part(db_session):
         appliance_type="dishwasher",
         product_url="https://www.partselect.com/PS123456",
     )
-    db_session.add(part)
-    db_session.commit()
-    return part
 
 
-@pytest.fixture
-def sample_model(db_session):
-    """Create a sample model for testing."""
-    model = Model(
+def _make_model():
+    return Model(
         model_number="WDT780SAEM1",
         brand="Whirlpool",
         model_description="Whirlpool Dishwasher",
         appliance_type="dishwasher",
         model_url="https://www.partselect.com/WDT780SAEM1",
     )
-    db_session.add(model)
+
+
+def _make_order():
+    from datetime import date
+    return Order(
+        order_id=1,
+        user_id=1,
+        part_id="PS123456",
+        order_status="shipped",
+        order_date=date(2024, 1, 15),
+        shipping_type="Standard",
+        return_eligible=True,
+    )
+
+
+def _make_transaction():
+    return Transaction(
+        transaction_id=1,
+        order_id=1,
+        amount=45.99,
+        status="completed",
+    )
+
+
+def _add_and_commit(db_session, instance):
+    db_session.add(instance)
     db_session.commit()
-    return model
+    return instance
+
+
+@pytest.fixture
+def sample_part(db_session):
+    """Create a sample part for testing."""
+    return _add_and_commit(db_session, _make_part())
+
+
+@pytest.fixture
+def sample_model(db_session):
+    """Create a sample model for testing."""
+    return _add_and_commit(db_session, _make_model())
 
 
 @pytest.fixture
@@ -76,50 +243,90 @@ def sample_part_model_mapping(db_session, sample_part, sample_model):
         part_id=sample_part.part_id,
         model_number=sample_model.model_number,
     )
-    db_session.add(mapping)
-    db_session.commit()
-    return mapping
+    return _add_and_commit(db_session, mapping)
 
 
 @pytest.fixture
 def sample_order(db_session, sample_part):
     """Create a sample order for testing."""
-    from datetime import date
-    order = Order(
-        order_id=1,
-        user_id=1,
-        part_id=sample_part.part_id,
-        order_status="shipped",
-        order_date=date(2024, 1, 15),
-        shipping_type="Standard",
-        return_eligible=True,
-    )
-    db_session.add(order)
-    db_session.commit()
-    return order
+    return _add_and_commit(db_session, _make_order())
 
 
 @pytest.fixture
 def sample_transaction(db_session, sample_order):
     """Create a sample transaction for testing."""
-    transaction = Transaction(
-        transaction_id=1,
-        order_id=sample_order.order_id,
-        amount=45.99,
-        status="completed",
+    return _add_and_commit(db_session, _make_transaction())
+
+
+@pytest.fixture
+def bulk_parts(db_session):
+    """
+    Factory: ``bulk_parts(count)`` inserts minimal parts PS100000, PS100001, ...
+    with one executemany INSERT and one commit, and returns their ids.
+
+    For tests that need many rows; avoids a unit-of-work flush per object.
+    """
+
+    def _insert(count, start=100000):
+        rows = [{"part_id": f"PS{start + i}", "part_name": f"Part {i}"} for i in range(count)]
+        db_session.execute(insert(Part), rows)
+        db_session.commit()
+        return [row["part_id"] for row in rows]
+
+    return _insert
+
+
+@pytest.fixture
+def seeded_db(db_session):
+    """
+    The sample part, model, mapping, order and transaction in one commit.
+
+    Use instead of chaining several sample_* fixtures, which commit once each.
+    """
+    seeded = SimpleNamespace(
+        part=_make_part(),
+        model=_make_model(),
+        mapping=PartModelMapping(part_id="PS123456", model_number="WDT780SAEM1"),
+        order=_make_order(),
+        transaction=_make_transaction(),
     )
-    db_session.add(transaction)
+    db_session.add_all(vars(seeded).values())
     db_session.commit()
-    return transaction
+    return seeded
 
 
-@pytest.fixture
-def mock_llm_response(monkeypatch):
-    """Mock LLM responses for testing."""
-    def mock_llm_answer(*args, **kwargs):
-        return "Mock LLM response"
-    
+def _mock_llm_answer(*args, **kwargs):
+    return "Mock LLM response"
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _patch_llm():
+    """
+    Stub llm_answer once for the whole run, so no test reaches a real model
+    by forgetting a fixture. Yields the real function.
+    """
     import app.agent.handlers
-    monkeypatch.setattr(app.agent.handlers, "llm_answer", mock_llm_answer)
-    return mock_llm_answer
 
+    with pytest.MonkeyPatch.context() as mp:
+        original = app.agent.handlers.llm_answer
+        mp.setattr(app.agent.handlers, "llm_answer", _mock_llm_answer)
+        yield original
+
+
+@pytest.fixture(autouse=True)
+def _real_llm(request):
+    """Restore the real llm_answer for tests marked ``real_llm``."""
+    if request.node.get_closest_marker("real_llm") is None:
+        yield
+        return
+    import app.agent.handlers
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(app.agent.handlers, "llm_answer", request.getfixturevalue("_patch_llm"))
+        yield
+
+
+@pytest.fixture
+def mock_llm_response():
+    """The stub installed by _patch_llm (kept so tests can state the dependency)."""
+    return _mock_llm_answer
@@ -13,6 +13,20 @@ from app.agent.handlers import (
     handle_clarification,
 )
 from app.router.intents import RouteDecision, RoutingMetadata
+from app.router.router import route_intent
+
+
+ORDER_QUERIES = [
+    "My order number is #1",
+    "Where is my order with orderid #1",
+    "Track order 1",
+]
+
+
+@pytest.fixture(scope="module")
+def order_route_decisions():
+    """Routed decisions for ORDER_QUERIES, computed once per module."""
+    return {query: route_intent(query) for query in ORDER_QUERIES}
 
 
 @pytest.mark.integration
@@ -58,8 +72,8 @@ class TestHandleProductInfo:
         )
         result = handle_product_info(decision, db_session)
         
-        assert isinstance(result, str)
-        assert "couldn't find" in result.lower()
+        assert result["metadata"] is None
+        assert "couldn't find" in result["reply"].lower()
 
 
 @pytest.mark.integration
@@ -67,7 +81,7 @@ class TestHandleProductInfo:
 class TestHandleCompatCheck:
     """Integration tests for handle_compat_check."""
     
-    def test_handle_compat_check_compatible(self, db_session, sample_part, sample_model, sample_part_model_mapping):
+    def test_handle_compat_check_compatible(self, db_session, seeded_db):
         """Test compatibility check for compatible part."""
         decision = RouteDecision(
             intent=None,
@@ -106,7 +120,7 @@ class TestHandleCompatCheck:
 class TestHandleOrderSupport:
     """Integration tests for handle_order_support."""
     
-    def test_handle_order_support_with_order_id(self, db_session, sample_order, sample_part, sample_transaction, mock_llm_response):
+    def test_handle_order_support_with_order_id(self, db_session, seeded_db, mock_llm_response):
         """Test handling order support query with order ID."""
         decision = RouteDecision(
             intent=None,
@@ -121,6 +135,14 @@ class TestHandleOrderSupport:
         assert result["metadata"]["order"]["id"] == 1
         assert result["metadata"]["order"]["status"] == "shipped"
     
+    @pytest.mark.parametrize("query", ORDER_QUERIES)
+    def test_handle_order_support_routed(self, db_session, seeded_db, order_route_decisions, query):
+        """Test each order-ID phrasing, as routed, finds the order."""
+        result = handle_order_support(order_route_decisions[query], db_session)
+        
+        assert result["metadata"]["type"] == "order_info"
+        assert result["metadata"]["order"]["id"] == 1
+    
     def test_handle_order_support_not_found(self, db_session):
         """Test handling order support query for non-existent order."""
         decision = RouteDecision(
@@ -181,6 +203,6 @@ class TestHandleClarification:
         )
         result = handle_clarification(decision, db_session)
         
-        assert isinstance(result, str)
-        assert "part id" in result.lower() or "model number" in result.lower()
+        assert result["metadata"] is None
+        assert "part id" in result["reply"].lower() or "model number" in result["reply"].lower()
 
@@ -0,0 +1,111 @@
+"""
+Integration tests for ORM relationship loading strategies.
+"""
+
+import pytest
+from datetime import date
+from sqlalchemy import insert
+from sqlalchemy.exc import InvalidRequestError
+
+from app.models import Part, Model, PartModelMapping, Order, Transaction, User
+
+
+@pytest.fixture
+def catalog(db_session, bulk_parts):
+    """Three parts, each mapped to two models."""
+    part_ids = bulk_parts(3)
+    model_numbers = [f"MODEL00{j}" for j in range(2)]
+    db_session.execute(insert(Model), [{"model_number": m} for m in model_numbers])
+    db_session.execute(
+        insert(PartModelMapping),
+        [{"part_id": p, "model_number": m} for p in part_ids for m in model_numbers],
+    )
+    db_session.commit()
+    db_session.expunge_all()
+
+
+@pytest.fixture
+def customers(db_session, sample_part):
+    """Two users with two orders each."""
+    for u in range(1, 3):
+        db_session.add(User(user_id=u, name=f"User {u}", email=f"user{u}@example.com"))
+        for o in range(2):
+            db_session.add(
+                Order(
+                    user_id=u,
+                    part_id=sample_part.part_id,
+                    order_status="shipped",
+                    order_date=date(2024, 1, 15),
+                )
+            )
+    db_session.commit()
+    db_session.expunge_all()
+
+
+@pytest.mark.integration
+@pytest.mark.db
+class TestLoadingStrategies:
+    """Lock in the eager-loading strategies declared in app.models."""
+
+    def test_part_model_mappings_selectin(self, db_session, catalog, query_counter):
+        """Iterating parts and their mappings costs one extra query, not N."""
+        query_counter["count"] = 0
+        parts = db_session.query(Part).all()
+        total = sum(len(p.model_mappings) for p in parts)
+
+        assert total == 6
+        assert query_counter["count"] == 2
+
+    def test_model_part_mappings_selectin(self, db_session, catalog, query_counter):
+        """Iterating models and their mappings costs one extra query, not N."""
+        query_counter["count"] = 0
+        models = db_session.query(Model).all()
+        total = sum(len(m.part_mappings) for m in models)
+
+        assert total == 6
+        assert query_counter["count"] == 2
+
+    def test_user_orders_selectin(self, db_session, customers, query_counter):
+        """Users, their orders, and each order's part load without N+1."""
+        query_counter["count"] = 0
+        users = db_session.query(User).all()
+        part_names = [o.part.part_name for u in users for o in u.orders]
+
+        # users + orders (joined to part) + the part's selectin mappings
+        assert len(part_names) == 4
+        assert query_counter["count"] == 3
+
+    def test_order_part_joined(self, db_session, sample_order, query_counter):
+        """Loading a single order brings its part along in the same query."""
+        order_id = sample_order.order_id
+        db_session.expunge_all()
+        query_counter["count"] = 0
+        order = db_session.query(Order).filter(Order.order_id == order_id).one()
+        part_id = order.part.part_id
+
+        # order joined to part, plus the part's selectin mappings
+        assert part_id == "PS123456"
+        assert query_counter["count"] == 2
+
+
+@pytest.mark.integration
+@pytest.mark.db
+class TestRaiseload:
+    """The test session refuses implicit lazy loads instead of issuing N+1 SQL."""
+
+    def test_lazy_many_to_one_raises(self, db_session, sample_transaction):
+        """Transaction.order is lazy, so touching it must be explicit."""
+        db_session.expunge_all()
+        txn = db_session.query(Transaction).one()
+
+        with pytest.raises(InvalidRequestError):
+            txn.order
+
+    def test_lazy_load_below_eager_path_raises(self, db_session, catalog):
+        """Lazy relationships reached through an eager collection also raise."""
+        part = db_session.query(Part).filter(Part.part_id == "PS100000").one()
+        mapping = part.model_mappings[0]
+
+        assert mapping.part is part
+        with pytest.raises(InvalidRequestError):
+            mapping.model
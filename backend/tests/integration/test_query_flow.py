@@ -21,7 +21,7 @@ class TestQueryFlow:
         assert response["metadata"]["type"] == "product_info"
         assert response["metadata"]["product"]["id"] == "PS123456"
     
-    def test_compatibility_check_flow(self, db_session, sample_part, sample_model, sample_part_model_mapping):
+    def test_compatibility_check_flow(self, db_session, seeded_db):
         """Test complete flow for compatibility check."""
         query = "Is PS123456 compatible with WDT780SAEM1?"
         response = handle_message(query, db_session)
@@ -29,7 +29,7 @@ class TestQueryFlow:
         assert "reply" in response
         assert "compatible" in response["reply"].lower()
     
-    def test_order_support_flow(self, db_session, sample_order, sample_part, sample_transaction, mock_llm_response):
+    def test_order_support_flow(self, db_session, seeded_db, mock_llm_response):
         """Test complete flow for order support query."""
         query = "My order number is #1, what is the status?"
         response = handle_message(query, db_session)
@@ -38,6 +38,7 @@ class TestQueryFlow:
         assert response["metadata"]["type"] == "order_info"
         assert response["metadata"]["order"]["id"] == 1
     
+    @pytest.mark.serial
     def test_repair_help_flow(self, db_session, mock_llm_response, monkeypatch):
         """Test complete flow for repair help query."""
         query = "My dishwasher is leaking"
@@ -65,7 +66,7 @@ class TestQueryFlow:
         assert response["metadata"]["type"] == "product_info"
         # Should use replace_parts field in LLM context
     
-    def test_order_id_extraction_flow(self, db_session, sample_order, sample_part, sample_transaction, mock_llm_response):
+    def test_order_id_extraction_flow(self, db_session, seeded_db, mock_llm_response):
         """Test order ID extraction in various formats."""
         queries = [
             "My order number is #1",
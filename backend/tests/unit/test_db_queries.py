@@ -32,6 +32,12 @@ class TestFindPartById:
         result = find_part_by_id(db_session, "PS999999")
         assert result is None
 
+    def test_cached_statement_rebinds_id(self, db_session, sample_part):
+        """Test the cached lambda statement picks up each call's part_id."""
+        assert find_part_by_id(db_session, "PS123456") is not None
+        assert find_part_by_id(db_session, "PS999999") is None
+        assert find_part_by_id(db_session, "PS123456").part_id == "PS123456"
+
 
 @pytest.mark.unit
 @pytest.mark.db
@@ -61,7 +67,7 @@ class TestFindPartByMPN:
 class TestFindPartByModel:
     """Tests for find_part_by_model function."""
     
-    def test_find_part_by_model(self, db_session, sample_part, sample_model, sample_part_model_mapping):
+    def test_find_part_by_model(self, db_session, seeded_db):
         """Test finding part by model number."""
         result = find_part_by_model(db_session, "WDT780SAEM1")
         assert result is not None
@@ -130,7 +136,7 @@ class TestResolvePartIdentifier:
 class TestCheckCompatibility:
     """Tests for check_compatibility function."""
     
-    def test_compatible_part_model(self, db_session, sample_part, sample_model, sample_part_model_mapping):
+    def test_compatible_part_model(self, db_session, seeded_db):
         """Test checking compatible part and model."""
         result = check_compatibility(db_session, "PS123456", "WDT780SAEM1")
         assert result is True
@@ -146,7 +152,7 @@ class TestCheckCompatibility:
 class TestGetOrderWithDetails:
     """Tests for get_order_with_details function."""
     
-    def test_get_order_with_details(self, db_session, sample_order, sample_part, sample_transaction):
+    def test_get_order_with_details(self, db_session, seeded_db):
         """Test getting order with all details."""
         result = get_order_with_details(db_session, 1)
         assert result is not None
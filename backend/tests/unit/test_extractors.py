@@ -9,6 +9,7 @@ from app.router.extractors import (
     extract_mpn,
     extract_order_id,
     extract_appliance_type,
+    extract_appliance_type_from_lower,
 )
 
 
@@ -92,6 +93,18 @@ class TestExtractModelNumber:
         result = extract_model_number(text)
         assert result is None
 
+    def test_hyphenated_model_without_digits(self):
+        """Test that hyphens alone don't count as digits."""
+        text = "Model ABCD-EFGH"
+        result = extract_model_number(text)
+        assert result is None
+
+    def test_long_unbounded_token(self):
+        """Test a long token with no word boundary after it fails in linear time."""
+        text = "A1" * 10000 + "_"
+        result = extract_model_number(text)
+        assert result is None
+
 
 class TestExtractMPN:
     """Tests for extract_mpn function."""
@@ -163,6 +176,12 @@ class TestExtractOrderId:
         result = extract_order_id(text)
         assert result is None
 
+    def test_order_followed_by_long_whitespace(self):
+        """Test "order" and a long run of spaces without an ID fails in linear time."""
+        text = "order" + " " * 20000 + "help"
+        result = extract_order_id(text)
+        assert result is None
+
 
 class TestExtractApplianceType:
     """Tests for extract_appliance_type function."""
@@ -197,3 +216,136 @@ class TestExtractApplianceType:
         result = extract_appliance_type(text)
         assert result == "dishwasher"
 
+    
+    def test_dishwasher_wins_when_both_mentioned(self):
+        """Test dishwasher is preferred even when the fridge is mentioned first."""
+        text = "Moved the fridge and now the dishwasher leaks"
+        result = extract_appliance_type(text)
+        assert result == "dishwasher"
+
+    def test_dishwasher_wins_in_any_case(self):
+        """Test the dishwasher preference does not depend on letter case."""
+        text = "FRIDGE is fine but the DishWasher leaks"
+        result = extract_appliance_type(text)
+        assert result == "dishwasher"
+
+    def test_from_lower_agrees(self):
+        """Test the pre-folded variant matches the public function on lower-cased text."""
+        for text in ["FRIDGE then DishWasher", "Refrigerator", "no appliance"]:
+            assert extract_appliance_type_from_lower(text.lower()) == extract_appliance_type(text)
+
+    def test_regex_fallback_agrees(self, monkeypatch):
+        """Test the regex path gives the same answers without pyahocorasick."""
+        from app.router import extractors
+
+        texts = ["fridge then DISHWASHER", "Refrigerator", "no appliance", "dishwasher fridge"]
+        expected = [extract_appliance_type(t) for t in texts]
+        monkeypatch.setattr(extractors, "_APPLIANCE_AC", None)
+        assert [extract_appliance_type(t) for t in texts] == expected
+
+
+class TestNonAsciiText:
+    """Tests for IDs next to non-ASCII letters."""
+
+    def test_no_model_inside_non_ascii_word(self):
+        """Test a non-ASCII letter is not treated as a word boundary."""
+        text = "Ölfilter123 error fridge leaking"
+        assert extract_model_number(text) is None
+        assert extract_mpn(text) is None
+
+    def test_no_mpn_inside_non_ascii_word(self):
+        """Test no MPN is cut out of the end of a non-ASCII word."""
+        text = "Is this compatible with Größe1234?"
+        assert extract_mpn(text) is None
+
+    def test_ids_next_to_non_ascii_words(self):
+        """Test IDs separated from non-ASCII words by spaces are still found."""
+        text = "Für mein Gerät WDT780SAEM1 brauche ich ps734936"
+        assert extract_part_id(text) == "PS734936"
+        assert extract_model_number(text) == "WDT780SAEM1"
+        assert extract_mpn("Teilenummer W10321304 für Spülmaschine") == "W10321304"
+
+    def test_order_id_after_unicode_space(self):
+        """Test a non-breaking space between "order" and its ID still counts as space."""
+        assert extract_order_id("Where is my order\u00a0#5?") == "5"
+
+
+class TestCompiledPatterns:
+    """Tests for the module-level pattern registry."""
+
+    def test_registry_holds_compiled_patterns(self):
+        """Test every registered pattern is compiled once and reused."""
+        from app.router import extractors
+
+        for name, pattern in extractors.PATTERNS.items():
+            assert hasattr(pattern, "search"), name
+        assert extractors.PATTERNS["part_id"] is extractors.PART_ID_RE
+
+
+@pytest.fixture
+def load_extractors(monkeypatch):
+    """Reload the extractors with or without RE2; skip when RE2 isn't installed."""
+    pytest.importorskip("re2")
+    import importlib
+    import sys
+    from app.router import extractors
+
+    def load(use_re2):
+        if use_re2:
+            monkeypatch.delitem(sys.modules, "re2", raising=False)
+        else:
+            monkeypatch.setitem(sys.modules, "re2", None)  # makes "import re2" fail
+        return importlib.reload(extractors)
+
+    yield load
+    monkeypatch.undo()
+    importlib.reload(extractors)
+
+
+class TestRe2Engine:
+    """Tests that the RE2 branch of _compile extracts the same as ``re``."""
+
+    TEXTS = [
+        "I need part PS123456",
+        "part ps734936- not working",
+        "Is W10321304 compatible with my WDT780SAEM1?",
+        "model wrs325sdhz05 fridge ice maker",
+        "Where is my order number is #12345?",
+        "orderid #77 and order # 8",
+        "ORDER 42 for the Dishwasher",
+        "my fridge and dishwasher",
+        "nothing to find here",
+        "Für mein Gerät WDT780SAEM1 brauche ich ps734936",
+    ]
+    EXTRACTORS = [
+        "extract_part_id",
+        "extract_model_number",
+        "extract_mpn",
+        "extract_order_id",
+        "extract_appliance_type",
+    ]
+
+    def _results(self, module):
+        return [
+            getattr(module, name)(text) for name in self.EXTRACTORS for text in self.TEXTS
+        ]
+
+    def test_same_results_on_both_engines(self, load_extractors):
+        """Test every extractor gives the same answer with RE2 and with ``re``."""
+        import re
+
+        with_re2 = load_extractors(True)
+        assert not isinstance(with_re2.PART_ID_RE, re.Pattern)
+        expected = self._results(with_re2)
+
+        with_re = load_extractors(False)
+        assert isinstance(with_re.PART_ID_RE, re.Pattern)
+        assert self._results(with_re) == expected
+
+    def test_re2_results(self, load_extractors):
+        """Test known IDs come out of the RE2 patterns."""
+        with_re2 = load_extractors(True)
+        assert with_re2.extract_part_id("part ps734936- not working") == "PS734936"
+        assert with_re2.extract_mpn("Teilenummer W10321304") == "W10321304"
+        assert with_re2.extract_order_id("orderid #77") == "77"
+        assert with_re2.extract_appliance_type("my Fridge") == "refrigerator"
@@ -0,0 +1,159 @@
+"""
+Unit tests for the bulk CSV ingest in scripts/ingest_parts.py.
+"""
+
+import pandas as pd
+import pytest
+from decimal import Decimal
+
+from app.models import Model, Part, PartModelMapping
+from scripts.ingest_parts import (
+    _INGEST_META,
+    _bulk_upsert_crossrefs,
+    _changed_sources,
+    _bulk_upsert_parts,
+    _link_part_to_model,
+    _part_rows,
+    _record_sources,
+    _upsert_model,
+    _upsert_part,
+)
+
+
+def _parts_frame(**overrides):
+    row = {
+        "part_name": "Door Shelf Bin",
+        "part_price": "$1,045.50",
+        "partselect_number": "PS11752778",
+        "brand": "Whirlpool",
+        "manufacturer_part_number": "WPW10321304",
+        "description": "",
+        "replaceable_models": "",
+        "product_url": "https://www.partselect.com/PS11752778",
+    }
+    row.update(overrides)
+    return pd.DataFrame([row])
+
+
+@pytest.mark.unit
+@pytest.mark.db
+class TestBulkUpsertParts:
+    """Tests for the bulk part upsert."""
+
+    def test_rows_are_cleaned(self):
+        """Test prices become cents and blank fields become NULL."""
+        (row,) = _part_rows(_parts_frame(), "Refrigerator")
+        assert row["part_id"] == "PS11752778"
+        assert row["part_price_cents"] == 104550
+        assert row["description"] is None
+        assert row["replace_parts"] is None
+        assert row["appliance_type"] == "Refrigerator"
+
+    def test_rows_without_id_are_skipped(self):
+        """Test records missing a partselect_number are dropped."""
+        assert _part_rows(_parts_frame(partselect_number=""), "Dishwasher") == []
+
+    def test_insert_then_update(self, db_session):
+        """Test a second load overwrites the part and counts as an update."""
+        rows = _part_rows(_parts_frame(), "Refrigerator")
+        assert _bulk_upsert_parts(db_session, rows) == (1, 0)
+
+        rows = _part_rows(_parts_frame(part_price="12.99"), "Refrigerator")
+        assert _bulk_upsert_parts(db_session, rows) == (0, 1)
+        part = db_session.get(Part, "PS11752778")
+        assert part.part_price == Decimal("12.99")
+
+
+@pytest.mark.unit
+@pytest.mark.db
+class TestBulkUpsertCrossrefs:
+    """Tests for the bulk model/mapping upsert."""
+
+    def _crossrefs(self):
+        return pd.DataFrame(
+            [
+                {"partselect_number": "PS123456", "model_number": "WDT780SAEM1", "brand": "", "description": "", "model_url": ""},
+                {"partselect_number": "PS123456", "model_number": "NEW123MODEL", "brand": "Kenmore", "description": "", "model_url": ""},
+                {"partselect_number": "PS999999", "model_number": "NEW123MODEL", "brand": "", "description": "", "model_url": ""},
+            ]
+        )
+
+    def test_models_and_links(self, db_session, sample_part, sample_model):
+        """Test new models are created and only known parts are linked."""
+        created, linked = _bulk_upsert_crossrefs(db_session, self._crossrefs(), "Dishwasher")
+        assert (created, linked) == (1, 2)
+
+        # Blank CSV values don't erase what the model already had
+        assert db_session.get(Model, sample_model.id).brand == "Whirlpool"
+        links = db_session.query(PartModelMapping.part_id, PartModelMapping.model_number).all()
+        assert sorted(links) == [("PS123456", "NEW123MODEL"), ("PS123456", "WDT780SAEM1")]
+
+    def test_reload_adds_nothing(self, db_session, sample_part, sample_model):
+        """Test loading the same file twice creates no duplicate models or links."""
+        _bulk_upsert_crossrefs(db_session, self._crossrefs(), "Dishwasher")
+        assert _bulk_upsert_crossrefs(db_session, self._crossrefs(), "Dishwasher") == (0, 0)
+
+    def test_missing_model_number(self, db_session):
+        """Test a row without a model number is rejected."""
+        df = pd.DataFrame([{"partselect_number": "PS123456", "model_number": ""}])
+        with pytest.raises(ValueError):
+            _bulk_upsert_crossrefs(db_session, df, "Dishwasher")
+
+
+@pytest.mark.unit
+@pytest.mark.db
+class TestRecordUpserts:
+    """Tests for the single-statement per-record upserts used by the API ingest."""
+
+    def test_upsert_part_overwrites(self, db_session, sample_part):
+        """Test an existing part is updated in place."""
+        record = {"partselect_number": "PS123456", "part_name": "Valve", "part_price": "$9.50"}
+        assert _upsert_part(db_session, record) is True
+        db_session.expire_all()
+        part = db_session.get(Part, "PS123456")
+        assert part.part_name == "Valve"
+        assert part.part_price == Decimal("9.50")
+        assert part.brand is None
+
+    def test_upsert_part_without_id(self, db_session):
+        """Test a record without a partselect_number is skipped."""
+        assert _upsert_part(db_session, {"part_name": "Valve"}) is False
+
+    def test_upsert_model_keeps_existing_values(self, db_session, sample_model):
+        """Test blank fields don't erase what the model already had."""
+        record = {"model_number": "WDT780SAEM1", "brand": "", "model_url": "https://example.com"}
+        assert _upsert_model(db_session, record, "") == "WDT780SAEM1"
+        db_session.expire_all()
+        model = db_session.get(Model, sample_model.id)
+        assert model.brand == "Whirlpool"
+        assert model.appliance_type == "dishwasher"
+        assert model.model_url == "https://example.com"
+
+    def test_link_is_idempotent(self, db_session, sample_part, sample_model):
+        """Test a link is added once and unknown parts are never linked."""
+        assert _link_part_to_model(db_session, "PS123456", "WDT780SAEM1") is True
+        assert _link_part_to_model(db_session, "PS123456", "WDT780SAEM1") is False
+        assert _link_part_to_model(db_session, "PS999999", "WDT780SAEM1") is False
+        assert db_session.query(PartModelMapping).count() == 1
+
+
+@pytest.mark.unit
+@pytest.mark.db
+class TestIngestMeta:
+    """Tests for skipping CSVs that haven't changed since the last ingest."""
+
+    def test_unchanged_file_is_skipped(self, db_session, tmp_path):
+        """Test a recorded file is skipped until its content changes."""
+        _INGEST_META.create(db_session.connection())
+        path = tmp_path / "parts.csv"
+        path.write_text("partselect_number\nPS1\n")
+        sources = [("Dishwasher", path)]
+
+        changed = _changed_sources(db_session, sources)
+        assert [p for _, p, _ in changed] == [path]
+        _record_sources(db_session, changed)
+        assert _changed_sources(db_session, sources) == []
+        assert len(_changed_sources(db_session, sources, force=True)) == 1
+
+        path.write_text("partselect_number\nPS2\n")
+        assert len(_changed_sources(db_session, sources)) == 1
@@ -0,0 +1,202 @@
+"""
+Unit tests for RAG ingestion helpers.
+"""
+
+import pytest
+from app.config import settings
+from app.rag import rag_ingest, rag_query
+from app.rag.rag_ingest import ingest_blogs, ingest_repairs
+
+
+class FakeCollection:
+    """Records upserts instead of talking to Chroma."""
+
+    def __init__(self):
+        self.rows = {}
+
+    def upsert(self, ids, documents, metadatas, embeddings=None):
+        for i, doc_id in enumerate(ids):
+            self.rows[doc_id] = {
+                "document": documents[i],
+                "metadata": metadatas[i],
+                "embedding": embeddings[i] if embeddings else None,
+            }
+
+
+@pytest.fixture
+def fake_store(monkeypatch, tmp_path):
+    """Patch the Chroma collection and count embedding calls."""
+    monkeypatch.setattr(settings, "chroma_dir", tmp_path)
+    collection = FakeCollection()
+    embedded = []
+
+    def fake_embed_texts(texts):
+        embedded.extend(texts)
+        return [[float(len(t))] for t in texts]
+
+    monkeypatch.setattr(rag_ingest, "get_collection", lambda name=None: collection)
+    monkeypatch.setattr(rag_ingest, "embed_texts", fake_embed_texts)
+    return collection, embedded
+
+
+@pytest.mark.unit
+class TestIngestDedup:
+    """Tests for in-run chunk deduplication."""
+
+    def test_duplicate_blog_sections_embedded_once(self, fake_store):
+        """Test repeated text is embedded once but stored under each doc_id."""
+        collection, embedded = fake_store
+        blogs = [
+            {"id": "a", "title": "A", "sections": [{"heading": "Safety", "text": "Unplug the appliance first."}]},
+            {"id": "b", "title": "B", "sections": [{"heading": "Safety", "text": "Unplug the  appliance first."}]},
+        ]
+        ingest_blogs(blogs)
+
+        assert embedded == ["Unplug the appliance first."]
+        assert len(collection.rows) == 2
+        assert {r["metadata"]["blog_id"] for r in collection.rows.values()} == {"a", "b"}
+        assert all(r["embedding"] == [27.0] for r in collection.rows.values())
+
+    def test_distinct_repair_steps_embedded_separately(self, fake_store):
+        """Test different chunks each get their own embedding."""
+        collection, embedded = fake_store
+        repairs = [
+            {
+                "id": "leak",
+                "title": "Leaking",
+                "steps": [{"title": "Hose", "body": "Check the hose."}, {"title": "Valve", "body": "Check the valve."}],
+                "notes": "Check the hose.",
+            }
+        ]
+        ingest_repairs(repairs)
+
+        assert embedded == ["Check the hose.", "Check the valve."]
+        assert len(collection.rows) == 3
+
+
+@pytest.mark.unit
+class TestIngestMetadata:
+    """Tests for per-chunk metadata."""
+
+    def test_repair_step_metadata(self, fake_store):
+        """Test step chunks carry guide-level and step-level fields."""
+        collection, _ = fake_store
+        repairs = [
+            {
+                "id": "leak",
+                "title": "Leaking",
+                "url": "http://x",
+                "appliance_type": "Dishwasher",
+                "symptom_tags": "Leaking; Noisy",
+                "steps": [{"title": "Hose", "body": "Check the hose."}],
+            }
+        ]
+        ingest_repairs(repairs)
+
+        assert collection.rows["repair:leak::step:0::chunk:0"]["metadata"] == {
+            "source": "repair_guide",
+            "guide_id": "leak",
+            "title": "Leaking",
+            "url": "http://x",
+            "appliance_types": "dishwasher",
+            "symptom_tags": "leaking;noisy",
+            "step_index": 0,
+            "step_title": "Hose",
+            "chunk_index": 0,
+            "_tokens": "check hose",
+        }
+
+    def test_chunks_do_not_share_metadata(self, fake_store):
+        """Test each chunk gets its own metadata dict."""
+        collection, _ = fake_store
+        blogs = [{"id": "a", "title": "A", "sections": [{"heading": "H", "text": "x" * 2000}]}]
+        ingest_blogs(blogs)
+
+        indices = sorted(r["metadata"]["chunk_index"] for r in collection.rows.values())
+        assert indices == list(range(len(collection.rows)))
+        assert len(indices) > 1
+
+
+@pytest.mark.unit
+class TestSplitMulti:
+    """Tests for _split_multi function."""
+
+    def test_none(self):
+        """Test None yields an empty list."""
+        assert rag_ingest._split_multi(None) == []
+
+    def test_list(self):
+        """Test lists are stripped, lowercased and filtered."""
+        assert rag_ingest._split_multi([" Dishwasher ", "", "Fridge"]) == ["dishwasher", "fridge"]
+
+    def test_mixed_separators(self):
+        """Test every supported separator splits the string."""
+        assert rag_ingest._split_multi("Leak; Noise, Odor | Ice/ Drain;;") == ["leak", "noise", "odor", "ice", "drain"]
+
+
+@pytest.mark.unit
+class TestTagIndex:
+    """Tests for tag filters resolved through the side index."""
+
+    @pytest.fixture
+    def captured_where(self, monkeypatch):
+        calls = []
+
+        def fake_query_collection(query, collection_name, n_results=6, where=None):
+            calls.append(where)
+            return []
+
+        monkeypatch.setattr(rag_query, "query_collection", fake_query_collection)
+        return calls
+
+    def test_filters_resolve_to_guide_ids(self, fake_store, captured_where):
+        """Test appliance and symptom filters intersect to parent ids."""
+        ingest_repairs(
+            [
+                {"id": "g1", "appliance_type": "Dishwasher", "symptom_tags": "Leaking", "steps": [{"body": "a"}]},
+                {"id": "g2", "appliance_type": "Dishwasher", "symptom_tags": "Noisy", "steps": [{"body": "b"}]},
+                {"id": "g3", "appliance_type": "Refrigerator", "symptom_tags": "Leaking", "steps": [{"body": "c"}]},
+            ]
+        )
+        rag_query.query_repairs("q", symptom_filter="Leaking", appliance_filter="dishwasher")
+        rag_query.query_repairs("q", appliance_filter="dishwasher")
+
+        assert captured_where == [
+            {"guide_id": {"$in": ["g1"]}},
+            {"guide_id": {"$in": ["g1", "g2"]}},
+        ]
+
+    def test_filter_matches_part_of_a_tag(self, fake_store, captured_where):
+        """Test a filter term matches tags containing it, like the $contains fallback."""
+        ingest_repairs(
+            [
+                {"id": "g1", "appliance_type": "Dishwasher", "symptom_tags": "Not draining", "steps": [{"body": "a"}]},
+                {"id": "g2", "appliance_type": "Dishwasher", "symptom_tags": "Noisy", "steps": [{"body": "b"}]},
+            ]
+        )
+        rag_query.query_repairs("q", symptom_filter="draining")
+
+        assert captured_where == [{"guide_id": {"$in": ["g1"]}}]
+
+    def test_index_opened_once(self, fake_store, captured_where):
+        """Test filtered queries reuse one connection instead of reopening the index."""
+        from app.rag import tag_index
+
+        ingest_blogs([{"id": "b1", "appliance_types": ["dishwasher"], "sections": [{"text": "x"}]}])
+        misses = tag_index._open.cache_info().misses
+        rag_query.query_blogs("q", appliance_filter="dishwasher")
+        rag_query.query_blogs("q", appliance_filter="refrigerator")
+        assert tag_index._open.cache_info().misses == misses
+
+    def test_no_match_skips_query(self, fake_store, captured_where):
+        """Test a filter with no matching parents returns without querying Chroma."""
+        ingest_blogs([{"id": "b1", "appliance_types": ["dishwasher"], "sections": [{"text": "x"}]}])
+
+        assert rag_query.query_blogs("q", appliance_filter="refrigerator") == []
+        assert captured_where == []
+
+    def test_unindexed_collection_falls_back(self, fake_store, captured_where):
+        """Test collections without tag rows use the metadata $contains filter."""
+        rag_query.query_blogs("q", appliance_filter="Dishwasher")
+
+        assert captured_where == [{"appliance_types": {"$contains": "dishwasher"}}]
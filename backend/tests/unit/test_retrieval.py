@@ -0,0 +1,172 @@
+"""
+Unit tests for RAG retrieval reranking and context assembly.
+"""
+
+import pytest
+from app.rag import retrieval
+from app.rag.rag_query import build_context_block
+from app.rag.retrieval import retrieve_documents, token_digest
+
+
+def _doc(doc_id, text, distance):
+    return {"id": doc_id, "text": text, "metadata": {}, "distance": distance}
+
+
+@pytest.fixture
+def fake_collections(monkeypatch):
+    """Patch query_collection with an in-memory result set per collection."""
+    pools = {}
+
+    def fake_query_collection(query, collection_name, n_results):
+        return pools.get(collection_name, [])
+
+    monkeypatch.setattr(retrieval, "query_collection", fake_query_collection)
+    return pools
+
+
+@pytest.mark.unit
+class TestRetrieveDocuments:
+    """Tests for retrieve_documents MMR selection."""
+
+    def test_empty_collections(self, fake_collections):
+        """Test no candidates returns an empty list."""
+        assert retrieve_documents("leak") == []
+
+    def test_orders_by_distance(self, fake_collections):
+        """Test closer documents are selected first."""
+        fake_collections["repairs"] = [
+            _doc("far", "check the door gasket", 0.9),
+            _doc("near", "inspect the drain pump", 0.1),
+        ]
+        result = retrieve_documents("xyz", top_k=2)
+        assert [d["id"] for d in result] == ["near", "far"]
+
+    def test_respects_top_k(self, fake_collections):
+        """Test no more than top_k documents are returned."""
+        fake_collections["repairs"] = [_doc(f"r{i}", f"text {i}", 0.1 * i) for i in range(5)]
+        fake_collections["blogs"] = [_doc(f"b{i}", f"blog {i}", 0.1 * i) for i in range(5)]
+        assert len(retrieve_documents("text", top_k=3)) == 3
+
+    def test_preferred_source_bias(self, fake_collections):
+        """Test preferred source wins a tie on distance."""
+        fake_collections["repairs"] = [_doc("repair", "replace the water valve", 0.5)]
+        fake_collections["blogs"] = [_doc("blog", "cycle settings explained", 0.5)]
+        result = retrieve_documents("xyz", top_k=1, preferred_source="blogs")
+        assert result[0]["id"] == "blog"
+        assert result[0]["source_collection"] == "blogs"
+
+    def test_penalizes_redundant_text(self, fake_collections):
+        """Test a near-duplicate loses to a diverse document after the first pick."""
+        fake_collections["repairs"] = [
+            _doc("a", "the drain pump is clogged with debris", 0.10),
+            _doc("a_dup", "the drain pump is clogged with debris!", 0.11),
+            _doc("b", "reset the control board", 0.20),
+        ]
+        result = retrieve_documents("xyz", top_k=2)
+        assert [d["id"] for d in result] == ["a", "b"]
+
+    def test_no_comparisons_after_last_pick(self, fake_collections, monkeypatch):
+        """Test the rerank stops comparing texts once top_k documents are chosen."""
+        fake_collections["repairs"] = [_doc(f"r{i}", f"text {i}", 0.1 * i) for i in range(4)]
+        calls = []
+        real = retrieval._similarity
+        monkeypatch.setattr(retrieval, "_similarity", lambda a, b: calls.append(1) or real(a, b))
+
+        retrieve_documents("q", top_k=1)
+        assert calls == []
+        retrieve_documents("q", top_k=2)
+        assert len(calls) == 3
+
+    def test_missing_distance_treated_as_far(self, fake_collections):
+        """Test a missing distance ranks like the maximum distance."""
+        fake_collections["repairs"] = [
+            _doc("unknown", "replace the door seal", None),
+            _doc("known", "clean the spray arm", 0.5),
+        ]
+        result = retrieve_documents("xyz", top_k=1)
+        assert result[0]["id"] == "known"
+
+
+@pytest.mark.unit
+class TestBuildContextBlock:
+    """Tests for build_context_block function."""
+
+    def test_labels_and_separators(self):
+        """Test blocks are labeled and joined with separators."""
+        results = [
+            {"text": "  first  ", "metadata": {"source": "blog", "title": "A", "url": "http://a"}},
+            {"text": "second", "metadata": {"source": "repair_guide", "title": "B"}},
+        ]
+        assert build_context_block(results) == "[blog] A (http://a)\nfirst\n\n---\n[repair_guide] B\nsecond\n"
+
+    def test_prefers_precomputed_stripped_text(self):
+        """Test text_stripped from query_collection is used when present."""
+        results = [{"text": " raw ", "text_stripped": "clean", "metadata": {"source": "blog"}}]
+        assert build_context_block(results) == "[blog]\nclean\n"
+
+    def test_stops_at_budget(self):
+        """Test blocks past max_chars are dropped."""
+        results = [
+            {"text": "x" * 10, "metadata": {"source": "s"}},
+            {"text": "y" * 10, "metadata": {"source": "s"}},
+        ]
+        # each block is len("[s]") + 10 + 2 = 15 chars
+        assert build_context_block(results, max_chars=15) == "[s]\n" + "x" * 10 + "\n"
+        assert build_context_block(results, max_chars=14) == ""
+
+
+@pytest.mark.unit
+class TestAretrieveDocuments:
+    """Tests for the async retrieval path."""
+
+    def test_matches_sync_selection(self, fake_collections, monkeypatch):
+        """Test the async path queries each collection and reranks identically."""
+        import asyncio
+
+        fake_collections["repairs"] = [
+            _doc("r1", "inspect the drain pump", 0.2),
+            _doc("r2", "check the door gasket", 0.4),
+        ]
+        fake_collections["blogs"] = [_doc("b1", "eco cycle explained", 0.3)]
+        queried = []
+
+        async def fake_aquery_collection(query, collection_name, n_results):
+            queried.append(collection_name)
+            return fake_collections.get(collection_name, [])
+
+        monkeypatch.setattr(retrieval, "aquery_collection", fake_aquery_collection)
+
+        result = asyncio.run(retrieval.aretrieve_documents("xyz", top_k=3, preferred_source="blogs"))
+        expected = retrieve_documents("xyz", top_k=3, preferred_source="blogs")
+
+        assert sorted(queried) == ["blogs", "repairs"]
+        assert [d["id"] for d in result] == [d["id"] for d in expected]
+
+
+@pytest.mark.unit
+class TestKeywordBonus:
+    """Tests for the stored token digest used by the keyword bonus."""
+
+    def test_token_digest(self):
+        """Test digest is the sorted, deduplicated set of long tokens."""
+        assert token_digest("Drain pump: check the PUMP and drain hose.") == "check drain hose pump"
+
+    def test_digest_used_when_present(self, fake_collections):
+        """Test a digest match outranks a closer document without one."""
+        fake_collections["repairs"] = [
+            _doc("plain", "unrelated text", 0.10),
+            {"id": "tagged", "text": "...", "metadata": {"_tokens": "drain pump"}, "distance": 0.15},
+        ]
+        result = retrieve_documents("drain pump", top_k=1)
+        assert result[0]["id"] == "tagged"
+        assert result[0]["keyword_bonus"] == 1.0
+
+    def test_digest_and_text_give_same_bonus(self):
+        """Test the digest path matches the text scan, including partial words."""
+        from app.rag.retrieval import _keyword_bonus, _tokenize
+
+        query = _tokenize("dishwasher leak drain")
+        text = "My dishwasher is leaking and not draining"
+        with_digest = {"text": text, "metadata": {"_tokens": token_digest(text)}}
+        without_digest = {"text": text, "metadata": {}}
+        assert _keyword_bonus(query, with_digest) == _keyword_bonus(query, without_digest) == 1.0
@@ -79,3 +79,106 @@ class TestRouter:
         assert decision.intent == Intent.CLARIFICATION
         assert "part_id" in decision.metadata.missing_fields or "model_number" in decision.metadata.missing_fields
 
+
+    def test_repeated_message_hits_cache(self):
+        """Test messages differing only in case/whitespace share a cached result."""
+        import dataclasses
+        from app.router.router import route_cache_info
+
+        first = route_intent("What is your warranty on PS123456?")
+        hits = route_cache_info().hits
+        second = route_intent("  what is your WARRANTY on ps123456? ")
+        assert route_cache_info().hits == hits + 1
+        assert second.metadata is first.metadata
+        assert second.normalized_query == "  what is your WARRANTY on ps123456? "
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            first.intent = Intent.OUT_OF_SCOPE
+
+    def test_non_ascii_message_is_not_folded_before_extraction(self):
+        """Test IDs are extracted from non-ASCII text as written, not lower-cased."""
+        # "İ".lower() is "i" plus a combining dot, which would read as a word boundary
+        decision = route_intent("İW10321304 leaking")
+        assert decision.metadata.manufacturer_part_number is None
+        assert decision.intent == Intent.REPAIR_HELP
+
+        decision = route_intent("Mein Kühlschrank W10321304 leckt")
+        assert decision.metadata.manufacturer_part_number == "W10321304"
+
+    def test_short_message_skips_cache(self):
+        """Test messages shorter than any keyword route out of scope without caching."""
+        from app.router.router import route_cache_info
+
+        before = route_cache_info()
+        for message in ["", "  ", "ok", " K "]:
+            decision = route_intent(message)
+            assert decision.intent == Intent.OUT_OF_SCOPE
+            assert decision.metadata.missing_fields == ()
+        after = route_cache_info()
+        assert (after.hits, after.misses) == (before.hits, before.misses)
+
+
+@pytest.mark.unit
+class TestKeywordScanner:
+    """Tests for the single-pass keyword scanner."""
+
+    MESSAGES = [
+        "What is your return policy?",
+        "Where is my order?",
+        "Is this compatible with my fridge?",
+        "My dishwasher won't drain and smells",
+        "How do I run the clean cycle?",
+        "What's the shipping policy for returns?",
+        "Tell me about microwaves",
+        "",
+    ]
+
+    def test_scan_agrees_with_substring_scan(self):
+        """Test every bucket flag matches scanning that bucket's keyword set."""
+        from app.router import keywords as kw
+
+        buckets = [
+            (kw.POLICY_BIT, kw.POLICY_KEYWORDS),
+            (kw.ORDER_BIT, kw.ORDER_KEYWORDS),
+            (kw.COMPAT_BIT, kw.COMPAT_KEYWORDS),
+            (kw.GENERAL_REPAIR_BIT, kw.GENERAL_REPAIR_WORDS),
+            (kw.REPAIR_BIT, kw.REPAIR_KEYWORDS),
+            (kw.HOWTO_BIT, kw.HOWTO_KEYWORDS),
+        ]
+        for message in self.MESSAGES:
+            msg = message.lower()
+            found = kw.scan_keywords(msg)
+            for bit, words in buckets:
+                assert bool(found & bit) == any(k in msg for k in words)
+
+    def test_regex_fallback_agrees_with_scanner(self):
+        """Test the regex fallback reports the same buckets as the active scanner."""
+        from app.router import keywords as kw
+
+        fallback = kw._regex_scanner(kw._keyword_bits())
+        for message in self.MESSAGES:
+            msg = message.lower()
+            assert fallback(msg) == kw.scan_keywords(msg)
+
+    def test_prechecks_match_full_extraction(self):
+        """Test the digit/prefix pre-checks never change extracted metadata."""
+        from app.router.extractors import (
+            extract_model_number,
+            extract_mpn,
+            extract_order_id,
+            extract_part_id,
+        )
+
+        messages = self.MESSAGES + [
+            "Is PS123456 compatible with WDT780SAEM1?",
+            "track order 42",
+            "What is W10321304?",
+            "hi there",
+            "Wo ist meine order #١٢?",
+            "Teil pſ12345 für den Kühlschrank",
+        ]
+        for message in messages:
+            metadata = route_intent(message).metadata
+            assert metadata.part_id == extract_part_id(message)
+            assert metadata.model_number == extract_model_number(message)
+            assert metadata.manufacturer_part_number == extract_mpn(message)
+            assert metadata.order_id == extract_order_id(message)
@@ -83,6 +83,17 @@ class TestLinkMetadata:
         assert len(result["links"]) == 1
         assert result["links"][0]["prompt"] == "Tell me more"
 
+    def test_repeated_links_return_fresh_metadata(self):
+        """Test changing one result doesn't leak into the next call."""
+        links = [{"label": "Repair Guides", "url": "https://example.com/repair"}]
+        first = link_metadata(links)
+        first["links"][0]["label"] = "Changed"
+        first["links"].append({"label": "Extra", "url": "https://example.com"})
+        link_metadata([])["type"] = "links"
+
+        assert link_metadata([dict(links[0])]) == {"type": "links", "links": links}
+        assert link_metadata([]) == {}
+
 
 class TestCleanLLMResponse:
     """Tests for clean_llm_response function."""